@@ -1,4 +1,5 @@
 import os
+import re
 from logging.config import fileConfig
 
 from sqlalchemy import engine_from_config, pool
@@ -22,10 +23,22 @@ from db.models.projects import Project
 from db.models.log import RequestLog
 from db.models.lab_notes import LabNote
 from db.models.contact import ContactMessage
+from db.models.drift import DriftSnapshot
+from db.request_logs import PARTITION_NAME, DEFAULT_PARTITION
+
+PARTITION = re.compile(f"{PARTITION_NAME.pattern}|{DEFAULT_PARTITION}")
 
 target_metadata = Base.metadata
 
 
+def include_object(object, name, type_, reflected, compare_to):
+    """Leave request_logs partitions to cli.request_logs, not autogenerate."""
+    table = object if type_ == "table" else getattr(object, "table", None)
+    if reflected and table is not None and PARTITION.fullmatch(table.name):
+        return False
+    return True
+
+
 
 def run_migrations_offline() -> None:
     """Run migrations in 'offline' mode."""
@@ -33,6 +46,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -53,6 +67,7 @@ def run_migrations_online() -> None:
         context.configure(
             connection=connection,
             target_metadata=target_metadata,
+            include_object=include_object,
         )
 
         with context.begin_transaction():
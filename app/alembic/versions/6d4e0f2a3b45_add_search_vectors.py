@@ -0,0 +1,70 @@
+"""add full-text search vectors to projects and lab_notes
+
+Revision ID: 6d4e0f2a3b45
+Revises: 5c3d9e1f2a34
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '6d4e0f2a3b45'
+down_revision: Union[str, Sequence[str], None] = '5c3d9e1f2a34'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+PROJECT_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(immutable_array_to_string(tags::text[], ' '), '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C')"
+)
+LAB_NOTE_SEARCH_VECTOR = (
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(immutable_array_to_string(tags::text[], ' '), '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(excerpt, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(content, '')), 'D')"
+)
+
+
+def upgrade() -> None:
+    """Add generated tsvector columns with GIN indexes."""
+    # array_to_string() is STABLE, generated columns need an IMMUTABLE wrapper
+    op.execute("""
+        CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text)
+        RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE
+        AS $$SELECT array_to_string($1, $2)$$
+    """)
+
+    op.add_column('projects', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(PROJECT_SEARCH_VECTOR, persisted=True),
+    ))
+    op.create_index(
+        'ix_projects_search_vector', 'projects', ['search_vector'],
+        unique=False, postgresql_using='gin',
+    )
+
+    op.add_column('lab_notes', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(LAB_NOTE_SEARCH_VECTOR, persisted=True),
+    ))
+    op.create_index(
+        'ix_lab_notes_search_vector', 'lab_notes', ['search_vector'],
+        unique=False, postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Drop search vectors and their indexes."""
+    op.drop_index('ix_lab_notes_search_vector', table_name='lab_notes')
+    op.drop_column('lab_notes', 'search_vector')
+    op.drop_index('ix_projects_search_vector', table_name='projects')
+    op.drop_column('projects', 'search_vector')
+    op.execute("DROP FUNCTION IF EXISTS immutable_array_to_string(text[], text)")
@@ -0,0 +1,34 @@
+"""add rendered html and toc to lab_notes
+
+Revision ID: 7e5f1a3b4c56
+Revises: 6d4e0f2a3b45
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7e5f1a3b4c56'
+down_revision: Union[str, Sequence[str], None] = '6d4e0f2a3b45'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add content_html and toc columns to lab_notes.
+
+    Existing rows are rendered lazily on their first public read.
+    """
+    op.add_column('lab_notes', sa.Column('content_html', sa.Text(), nullable=True))
+    op.add_column('lab_notes', sa.Column('toc', postgresql.JSONB(), nullable=True))
+
+
+def downgrade() -> None:
+    """Remove content_html and toc columns from lab_notes."""
+    op.drop_column('lab_notes', 'toc')
+    op.drop_column('lab_notes', 'content_html')
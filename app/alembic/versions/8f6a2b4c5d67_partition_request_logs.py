@@ -0,0 +1,135 @@
+"""partition request_logs by month with typed columns and hourly rollups
+
+Revision ID: 8f6a2b4c5d67
+Revises: 7e5f1a3b4c56
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8f6a2b4c5d67'
+down_revision: Union[str, Sequence[str], None] = '7e5f1a3b4c56'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+FEATURES = ['feature1', 'feature2', 'feature3', 'feature4', 'feature5']
+
+
+def upgrade() -> None:
+    """Replace the JSON-text request_logs with a monthly partitioned table.
+
+    Legacy rows carry no timestamp, so they are copied with the migration
+    time into the current month's partition.
+    """
+    op.rename_table('request_logs', 'request_logs_legacy')
+    op.execute('ALTER INDEX ix_request_logs_id RENAME TO ix_request_logs_legacy_id')
+    op.execute(
+        'ALTER TABLE request_logs_legacy '
+        'RENAME CONSTRAINT request_logs_pkey TO request_logs_legacy_pkey'
+    )
+
+    op.create_table(
+        'request_logs',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True),
+            server_default=sa.text('now()'), nullable=False,
+        ),
+        sa.Column('model_version', sa.String(length=64), server_default='', nullable=False),
+        sa.Column('latency_ms', sa.Float(), nullable=False),
+        *(sa.Column(name, sa.Float(), nullable=False) for name in FEATURES),
+        sa.Column('prediction', sa.Float(), nullable=False),
+        sa.Column('prediction_label', sa.String(length=32), nullable=False),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.create_index(
+        'ix_request_logs_created_at', 'request_logs', ['created_at'],
+        unique=False, postgresql_using='brin',
+    )
+    op.execute('CREATE TABLE request_logs_default PARTITION OF request_logs DEFAULT')
+    # This month and the next two; cli.request_logs keeps creating them ahead
+    op.execute("""
+        DO $$
+        DECLARE
+            month date := date_trunc('month', now() AT TIME ZONE 'UTC');
+        BEGIN
+            FOR i IN 0..2 LOOP
+                EXECUTE format(
+                    'CREATE TABLE request_logs_p%s PARTITION OF request_logs '
+                    'FOR VALUES FROM (%L) TO (%L)',
+                    to_char(month, 'YYYYMM'),
+                    month::text || ' 00:00+00',
+                    (month + interval '1 month')::date::text || ' 00:00+00'
+                );
+                month := month + interval '1 month';
+            END LOOP;
+        END $$
+    """)
+
+    op.execute(f"""
+        INSERT INTO request_logs (
+            latency_ms, {', '.join(FEATURES)}, prediction, prediction_label
+        )
+        SELECT 0,
+               {', '.join(f"(request::jsonb->>'{name}')::float" for name in FEATURES)},
+               (response::jsonb->>'prediction')::float,
+               response::jsonb->>'prediction_label'
+        FROM request_logs_legacy
+        ORDER BY id
+    """)
+    op.drop_index('ix_request_logs_legacy_id', table_name='request_logs_legacy')
+    op.drop_table('request_logs_legacy')
+
+    op.create_table(
+        'request_log_hourly',
+        sa.Column('hour', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('model_version', sa.String(length=64), nullable=False),
+        sa.Column('prediction_label', sa.String(length=32), nullable=False),
+        sa.Column('requests', sa.Integer(), nullable=False),
+        sa.Column('mean_latency_ms', sa.Float(), nullable=False),
+        sa.Column('p95_latency_ms', sa.Float(), nullable=False),
+        sa.Column('max_latency_ms', sa.Float(), nullable=False),
+        sa.Column('mean_prediction', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('hour', 'model_version', 'prediction_label'),
+    )
+
+
+def downgrade() -> None:
+    """Restore the JSON-text request_logs table.
+
+    Rollups, timestamps, model versions and latencies are lost.
+    """
+    op.drop_table('request_log_hourly')
+
+    op.rename_table('request_logs', 'request_logs_partitioned')
+    op.execute(
+        'ALTER TABLE request_logs_partitioned '
+        'RENAME CONSTRAINT request_logs_pkey TO request_logs_partitioned_pkey'
+    )
+    op.create_table(
+        'request_logs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('request', sa.Text(), nullable=False),
+        sa.Column('response', sa.Text(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(op.f('ix_request_logs_id'), 'request_logs', ['id'], unique=False)
+    op.execute(f"""
+        INSERT INTO request_logs (request, response)
+        SELECT json_build_object(
+                   {', '.join(f"'{name}', {name}" for name in FEATURES)}
+               )::text,
+               json_build_object(
+                   'prediction', prediction, 'prediction_label', prediction_label
+               )::text
+        FROM request_logs_partitioned
+        ORDER BY created_at, id
+    """)
+    # Drops every partition with it
+    op.drop_table('request_logs_partitioned')
@@ -0,0 +1,45 @@
+"""add drift_snapshots table
+
+Revision ID: 9a7b3c5d6e78
+Revises: 8f6a2b4c5d67
+Create Date: 2026-10-19
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a7b3c5d6e78'
+down_revision: Union[str, Sequence[str], None] = '8f6a2b4c5d67'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Add drift_snapshots for persisted streaming prediction statistics."""
+    op.create_table(
+        'drift_snapshots',
+        sa.Column('id', sa.BigInteger(), sa.Identity(), nullable=False),
+        sa.Column(
+            'created_at', sa.DateTime(timezone=True),
+            server_default=sa.text('now()'), nullable=False,
+        ),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('model_version', sa.String(length=64), nullable=False),
+        sa.Column('stats', postgresql.JSONB(), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_drift_snapshots_created_at'), 'drift_snapshots', ['created_at'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Drop drift_snapshots."""
+    op.drop_index(op.f('ix_drift_snapshots_created_at'), table_name='drift_snapshots')
+    op.drop_table('drift_snapshots')
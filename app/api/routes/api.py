@@ -2,9 +2,13 @@ from api.routes import (
     auth,
     categories,
     contact,
+    debug,
+    drift,
     lab_notes,
     predictor,
     projects,
+    request_logs,
+    search,
     upload,
 )
 from fastapi import APIRouter
@@ -15,5 +19,9 @@ router.include_router(predictor.router, tags=["predictor"], prefix="/v1")
 router.include_router(categories.router, tags=["categories"], prefix="/v1")
 router.include_router(projects.router, tags=["projects"], prefix="/v1")
 router.include_router(lab_notes.router, tags=["lab-notes"], prefix="/v1")
+router.include_router(search.router, tags=["search"], prefix="/v1")
 router.include_router(contact.router, tags=["contact"], prefix="/v1")
 router.include_router(upload.router, tags=["upload"], prefix="/v1")
+router.include_router(debug.router, tags=["debug"], prefix="/v1")
+router.include_router(drift.router, tags=["drift"], prefix="/v1")
+router.include_router(request_logs.router, tags=["request-logs"], prefix="/v1")
@@ -15,6 +15,7 @@ from schemas.category import (
     CategoryUpdate,
     CategoryWithCount,
 )
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 router = APIRouter()
@@ -157,20 +158,21 @@ async def get_categories(
     if not include_counts:
         return {"data": [CategoryResponse.model_validate(c) for c in categories]}
 
-    # Get project counts for each category (only published projects)
+    # Published project counts for every category in one grouped query
+    counts = dict(
+        db.query(Project.category_id, func.count(Project.id))
+        .filter(Project.published)
+        .group_by(Project.category_id)
+        .all()
+    )
     result = []
     for category in categories:
-        count = (
-            db.query(Project)
-            .filter(Project.category_id == category.id, Project.published)
-            .count()
-        )
         category_dict = CategoryResponse.model_validate(category).model_dump()
-        category_dict["count"] = count
+        category_dict["count"] = counts.get(category.id, 0)
         result.append(CategoryWithCount(**category_dict))
 
-    # Add "All" category
-    total = db.query(Project).filter(Project.published).count()
+    # Add "All" category (every project has a category, so the counts add up)
+    total = sum(counts.values())
     all_category = {
         "id": "00000000-0000-0000-0000-000000000000",  # Special UUID for "All"
         "name": "all",
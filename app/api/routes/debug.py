@@ -0,0 +1,24 @@
+"""Admin debugging routes."""
+
+from api.dependencies import CurrentAdmin
+from core.config import SQL_PROFILER_FLAG
+from db.profiler import recent_profiles
+from fastapi import APIRouter, HTTPException, Query
+
+router = APIRouter()
+
+
+@router.get("/admin/debug/sql-profiles")
+async def get_sql_profiles(
+    _admin: CurrentAdmin,
+    limit: int = Query(20, ge=1, le=100),
+    n_plus_one_only: bool = Query(False),
+):
+    """Admin endpoint: SQL profiles of the most recent requests, newest first."""
+    if not SQL_PROFILER_FLAG:
+        raise HTTPException(status_code=404, detail="SQL profiler is disabled")
+
+    profiles = [
+        p for p in reversed(recent_profiles) if p["n_plus_one"] or not n_plus_one_only
+    ]
+    return {"data": profiles[:limit]}
@@ -0,0 +1,32 @@
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from api.dependencies import CurrentAdmin
+from db.dependency import get_db
+from fastapi import APIRouter, Depends, Query
+from services.drift import drift_monitor, window
+from sqlalchemy.orm import Session
+
+router = APIRouter()
+
+
+@router.get("/admin/drift")
+async def get_drift(
+    _admin: CurrentAdmin,
+    hours: int = Query(24, ge=1, le=24 * 90),
+    model_version: Optional[str] = Query(None),
+    db: Session = Depends(get_db),
+):
+    """Admin endpoint: feature and prediction statistics over the last `hours`
+    with drift scores against the training reference.
+    """
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    stats = window(db, since, model_version)
+    return {
+        "data": {
+            "since": since,
+            "model_version": model_version,
+            "has_reference": drift_monitor.reference is not None,
+            **stats.report(drift_monitor.reference),
+        }
+    }
@@ -8,15 +8,27 @@ from db.models.lab_notes import LabNote
 from fastapi import APIRouter, Depends, HTTPException, Path, Query
 from schemas.lab_notes import (
     LabNoteCreate,
+    LabNoteDetailResponse,
     LabNoteListResponse,
     LabNoteResponse,
     LabNoteUpdate,
 )
+from services.render import render_lab_note
+from services.suggest import suggestion_index
 from sqlalchemy import func
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, defer
 
 router = APIRouter()
 
+
+def apply_rendered_content(db_lab_note: LabNote, read_time: Optional[str] = None):
+    """Store rendered HTML and TOC, deriving read_time unless given explicitly."""
+    rendered = render_lab_note(db_lab_note.content)
+    db_lab_note.content_html = rendered["html"]
+    db_lab_note.toc = rendered["toc"]
+    db_lab_note.read_time = read_time or rendered["read_time"]
+
+
 # ============================================================================
 # Admin Routes (require authentication)
 # ============================================================================
@@ -74,9 +86,11 @@ async def create_lab_note(
         )
 
     db_lab_note = LabNote(**lab_note.model_dump())
+    apply_rendered_content(db_lab_note, lab_note.read_time)
     db.add(db_lab_note)
     db.commit()
     db.refresh(db_lab_note)
+    suggestion_index.index_lab_note(db_lab_note)
     return {"data": LabNoteResponse.model_validate(db_lab_note)}
 
 
@@ -110,8 +124,12 @@ async def update_lab_note(
     for field, value in update_data.items():
         setattr(db_lab_note, field, value)
 
+    if "content" in update_data:
+        apply_rendered_content(db_lab_note, update_data.get("read_time"))
+
     db.commit()
     db.refresh(db_lab_note)
+    suggestion_index.index_lab_note(db_lab_note)
     return {"data": LabNoteResponse.model_validate(db_lab_note)}
 
 
@@ -128,6 +146,7 @@ async def delete_lab_note(
 
     db.delete(db_lab_note)
     db.commit()
+    suggestion_index.remove("lab_note", id)
     return None
 
 
@@ -186,8 +205,20 @@ async def get_lab_note(
     db: Session = Depends(get_db),
     slug: str = Path(..., min_length=1, max_length=255),
 ):
-    """Public endpoint: Get a single lab note by slug."""
-    lab_note = db.query(LabNote).filter(LabNote.slug == slug).first()
+    """Public endpoint: Get a single lab note by slug, rendered as HTML."""
+    lab_note = (
+        db.query(LabNote)
+        .options(defer(LabNote.content))
+        .filter(LabNote.slug == slug)
+        .first()
+    )
     if not lab_note:
         raise HTTPException(status_code=404, detail="Lab note not found")
-    return {"data": LabNoteResponse.model_validate(lab_note)}
+
+    # Notes written before pre-rendering existed are rendered once, on first read
+    if lab_note.content_html is None:
+        apply_rendered_content(lab_note, lab_note.read_time)
+        db.commit()
+        db.refresh(lab_note)
+
+    return {"data": LabNoteDetailResponse.model_validate(lab_note)}
@@ -1,25 +1,52 @@
 import json
+import math
+import time
 from pathlib import Path
+from typing import Optional
 
-import joblib
-from core.config import INPUT_EXAMPLE
+from core.config import (
+    DRIFT_FLAG,
+    DRIFT_FLUSH_SECONDS,
+    INPUT_EXAMPLE,
+    MODEL_VERSION,
+    PREDICT_BATCH_MAX_ROWS,
+)
+from core.errors import FeatureStoreException, PayloadException
 from db.models.log import RequestLog
 from db.session import SessionLocal
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response
 from fastapi.concurrency import run_in_threadpool
+from fastapi.exceptions import RequestValidationError
 from loguru import logger
+from pydantic import ValidationError
 from schemas.prediction import (
+    EntityKeyInput,
+    EntityKeysInput,
     HealthResponse,
+    KeyedPrediction,
+    MachineLearningBatchResponse,
     MachineLearningDataInput,
     MachineLearningResponse,
 )
+from services import batch_codec
+from services.drift import FEATURES, drift_monitor, flush
+from services.feature_store import feature_store
+from services.inference_pool import inference_pool
 from services.predict import MachineLearningModelHandlerScore as MLModel
+from services.predict import load_joblib
+from sqlalchemy import insert
 
 router = APIRouter()
 
 
 def get_prediction(data_point):
-    return MLModel.predict(data_point, load_wrapper=joblib.load, method="predict")
+    return MLModel.predict(data_point, load_wrapper=load_joblib, method="predict")
+
+
+async def run_prediction(data_point):
+    if inference_pool.running:
+        return await inference_pool.predict(data_point)
+    return await run_in_threadpool(get_prediction, data_point)
 
 
 def get_prediction_label(prediction):
@@ -28,17 +55,103 @@ def get_prediction_label(prediction):
     return "label nok"
 
 
-@router.post(
-    "/predict",
-    response_model=MachineLearningResponse,
-    name="predict:get-data",
-)
-async def predict(data_input: MachineLearningDataInput):
-    if not data_input:
-        raise HTTPException(status_code=404, detail="'data_input' argument invalid!")
+def get_prediction_labels(predictions) -> list[str]:
+    """`get_prediction_label` of an array of predictions."""
+    import numpy as np
+
+    return np.where(np.asarray(predictions) == 1, "label ok", "label nok").tolist()
+
+
+def _is_json(content_type: Optional[str]) -> bool:
+    """Whether FastAPI would parse a body of `content_type` as JSON."""
+    if not content_type:
+        return True
+    kind = content_type.split(";")[0].strip().lower()
+    return kind == "application/json" or (
+        kind.startswith("application/") and kind.endswith("+json")
+    )
+
+
+def _validation_error(errors: list[dict], body=None) -> RequestValidationError:
+    return RequestValidationError(
+        [{**error, "loc": ("body", *error["loc"])} for error in errors], body=body
+    )
+
+
+def parse_features(body: bytes, content_type: Optional[str]) -> list[float]:
+    """The features of a /predict body, in FEATURES order.
+
+    A JSON object whose features are plain numbers is read with one
+    `json.loads` and a type check. Anything else is validated by
+    MachineLearningDataInput the way FastAPI would, so it is accepted or
+    rejected with the same 422 errors as a pydantic-typed route.
+    """
+    data = None
+    if body and _is_json(content_type):
+        try:
+            data = json.loads(body)
+        except json.JSONDecodeError as err:
+            raise RequestValidationError(
+                [
+                    {
+                        "type": "json_invalid",
+                        "loc": ("body", err.pos),
+                        "msg": "JSON decode error",
+                        "input": {},
+                        "ctx": {"error": err.msg},
+                    }
+                ],
+                body=err.doc,
+            ) from None
+        except Exception as err:
+            raise HTTPException(
+                status_code=400, detail="There was an error parsing the body"
+            ) from err
+        if type(data) is dict:
+            values = [data.get(name) for name in FEATURES]
+            if all(type(value) in (float, int) for value in values):
+                try:
+                    return [float(value) for value in values]
+                except OverflowError:
+                    pass
+    elif body:
+        data = body
+
+    if data is None:
+        missing = {"type": "missing", "loc": (), "msg": "Field required", "input": None}
+        raise _validation_error([missing])
     try:
-        data_point = data_input.get_np_array()
-        prediction = await run_in_threadpool(get_prediction, data_point)
+        # FastAPI validates body models with from_attributes; match its errors
+        data_input = MachineLearningDataInput.model_validate(data, from_attributes=True)
+    except ValidationError as err:
+        raise _validation_error(err.errors(include_url=False), body=data) from None
+    return [getattr(data_input, name) for name in FEATURES]
+
+
+def _response_parts(label: str) -> tuple[bytes, bytes]:
+    tail = json.dumps({"prediction_label": label}, separators=(",", ":"))
+    return b'{"prediction":', b"," + tail[1:].encode()
+
+
+# JSON of MachineLearningResponse around the prediction, encoded once
+_RESPONSES = {label: _response_parts(label) for label in ("label ok", "label nok")}
+
+
+def encode_prediction(prediction: float, label: str) -> bytes:
+    """MachineLearningResponse JSON, byte for byte as FastAPI renders it."""
+    head, tail = _RESPONSES[label]
+    return head + float.__repr__(prediction).encode() + tail
+
+
+async def predict_row(values: list[float]) -> tuple[float, str]:
+    """Predict and record one row of features; returns prediction and label."""
+    import numpy as np
+
+    try:
+        data_point = np.array([values], dtype=MLModel.input_dtype())
+        started = time.perf_counter()
+        prediction = await run_prediction(data_point)
+        latency_ms = (time.perf_counter() - started) * 1000
         try:
             prediction = float(prediction[0])
         except (TypeError, IndexError, KeyError):
@@ -47,23 +160,231 @@ async def predict(data_input: MachineLearningDataInput):
     except Exception as err:
         raise HTTPException(status_code=500, detail=f"Exception: {err}") from err
 
-    response = MachineLearningResponse(
+    await record_predictions([values], [prediction], [prediction_label], latency_ms)
+    return prediction, prediction_label
+
+
+async def predict(data_input: MachineLearningDataInput) -> MachineLearningResponse:
+    """Predict a validated input."""
+    if not data_input:
+        raise HTTPException(status_code=404, detail="'data_input' argument invalid!")
+    values = [getattr(data_input, name) for name in FEATURES]
+    prediction, prediction_label = await predict_row(values)
+    return MachineLearningResponse(
         prediction=prediction, prediction_label=prediction_label
     )
 
+
+@router.post(
+    "/predict",
+    response_model=MachineLearningResponse,
+    name="predict:get-data",
+    openapi_extra={
+        "requestBody": {
+            "required": True,
+            "content": {
+                "application/json": {
+                    "schema": MachineLearningDataInput.model_json_schema()
+                }
+            },
+        }
+    },
+)
+async def predict_body(request: Request):
+    """Predict one row of features.
+
+    Takes the same body as MachineLearningDataInput and answers with the same
+    errors, without building the pydantic models: the body is parsed straight
+    into the feature list and the response is written from pre-encoded parts.
+    """
+    values = parse_features(await request.body(), request.headers.get("content-type"))
+    prediction, prediction_label = await predict_row(values)
+    if not math.isfinite(prediction):
+        raise HTTPException(
+            status_code=500, detail="Exception: prediction is not finite"
+        )
+    return Response(
+        encode_prediction(prediction, prediction_label), media_type="application/json"
+    )
+
+
+def write_request_logs(rows: list[dict]) -> None:
     try:
         with SessionLocal() as db:
-            db.add(
-                RequestLog(
-                    request=json.dumps(data_input.model_dump()),
-                    response=json.dumps(response.model_dump()),
-                )
-            )
+            db.execute(insert(RequestLog), rows)
             db.commit()
     except Exception:
         logger.exception("failed to log request")
 
-    return response
+
+async def record_predictions(
+    features, predictions: list[float], labels: list[str], latency_ms: float
+) -> None:
+    """Log predictions of the (n, 5) `features`, an array or a list of rows,
+    to request_logs and feed them to the drift monitor.
+
+    The rows are inserted in one executemany off the event loop, so a large
+    batch does not stall other requests.
+    """
+    rows = features.tolist() if hasattr(features, "tolist") else features
+    columns = (*FEATURES, "prediction", "prediction_label")
+    logged = {"model_version": MODEL_VERSION, "latency_ms": latency_ms}
+    records = [
+        {**logged, **dict(zip(columns, (*row, prediction, label)))}
+        for row, prediction, label in zip(rows, predictions, labels)
+    ]
+    await run_in_threadpool(write_request_logs, records)
+
+    if DRIFT_FLAG:
+        if len(rows) == 1:
+            # Cheaper than the vectorized path for a single row
+            drift_monitor.observe(
+                dict(zip(FEATURES, rows[0])), predictions[0], labels[0]
+            )
+        else:
+            drift_monitor.observe_batch(features, predictions, labels)
+        if drift_monitor.due(DRIFT_FLUSH_SECONDS):
+            try:
+                await run_in_threadpool(flush, SessionLocal, MODEL_VERSION)
+            except Exception:
+                logger.exception("failed to flush drift statistics")
+
+
+def lookup_features(keys: list) -> tuple:
+    try:
+        return feature_store.lookup(keys)
+    except FeatureStoreException:
+        raise HTTPException(status_code=503, detail="No feature table loaded") from None
+
+
+async def predict_keyed(keys: list, features) -> list[dict]:
+    """Predict the rows of `features`, found for `keys`, in one call and
+    record them.
+    """
+    import numpy as np
+
+    try:
+        started = time.perf_counter()
+        predictions = await run_prediction(features)
+        latency_ms = (time.perf_counter() - started) * 1000
+        predictions = np.ravel(np.asarray(predictions, dtype=float)).tolist()
+    except Exception as err:
+        raise HTTPException(status_code=500, detail=f"Exception: {err}") from err
+
+    labels = get_prediction_labels(predictions)
+    await record_predictions(features, predictions, labels, latency_ms)
+    return [
+        {"key": str(key), "prediction": prediction, "prediction_label": label}
+        for key, prediction, label in zip(keys, predictions, labels)
+    ]
+
+
+@router.post(
+    "/predict/by-key",
+    response_model=MachineLearningResponse,
+    name="predict:by-key",
+)
+async def predict_by_key(data_input: EntityKeyInput):
+    """Predict from the precomputed features of an entity."""
+    features, found = lookup_features([data_input.key])
+    if not found[0]:
+        raise HTTPException(status_code=404, detail=f"Unknown key '{data_input.key}'")
+    (result,) = await predict_keyed([data_input.key], features)
+    return MachineLearningResponse(**result)
+
+
+@router.post(
+    "/predict/by-key/batch",
+    response_model=MachineLearningBatchResponse,
+    name="predict:by-key-batch",
+)
+async def predict_by_keys(data_input: EntityKeysInput):
+    """Predict for up to 1000 entities in one model call; unknown keys are
+    listed in `missing`.
+    """
+    features, found = lookup_features(data_input.keys)
+    keys = [key for key, hit in zip(data_input.keys, found) if hit]
+    results = await predict_keyed(keys, features) if keys else []
+    return MachineLearningBatchResponse(
+        predictions=[KeyedPrediction(**result) for result in results],
+        missing=[str(key) for key, hit in zip(data_input.keys, found) if not hit],
+    )
+
+
+def _batch_body_schema() -> dict:
+    matrix = {"type": "string", "format": "binary"}
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                batch_codec.JSON: {
+                    "schema": {
+                        "type": "object",
+                        "required": ["features"],
+                        "properties": {
+                            "features": {
+                                "type": "array",
+                                "items": {
+                                    "type": "array",
+                                    "items": {"type": "number"},
+                                    "minItems": len(FEATURES),
+                                    "maxItems": len(FEATURES),
+                                },
+                            }
+                        },
+                    }
+                },
+                batch_codec.NPY: {"schema": matrix},
+                batch_codec.ARROW_STREAM: {"schema": matrix},
+                batch_codec.ARROW_FILE: {"schema": matrix},
+            },
+        }
+    }
+
+
+@router.post(
+    "/predict/batch",
+    name="predict:batch",
+    openapi_extra=_batch_body_schema(),
+)
+async def predict_batch(request: Request):
+    """Predict an (n, 5) feature matrix in one model call.
+
+    The body is JSON (`{"features": [[...], ...]}`), an .npy array or an Arrow
+    IPC stream/file (a `fixed_size_list` column or feature1..feature5
+    columns), picked by Content-Type; the response is in the same format.
+    """
+    import numpy as np
+
+    content_type = request.headers.get("content-type", batch_codec.JSON)
+    kind = batch_codec.media_type(content_type)
+    if kind not in batch_codec.MEDIA_TYPES:
+        raise HTTPException(
+            status_code=415,
+            detail=f"Use one of {', '.join(batch_codec.MEDIA_TYPES)}",
+        )
+    try:
+        features = batch_codec.decode(kind, await request.body())
+    except PayloadException as err:
+        raise HTTPException(status_code=422, detail=str(err)) from None
+    if len(features) > PREDICT_BATCH_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {PREDICT_BATCH_MAX_ROWS} rows per request",
+        )
+
+    features = np.asarray(features, dtype=MLModel.input_dtype())
+    try:
+        started = time.perf_counter()
+        predictions = await run_prediction(features)
+        latency_ms = (time.perf_counter() - started) * 1000
+        predictions = np.ravel(np.asarray(predictions, dtype=float))
+    except Exception as err:
+        raise HTTPException(status_code=500, detail=f"Exception: {err}") from err
+
+    labels = get_prediction_labels(predictions)
+    await record_predictions(features, predictions.tolist(), labels, latency_ms)
+    return Response(batch_codec.encode(kind, predictions, labels), media_type=kind)
 
 
 @router.get(
@@ -75,8 +396,8 @@ async def health():
     try:
         content = await run_in_threadpool(Path(INPUT_EXAMPLE).read_text)
         test_input = MachineLearningDataInput(**json.loads(content))
-        test_point = test_input.get_np_array()
-        await run_in_threadpool(get_prediction, test_point)
+        test_point = test_input.get_np_array(MLModel.input_dtype())
+        await run_prediction(test_point)
         return HealthResponse(status=True)
     except Exception:
         raise HTTPException(status_code=404, detail="Unhealthy") from None
@@ -13,6 +13,7 @@ from schemas.projects import (
     ProjectResponse,
     ProjectUpdate,
 )
+from services.suggest import suggestion_index
 from sqlalchemy.orm import Session, joinedload
 
 router = APIRouter()
@@ -104,6 +105,7 @@ async def create_project(
         .filter(Project.id == project.id)
         .first()
     )
+    suggestion_index.index_project(project)
     return {"data": ProjectResponse.model_validate(project)}
 
 
@@ -157,6 +159,7 @@ async def update_project(
         .filter(Project.id == id)
         .first()
     )
+    suggestion_index.index_project(db_project)
     return {"data": ProjectResponse.model_validate(db_project)}
 
 
@@ -172,6 +175,7 @@ async def delete_project(
         raise HTTPException(status_code=404, detail="Project not found")
     db.delete(project)
     db.commit()
+    suggestion_index.remove("project", id)
     return None
 
 
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+from typing import Literal, Optional
+
+from api.dependencies import CurrentAdmin
+from core.config import REQUEST_LOG_EXPORT_CHUNK_SIZE
+from db.session import SessionLocal
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from services.log_export import MEDIA_TYPES, export
+
+router = APIRouter()
+
+
+def _utc(value: datetime) -> datetime:
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@router.get("/admin/request-logs/export")
+async def export_request_logs(
+    _admin: CurrentAdmin,
+    start: datetime = Query(..., description="Inclusive, UTC if no offset"),
+    end: Optional[datetime] = Query(None, description="Exclusive, defaults to now"),
+    format: Literal["ndjson", "csv", "parquet"] = Query("ndjson"),
+    model_version: Optional[str] = Query(None),
+):
+    """Admin endpoint: stream prediction logs in a time range.
+
+    Rows are fetched with a server-side cursor and sent as they are encoded,
+    so any range can be exported without holding it in memory.
+    """
+    start = _utc(start)
+    end = _utc(end) if end else datetime.now(timezone.utc)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="'start' must be before 'end'")
+
+    filename = f"request_logs_{start:%Y%m%dT%H%M%S}_{end:%Y%m%dT%H%M%S}.{format}"
+    # Reads through its own session: the response outlives the request scope
+    return StreamingResponse(
+        export(
+            SessionLocal,
+            format,
+            start,
+            end,
+            model_version=model_version,
+            chunk_size=REQUEST_LOG_EXPORT_CHUNK_SIZE,
+        ),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,130 @@
+"""Full-text search and autocomplete across published projects and lab notes."""
+
+from typing import Optional
+
+from core.paginator import decode_cursor, encode_cursor, keyset_pagination
+from db.dependency import get_db
+from db.models.lab_notes import LabNote
+from db.models.projects import Project
+from db.search import SEARCH_CONFIG
+from fastapi import APIRouter, Depends, HTTPException, Query
+from schemas.search import SearchResult, SearchResultType, Suggestion
+from services.suggest import suggestion_index
+from sqlalchemy import Double, cast, func, literal, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+router = APIRouter()
+
+HEADLINE_OPTIONS = (
+    "StartSel=<mark>, StopSel=</mark>, MaxWords=30, MinWords=10, MaxFragments=2"
+)
+
+
+def _rank(search_vector, tsquery):
+    # Cast to double so the rank round-trips exactly through the cursor
+    return cast(func.ts_rank_cd(search_vector, tsquery), Double).label("rank")
+
+
+def build_search_query(
+    q: str, type: Optional[SearchResultType], limit: int, after: Optional[dict]
+):
+    """Build the ranked, keyset-paginated search statement.
+
+    Matching and ranking run against the GIN-indexed search vectors; snippets
+    are only highlighted for the rows of the requested page.
+    """
+    tsquery = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+    selects = []
+    if type in (None, "project"):
+        selects.append(
+            select(
+                literal("project").label("type"),
+                Project.id,
+                Project.slug,
+                Project.title,
+                Project.description.label("body"),
+                _rank(Project.search_vector, tsquery),
+            ).where(Project.published, Project.search_vector.op("@@")(tsquery))
+        )
+    if type in (None, "lab_note"):
+        selects.append(
+            select(
+                literal("lab_note").label("type"),
+                LabNote.id,
+                LabNote.slug,
+                LabNote.title,
+                LabNote.content.label("body"),
+                _rank(LabNote.search_vector, tsquery),
+            ).where(LabNote.published, LabNote.search_vector.op("@@")(tsquery))
+        )
+
+    matches = (union_all(*selects) if len(selects) > 1 else selects[0]).subquery()
+    # Order by rank desc, then (type, id) as a unique tie-breaker
+    sort_key = tuple_(-matches.c.rank, matches.c.type, matches.c.id)
+    page = select(matches)
+    if after is not None:
+        page = page.where(sort_key > tuple_(-after["rank"], after["type"], after["id"]))
+    page = (
+        page.order_by(matches.c.rank.desc(), matches.c.type, matches.c.id)
+        .limit(limit + 1)
+        .subquery()
+    )
+
+    return select(
+        page.c.type,
+        page.c.id,
+        page.c.slug,
+        page.c.title,
+        page.c.rank,
+        func.ts_headline(SEARCH_CONFIG, page.c.body, tsquery, HEADLINE_OPTIONS).label(
+            "snippet"
+        ),
+    ).order_by(page.c.rank.desc(), page.c.type, page.c.id)
+
+
+@router.get("/search")
+async def search(
+    db: Session = Depends(get_db),
+    q: str = Query(..., min_length=1, max_length=200),
+    type: Optional[SearchResultType] = Query(None),
+    limit: int = Query(10, ge=1, le=50),
+    cursor: Optional[str] = Query(None),
+):
+    """Public endpoint: Ranked full-text search over published content."""
+    after = None
+    if cursor:
+        try:
+            after = decode_cursor(cursor)
+            after = {
+                "rank": float(after["rank"]),
+                "type": str(after["type"]),
+                "id": str(after["id"]),
+            }
+        except (ValueError, KeyError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor") from None
+
+    rows = db.execute(build_search_query(q, type, limit, after)).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            {"rank": last.rank, "type": last.type, "id": str(last.id)}
+        )
+
+    return {
+        "data": [SearchResult.model_validate(row) for row in rows],
+        "pagination": keyset_pagination(limit, next_cursor),
+    }
+
+
+@router.get("/suggest")
+async def suggest(
+    q: str = Query(..., min_length=1, max_length=100),
+    limit: int = Query(8, ge=1, le=20),
+):
+    """Public endpoint: Autocomplete titles, slugs and tags from memory."""
+    return {
+        "data": [Suggestion(**s) for s in suggestion_index.suggest(q, limit)],
+    }
@@ -1,7 +1,22 @@
 from api.dependencies import CurrentAdmin
-from fastapi import APIRouter, File, UploadFile
-from schemas.upload import DeleteResponse, UploadData, UploadResponse
-from services.storage import storage_service
+from db.dependency import get_db
+from db.images import referenced_urls
+from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+from schemas.upload import (
+    BatchDeleteData,
+    BatchDeleteItem,
+    BatchDeleteRequest,
+    BatchDeleteResponse,
+    DeleteResponse,
+    PresignUploadData,
+    PresignUploadRequest,
+    PresignUploadResponse,
+    UploadCompleteRequest,
+    UploadData,
+    UploadResponse,
+)
+from services.storage import IN_USE, storage_service
+from sqlalchemy.orm import Session
 
 router = APIRouter()
 
@@ -17,11 +32,61 @@ async def upload_image(
     return UploadResponse(data=UploadData(url=url, filename=file.filename))
 
 
+@router.post("/admin/upload/image/presign", response_model=PresignUploadResponse)
+async def presign_image_upload(
+    request: PresignUploadRequest,
+    _admin: CurrentAdmin,
+):
+    """Get a presigned PUT URL to upload an image directly to R2 storage."""
+    presigned = await storage_service.create_presigned_upload(
+        request.filename, request.content_type, request.folder
+    )
+    return PresignUploadResponse(data=PresignUploadData(**presigned))
+
+
+@router.post("/admin/upload/image/complete", response_model=UploadResponse)
+async def complete_image_upload(
+    request: UploadCompleteRequest,
+    _admin: CurrentAdmin,
+):
+    """Confirm a presigned upload exists in R2 storage. Returns the public URL."""
+    url = await storage_service.confirm_upload(request.key)
+    return UploadResponse(data=UploadData(url=url, filename=request.filename))
+
+
 @router.delete("/admin/upload/image", response_model=DeleteResponse)
 async def delete_image(
     _admin: CurrentAdmin,
     url: str,
+    db: Session = Depends(get_db),
 ):
-    """Delete an image from R2 storage by its URL."""
+    """Delete an image from R2 storage by its URL.
+
+    Content-addressed images still used by a project or lab note are kept (409).
+    """
+    if storage_service.is_content_url(url) and referenced_urls(db, [url]):
+        raise HTTPException(409, f"Image is {IN_USE}")
     await storage_service.delete_image(url)
     return DeleteResponse(message="Image deleted successfully")
+
+
+@router.post("/admin/upload/image/batch-delete", response_model=BatchDeleteResponse)
+async def delete_images(
+    request: BatchDeleteRequest,
+    _admin: CurrentAdmin,
+    db: Session = Depends(get_db),
+):
+    """Delete many images from R2 storage by URL. Reports the result per URL;
+    content-addressed images still in use are kept and reported as failed.
+    """
+    shared = [url for url in request.urls if storage_service.is_content_url(url)]
+    keep = frozenset(referenced_urls(db, shared))
+    results = await storage_service.delete_images(request.urls, keep=keep)
+    deleted = sum(1 for r in results if r["deleted"])
+    return BatchDeleteResponse(
+        data=BatchDeleteData(
+            deleted=deleted,
+            failed=len(results) - deleted,
+            results=[BatchDeleteItem(**r) for r in results],
+        )
+    )
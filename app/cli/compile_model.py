@@ -0,0 +1,67 @@
+"""Compile the served scikit-learn model into a NumPy kernel.
+
+Usage:
+    PYTHONPATH=app python -m cli.compile_model
+    PYTHONPATH=app python -m cli.compile_model ml/model/model.pkl --output model.npz
+
+Writes `<model>.npz` next to the model by default, which
+`MachineLearningModelHandlerScore.load` prefers over the pickle as long as it
+records the pickle's digest. Predictions on the example input (and random rows
+around it) must match sklearn before anything is written.
+"""
+
+import json
+from pathlib import Path
+
+import click
+import numpy as np
+from core.config import INPUT_EXAMPLE, MODEL_NAME, MODEL_PATH
+from core.errors import ModelCompileException
+from loguru import logger
+from schemas.prediction import MachineLearningDataInput
+from services.compiled_model import compile_model
+from services.predict import compiled_path, load_joblib
+
+
+def parity_rows(n_rows: int, seed: int = 0) -> np.ndarray:
+    """The example input plus `n_rows` random perturbations of it."""
+    example = MachineLearningDataInput(
+        **json.loads(Path(INPUT_EXAMPLE).read_text())
+    ).get_np_array()
+    rng = np.random.default_rng(seed)
+    scale = np.maximum(np.abs(example), 1.0)
+    noise = rng.normal(size=(n_rows, example.shape[1])) * scale
+    return np.vstack([example, example + noise])
+
+
+@click.command()
+@click.argument("model_path", default=str(Path(MODEL_PATH) / MODEL_NAME))
+@click.option("--output", default=None, type=click.Path(), help="Defaults to .npz.")
+@click.option("--rows", default=1000, show_default=True, help="Parity check rows.")
+def main(model_path, output, rows):
+    """Compiles MODEL_PATH and checks it against sklearn's predict."""
+    estimator = load_joblib(model_path)
+    try:
+        compiled = compile_model(estimator)
+    except ModelCompileException as err:
+        raise click.ClickException(f"Model cannot be compiled: {err}") from None
+
+    inputs = parity_rows(rows)
+    expected, actual = estimator.predict(inputs), compiled.predict(inputs)
+    if compiled.task == "classification":
+        mismatches = int(np.sum(expected != actual))
+    else:
+        mismatches = int(np.sum(~np.isclose(expected, actual)))
+    if mismatches:
+        raise click.ClickException(
+            f"{mismatches}/{len(inputs)} predictions differ from sklearn, not writing"
+        )
+
+    output = output or compiled_path(model_path)
+    compiled.save(output, source=model_path)
+    logger.info(f"Compiled {type(estimator).__name__} to {output} ({compiled}).")
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
@@ -0,0 +1,51 @@
+"""Build the drift reference from the training set.
+
+Usage:
+    PYTHONPATH=app python -m cli.drift_reference data/processed/train.parquet
+    PYTHONPATH=app python -m cli.drift_reference train.csv --output reference.json
+
+The training data needs the feature1..feature5 columns. The served model
+predicts on it, and the feature, prediction and label distributions are
+written to DRIFT_REFERENCE, which the API loads on startup to score drift.
+"""
+
+import json
+from pathlib import Path
+
+import click
+import numpy as np
+from api.routes.predictor import get_prediction_labels
+from core.config import DRIFT_REFERENCE, MODEL_NAME, MODEL_PATH
+from loguru import logger
+from services.drift import FEATURES, build_reference
+from services.predict import load_joblib
+
+
+def read_training_data(path: str) -> np.ndarray:
+    import pandas as pd
+
+    if Path(path).suffix == ".parquet":
+        frame = pd.read_parquet(path, columns=list(FEATURES))
+    else:
+        frame = pd.read_csv(path, usecols=list(FEATURES))
+    return frame[list(FEATURES)].to_numpy(dtype=float)
+
+
+@click.command()
+@click.argument("training_data", type=click.Path(exists=True))
+@click.option("--model", "model_path", default=str(Path(MODEL_PATH) / MODEL_NAME))
+@click.option("--output", default=DRIFT_REFERENCE, show_default=True)
+@click.option("--bins", default=10, show_default=True, help="Histogram bins.")
+def main(training_data, model_path, output, bins):
+    """Writes reference distributions of TRAINING_DATA for drift scoring."""
+    features = read_training_data(training_data)
+    predictions = np.asarray(load_joblib(model_path).predict(features), dtype=float)
+    labels = get_prediction_labels(predictions)
+    reference = build_reference(features, predictions, labels, bins=bins)
+    Path(output).write_text(json.dumps(reference, indent=2))
+    logger.info(f"Wrote drift reference of {len(features)} rows to {output}.")
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
@@ -0,0 +1,258 @@
+"""Export public API responses as static JSON files for CDN hosting.
+
+Usage:
+    PYTHONPATH=app python -m cli.export_snapshot data/snapshot --precompress
+
+Layout mirrors the public API under `v1/`:
+    v1/projects/index.json, v1/projects/pages/{n}.json, v1/projects/{slug}.json
+    v1/projects/category/{id}/pages/{n}.json
+    v1/lab-notes/index.json, v1/lab-notes/pages/{n}.json, v1/lab-notes/{slug}.json
+    v1/lab-notes/tags.json
+    v1/categories.json, v1/categories/with-counts.json, v1/categories/{id}.json
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+
+import click
+from core.compression import compress
+from db.models.category import Category
+from db.models.lab_notes import LabNote
+from db.models.projects import Project
+from db.session import SessionLocal
+from fastapi.testclient import TestClient
+from loguru import logger
+
+PAGE_SIZE = 100
+MANIFEST_NAME = "_manifest.json"
+PRECOMPRESSED = {"gzip": ".gz", "br": ".br"}
+
+
+class SnapshotWriter:
+    """Write files atomically, skipping unchanged content so CDN syncs stay small."""
+
+    def __init__(self, root: Path, precompress: bool = False):
+        self.root = root
+        self.precompress = precompress
+        self.written = 0
+        self.unchanged = 0
+        self.removed = 0
+
+    def write(self, relpath: str, body: bytes) -> None:
+        path = self.root / relpath
+        siblings = {
+            encoding: path.with_name(path.name + suffix)
+            for encoding, suffix in PRECOMPRESSED.items()
+        }
+        # Unchanged only if the compressed variants are there too, so turning
+        # on precompression completes an existing snapshot
+        if (
+            path.exists()
+            and path.read_bytes() == body
+            and (not self.precompress or all(p.exists() for p in siblings.values()))
+        ):
+            self.unchanged += 1
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._atomic_write(path, body)
+        for encoding, sibling in siblings.items():
+            if self.precompress:
+                self._atomic_write(sibling, compress(body, encoding))
+            elif sibling.exists():
+                # Left by an earlier precompressed export, now stale
+                sibling.unlink()
+        self.written += 1
+
+    def remove(self, relpath: str) -> None:
+        path = self.root / relpath
+        for candidate in [
+            path,
+            *(path.with_name(path.name + s) for s in PRECOMPRESSED.values()),
+        ]:
+            if candidate.exists():
+                candidate.unlink()
+        self.removed += 1
+
+    @staticmethod
+    def _atomic_write(path: Path, body: bytes) -> None:
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_bytes(body)
+        os.replace(tmp, path)
+
+
+def diff_entities(previous: dict, current: dict) -> tuple[set, set]:
+    """Compare {key: updated_at} maps.
+
+    Returns:
+        (changed keys to re-export, removed keys to delete)
+    """
+    changed = {key for key, stamp in current.items() if previous.get(key) != stamp}
+    removed = set(previous) - set(current)
+    return changed, removed
+
+
+def _stamp(value) -> str:
+    return value.isoformat() if value else ""
+
+
+def _load_entities(db) -> dict:
+    """Current published entities keyed for export, with their update stamps."""
+    return {
+        "projects": {
+            slug: _stamp(updated_at)
+            for slug, updated_at in db.query(Project.slug, Project.updated_at).filter(
+                Project.published
+            )
+        },
+        "lab_notes": {
+            slug: _stamp(updated_at)
+            for slug, updated_at in db.query(LabNote.slug, LabNote.updated_at).filter(
+                LabNote.published
+            )
+        },
+        "categories": {
+            str(id): _stamp(updated_at)
+            for id, updated_at in db.query(Category.id, Category.updated_at)
+        },
+    }
+
+
+def _fetch(client: TestClient, path: str, params: dict | None = None) -> bytes:
+    response = client.get(
+        f"/api/v1{path}", params=params, headers={"Accept-Encoding": "identity"}
+    )
+    response.raise_for_status()
+    return response.content
+
+
+def _export_pages(
+    client: TestClient,
+    writer: SnapshotWriter,
+    api_path: str,
+    out_dir: str,
+    params: dict | None = None,
+) -> None:
+    """Export every page of a list endpoint and drop pages past the new end."""
+    page = 1
+    while True:
+        body = _fetch(
+            client,
+            api_path,
+            {**(params or {}), "limit": PAGE_SIZE, "offset": (page - 1) * PAGE_SIZE},
+        )
+        writer.write(f"{out_dir}/pages/{page}.json", body)
+        if page == 1:
+            writer.write(f"{out_dir}/index.json", body)
+        if not json.loads(body)["pagination"]["hasMore"]:
+            break
+        page += 1
+
+    pages_dir = writer.root / out_dir / "pages"
+    for stale in pages_dir.glob("*.json"):
+        if stale.stem.isdigit() and int(stale.stem) > page:
+            writer.remove(f"{out_dir}/pages/{stale.name}")
+
+
+def pipeline(output_dir: str, precompress: bool = False, full: bool = False) -> dict:
+    # Imported here so the exporter doesn't build the app on `--help`
+    from main import get_application
+
+    root = Path(output_dir)
+    root.mkdir(parents=True, exist_ok=True)
+    manifest_path = root / MANIFEST_NAME
+    manifest = {}
+    if manifest_path.exists() and not full:
+        manifest = json.loads(manifest_path.read_text())
+    # Entities the manifest skips never reach the writer, so switching
+    # --precompress on or off re-exports everything
+    if manifest.get("precompress", False) != precompress:
+        full, manifest = True, {}
+
+    with SessionLocal() as db:
+        current = _load_entities(db)
+
+    writer = SnapshotWriter(root, precompress)
+    client = TestClient(get_application())
+
+    any_change = full or not manifest
+    detail_exports = {
+        "categories": ("/categories/{}", "v1/categories/{}.json"),
+        "projects": ("/projects/{}", "v1/projects/{}.json"),
+        "lab_notes": ("/lab-notes/{}", "v1/lab-notes/{}.json"),
+    }
+    for kind, (api_path, out_path) in detail_exports.items():
+        previous = {} if full else manifest.get(kind, {})
+        if kind == "projects" and any_change:
+            # Project payloads embed their category, refresh them all
+            previous = {}
+        changed, removed = diff_entities(previous, current[kind])
+        any_change = any_change or bool(changed or removed)
+        for key in sorted(changed):
+            writer.write(out_path.format(key), _fetch(client, api_path.format(key)))
+        for key in sorted(removed):
+            writer.remove(out_path.format(key))
+        logger.info(f"{kind}: {len(changed)} exported, {len(removed)} removed")
+
+    # Listings and tag counts depend on every entity, refresh them on any change
+    if any_change:
+        _export_pages(client, writer, "/projects", "v1/projects")
+        for category_id in current["categories"]:
+            _export_pages(
+                client,
+                writer,
+                "/projects",
+                f"v1/projects/category/{category_id}",
+                {"category_id": category_id},
+            )
+        _export_pages(client, writer, "/lab-notes", "v1/lab-notes")
+        writer.write("v1/lab-notes/tags.json", _fetch(client, "/lab-notes/tags"))
+        writer.write("v1/categories.json", _fetch(client, "/categories"))
+        writer.write(
+            "v1/categories/with-counts.json",
+            _fetch(client, "/categories", {"include_counts": "true"}),
+        )
+        for category_id in set(manifest.get("categories", {})) - set(
+            current["categories"]
+        ):
+            shutil.rmtree(root / f"v1/projects/category/{category_id}", True)
+
+    manifest_path.write_text(
+        json.dumps(
+            {
+                "exported_at": datetime.now(timezone.utc).isoformat(),
+                "precompress": precompress,
+                **current,
+            },
+            indent=2,
+            sort_keys=True,
+        )
+    )
+    return {
+        "written": writer.written,
+        "unchanged": writer.unchanged,
+        "removed": writer.removed,
+    }
+
+
+@click.command()
+@click.argument("output_dir", default="data/snapshot", type=click.Path())
+@click.option("--precompress", is_flag=True, help="Also write .gz and .br files.")
+@click.option("--full", is_flag=True, help="Ignore the manifest and export all.")
+def main(output_dir, precompress, full):
+    """Renders every public endpoint response into OUTPUT_DIR as JSON files,
+    re-exporting only entities whose updated_at changed since the last run.
+    """
+    logger.info(f"Export public snapshot to {output_dir}.")
+    stats = pipeline(output_dir, precompress=precompress, full=full)
+    logger.info(
+        f"Snapshot done: {stats['written']} written, {stats['unchanged']} "
+        f"unchanged, {stats['removed']} removed."
+    )
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
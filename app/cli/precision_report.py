@@ -0,0 +1,103 @@
+"""Compare float32 against float64 inference of the compiled model.
+
+Usage:
+    PYTHONPATH=app python -m cli.precision_report
+    PYTHONPATH=app python -m cli.precision_report ml/model/model.pkl --rows 5000
+
+Scores the example input and random rows around it (the compile parity set)
+with the float64 and float32 kernels and prints, as JSON, how often they
+disagree (classification) or by how much (regression), the memory of both
+and their batch scoring time. Exits with an error when float32 disagrees more
+than `--tolerance` allows, so it can gate MODEL_PRECISION=float32.
+"""
+
+import json
+import time
+from pathlib import Path
+
+import click
+import numpy as np
+from cli.compile_model import parity_rows
+from core.config import MODEL_NAME, MODEL_PATH
+from core.errors import ModelCompileException
+from services.compiled_model import CompiledModel, compile_model
+from services.predict import load_joblib
+
+
+def _best_time(model: CompiledModel, data: np.ndarray, repeat: int = 5) -> float:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        model.predict(data)
+        timings.append(time.perf_counter() - started)
+    return min(timings)
+
+
+def precision_report(
+    compiled: CompiledModel, rows: np.ndarray, batch_rows: int = 100_000
+) -> dict:
+    """Parity of float32 against float64 on `rows`, memory and batch timing."""
+    reduced = compiled.astype(np.float32)
+    expected, actual = compiled.predict(rows), reduced.predict(rows)
+    report = {
+        "task": compiled.task,
+        "kind": compiled.kind,
+        "rows": len(rows),
+        "float64_bytes": compiled.nbytes,
+        "float32_bytes": reduced.nbytes,
+    }
+    if compiled.task == "classification":
+        mismatches = int(np.sum(expected != actual))
+        report.update(mismatches=mismatches, disagreement=mismatches / len(rows))
+    else:
+        error = np.abs(actual.astype(np.float64) - expected)
+        scale = np.maximum(np.abs(expected), np.finfo(np.float32).tiny)
+        report.update(
+            max_abs_error=float(error.max()),
+            mean_abs_error=float(error.mean()),
+            max_rel_error=float((error / scale).max()),
+        )
+
+    batch = np.resize(rows, (batch_rows, rows.shape[1]))
+    report["batch_rows"] = batch_rows
+    report["float64_batch_seconds"] = _best_time(compiled, batch)
+    report["float32_batch_seconds"] = _best_time(reduced, batch.astype(np.float32))
+    return report
+
+
+@click.command()
+@click.argument("model_path", default=str(Path(MODEL_PATH) / MODEL_NAME))
+@click.option("--rows", default=1000, show_default=True, help="Parity rows.")
+@click.option("--batch-rows", default=100_000, show_default=True)
+@click.option(
+    "--tolerance",
+    default=1e-3,
+    show_default=True,
+    help="Max share of differing labels, or max relative error for regression.",
+)
+@click.option("--output", default=None, type=click.Path(), help="Also write JSON.")
+def main(model_path, rows, batch_rows, tolerance, output):
+    """Reports float32 vs float64 parity of MODEL_PATH."""
+    try:
+        compiled = compile_model(load_joblib(model_path))
+    except ModelCompileException as err:
+        raise click.ClickException(
+            f"float32 inference needs a compiled model: {err}"
+        ) from None
+
+    report = precision_report(compiled, parity_rows(rows), batch_rows)
+    text = json.dumps(report, indent=2)
+    click.echo(text)
+    if output:
+        Path(output).write_text(text)
+
+    error = report.get("disagreement", report.get("max_rel_error"))
+    if error > tolerance:
+        raise click.ClickException(
+            f"float32 differs from float64 by {error:.3g} > {tolerance:g}"
+        )
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
@@ -0,0 +1,93 @@
+"""Maintain the partitioned request_logs table.
+
+Usage:
+    PYTHONPATH=app python -m cli.request_logs maintain
+    PYTHONPATH=app python -m cli.request_logs partitions --months 3
+    PYTHONPATH=app python -m cli.request_logs retention --days 90
+    PYTHONPATH=app python -m cli.request_logs rollup --hours 48
+
+`maintain` runs all three and is meant for an hourly cron: partitions for the
+coming months exist before rows arrive, complete hours are rolled up into
+request_log_hourly, months entirely past the retention window are dropped and
+expired rows are deleted from the default partition.
+App startup also creates this and the next two months' partitions, so logging
+keeps landing in monthly partitions between runs; rows that reached the
+default partition anyway are moved when their month is created. Retention
+and rollups happen only here.
+"""
+
+from datetime import date, datetime, timedelta, timezone
+
+import click
+from core.config import REQUEST_LOG_RETENTION_DAYS
+from db import request_logs
+from db.session import SessionLocal
+from loguru import logger
+
+
+def create_partitions(months: int) -> None:
+    with SessionLocal() as db:
+        created = request_logs.create_partitions(db, date.today(), months)
+    logger.info(f"Created partitions: {', '.join(created) or 'none'}.")
+
+
+def apply_retention(days: int) -> None:
+    cutoff = date.today() - timedelta(days=days)
+    with SessionLocal() as db:
+        dropped = request_logs.drop_partitions(db, cutoff)
+        purged = request_logs.purge_default(db, cutoff)
+    logger.info(f"Dropped partitions before {cutoff}: {', '.join(dropped) or 'none'}.")
+    logger.info(f"Deleted {purged} rows before {cutoff} from the default partition.")
+
+
+def rollup_hours(hours: int) -> None:
+    until = request_logs.last_complete_hour()
+    since = until - timedelta(hours=hours)
+    with SessionLocal() as db:
+        written = request_logs.rollup(db, since, until)
+    logger.info(
+        f"Rolled up {since:%Y-%m-%d %H:00} to {until:%Y-%m-%d %H:00}: {written} rows."
+    )
+
+
+@click.group()
+def main():
+    """Request log partitions, retention and hourly rollups."""
+
+
+@main.command()
+@click.option("--months", default=3, show_default=True, help="Months ahead.")
+def partitions(months):
+    """Creates monthly partitions from this month on."""
+    create_partitions(months)
+
+
+@main.command()
+@click.option("--days", default=REQUEST_LOG_RETENTION_DAYS, show_default=True)
+def retention(days):
+    """Drops partitions older than the retention window."""
+    apply_retention(days)
+
+
+@main.command()
+@click.option("--hours", default=48, show_default=True, help="Hours to recompute.")
+def rollup(hours):
+    """Recomputes hourly aggregates for the last complete hours."""
+    rollup_hours(hours)
+
+
+@main.command()
+@click.option("--months", default=3, show_default=True)
+@click.option("--days", default=REQUEST_LOG_RETENTION_DAYS, show_default=True)
+@click.option("--hours", default=48, show_default=True)
+def maintain(months, days, hours):
+    """Runs partitions, rollup and retention, in that order."""
+    started = datetime.now(timezone.utc)
+    create_partitions(months)
+    rollup_hours(hours)
+    apply_retention(days)
+    logger.info(f"Maintenance done in {datetime.now(timezone.utc) - started}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,391 @@
+"""Train the served model out of core, with versioned artifacts.
+
+Usage:
+    PYTHONPATH=app python -m cli.train_model data/processed
+    PYTHONPATH=app python -m cli.train_model logs.parquet --target prediction \\
+        --warm-start
+
+Reads Parquet, CSV or NDJSON files (directories are searched recursively,
+so request log exports work as they are) in batches of `--batch-size` rows
+and fits a StandardScaler plus a `partial_fit` estimator, so the dataset
+never has to fit in memory. Every `1 / --holdout`-th row is kept out of
+training and scored after the last epoch. `--warm-start` continues from the
+served model instead of starting afresh, for retraining on newly logged
+predictions.
+
+Each run writes MODEL_PATH/versions/<version>/ with model.pkl, the compiled
+model.npz when the model compiles, reference_stats.json for drift scoring
+and metadata.json (feature schema, metrics, rows, training time). Unless
+`--no-promote` is given, the artifacts then atomically replace the served
+model, its compiled kernel and DRIFT_REFERENCE, which
+`MachineLearningModelHandlerScore` picks up on its next load.
+"""
+
+import json
+import os
+import shutil
+import time
+from collections.abc import Iterator
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import click
+import numpy as np
+from core.config import DRIFT_REFERENCE, MODEL_NAME, MODEL_PATH
+from core.errors import ModelCompileException
+from loguru import logger
+from services.drift import FEATURES, build_reference
+from services.predict import compiled_path, load_joblib
+
+SUFFIXES = {".parquet", ".csv", ".ndjson", ".jsonl"}
+ESTIMATORS = ("sgd-classifier", "sgd-regressor")
+
+
+def data_files(paths: tuple[str, ...]) -> list[Path]:
+    """Data files under `paths`, skipping hidden and cache directories and
+    `.tmp` staging entries. Partition directories such as `source=a.csv` are
+    searched, not read.
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_file():
+            files.append(path)
+            continue
+        files.extend(
+            p
+            for p in sorted(path.rglob("*"))
+            if p.is_file()
+            and p.suffix.lower() in SUFFIXES
+            and not any(
+                part.startswith((".", "_")) or part.endswith(".tmp")
+                for part in p.relative_to(path).parts
+            )
+        )
+    return files
+
+
+def iter_batches(
+    files: list[Path], columns: list[str], batch_size: int
+) -> Iterator[np.ndarray]:
+    """Float64 arrays of `columns`, at most `batch_size` rows each, without
+    rows holding missing or non-finite values.
+    """
+    import pandas as pd
+    import pyarrow.parquet as pq
+
+    for file in files:
+        suffix = file.suffix.lower()
+        if suffix == ".parquet":
+            frames = (
+                batch.to_pandas()
+                for batch in pq.ParquetFile(file).iter_batches(
+                    batch_size=batch_size, columns=columns
+                )
+            )
+        elif suffix == ".csv":
+            frames = pd.read_csv(file, usecols=columns, chunksize=batch_size)
+        else:
+            frames = pd.read_json(file, lines=True, chunksize=batch_size)
+        for frame in frames:
+            batch = frame[columns].to_numpy(dtype="float64")
+            yield batch[np.isfinite(batch).all(axis=1)]
+
+
+def split(batches: Iterator[np.ndarray], every: int, holdout: bool):
+    """Training rows, or with `holdout` the held-out rows: every `every`-th
+    row of the stream, counted across batches.
+    """
+    seen = 0
+    for batch in batches:
+        index = seen + np.arange(len(batch))
+        held = index % every == 0 if every else np.zeros(len(batch), dtype=bool)
+        seen += len(batch)
+        rows = batch[held] if holdout else batch[~held]
+        if len(rows):
+            yield rows[:, :-1], rows[:, -1]
+
+
+class Reservoir:
+    """Uniform sample of at most `size` rows of a stream."""
+
+    def __init__(self, size: int, seed: int):
+        self.size = size
+        self.rng = np.random.default_rng(seed)
+        self.rows = None
+        self.keys = np.empty(0)
+
+    def add(self, rows: np.ndarray) -> None:
+        keys = np.concatenate([self.keys, self.rng.random(len(rows))])
+        rows = rows if self.rows is None else np.vstack([self.rows, rows])
+        if len(rows) > self.size:
+            keep = np.argpartition(keys, self.size)[: self.size]
+            keys, rows = keys[keep], rows[keep]
+        self.keys, self.rows = keys, rows
+
+
+class Metrics:
+    """Holdout metrics accumulated batch by batch."""
+
+    def __init__(self, classifier: bool):
+        self.classifier = classifier
+        self.count = 0
+        self.correct = 0
+        self.abs_error = self.sq_error = self.y_sum = self.y_sq_sum = 0.0
+
+    def update(self, y: np.ndarray, predicted: np.ndarray) -> None:
+        self.count += len(y)
+        if self.classifier:
+            self.correct += int(np.sum(predicted == y))
+            return
+        error = predicted - y
+        self.abs_error += float(np.abs(error).sum())
+        self.sq_error += float(np.square(error).sum())
+        self.y_sum += float(y.sum())
+        self.y_sq_sum += float(np.square(y).sum())
+
+    def to_dict(self) -> dict:
+        if not self.count:
+            return {"holdout_rows": 0}
+        if self.classifier:
+            return {"holdout_rows": self.count, "accuracy": self.correct / self.count}
+        total = self.y_sq_sum - self.y_sum**2 / self.count
+        return {
+            "holdout_rows": self.count,
+            "mae": self.abs_error / self.count,
+            "rmse": float(np.sqrt(self.sq_error / self.count)),
+            "r2": 1 - self.sq_error / total if total else None,
+        }
+
+
+def new_model(estimator: str, seed: int):
+    from sklearn.linear_model import SGDClassifier, SGDRegressor
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import StandardScaler
+
+    model = (
+        SGDClassifier(loss="log_loss", random_state=seed)
+        if estimator == "sgd-classifier"
+        else SGDRegressor(random_state=seed)
+    )
+    return Pipeline([("scaler", StandardScaler()), ("model", model)])
+
+
+def new_version(root: Path) -> str:
+    version = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%SZ}"
+    suffix = 1
+    while (root / version).exists():
+        version = f"{version.split('.')[0]}.{suffix}"
+        suffix += 1
+    return version
+
+
+def _replace(source: Path, target: Path) -> None:
+    """Copy `source` over `target` so readers see the old or the new file."""
+    staging = target.with_name(f".{target.name}.tmp")
+    shutil.copyfile(source, staging)
+    os.replace(staging, target)
+
+
+def promote(version_dir: Path, model_path: Path, reference_path: Path) -> None:
+    """Serve the artifacts in `version_dir`."""
+    model_path.parent.mkdir(parents=True, exist_ok=True)
+    compiled = Path(compiled_path(str(model_path)))
+    # Model first: a kernel older than the model is never loaded
+    _replace(version_dir / "model.pkl", model_path)
+    if (version_dir / "model.npz").exists():
+        _replace(version_dir / "model.npz", compiled)
+    else:
+        compiled.unlink(missing_ok=True)
+    reference_path.parent.mkdir(parents=True, exist_ok=True)
+    _replace(version_dir / "reference_stats.json", reference_path)
+    (model_path.parent / "versions" / "LATEST").write_text(version_dir.name + "\n")
+
+
+def train(
+    paths: tuple[str, ...],
+    target: str = "target",
+    estimator: str = "sgd-classifier",
+    epochs: int = 5,
+    batch_size: int = 50_000,
+    holdout: float = 0.1,
+    warm_start: bool = False,
+    sample: int = 100_000,
+    seed: int = 0,
+    model_path: Optional[str] = None,
+) -> tuple[object, dict, np.ndarray]:
+    """Fit a model on the files under `paths`.
+
+    Returns the fitted pipeline, its metadata and a uniform sample of the
+    training features for the drift reference.
+    """
+    files = data_files(paths)
+    if not files:
+        raise click.ClickException(f"No data files under {', '.join(paths)}")
+    columns = [*FEATURES, target]
+    every = round(1 / holdout) if holdout else 0
+
+    def batches(held_out: bool = False):
+        return split(iter_batches(files, columns, batch_size), every, held_out)
+
+    from sklearn.base import is_classifier
+
+    started = time.perf_counter()
+    if warm_start:
+        model = load_joblib(model_path)
+        logger.info(f"Continuing training of {model_path}.")
+    else:
+        model = new_model(estimator, seed)
+    scaler, fitted = model.steps[0][1], model.steps[-1][1]
+    classifier = is_classifier(fitted)
+
+    # Scan: row count, classes, feature sample and (from scratch) the scaler
+    rows, classes = 0, np.empty(0)
+    reservoir = Reservoir(sample, seed)
+    for x, y in batches():
+        rows += len(x)
+        reservoir.add(x)
+        if classifier:
+            classes = np.union1d(classes, y)
+        if not warm_start:
+            scaler.partial_fit(x)
+    if not rows:
+        raise click.ClickException("No valid training rows")
+    if classifier and warm_start:
+        classes = np.union1d(classes, fitted.classes_)
+        if len(classes) != len(fitted.classes_):
+            raise click.ClickException(
+                f"Classes {classes.tolist()} differ from the model's "
+                f"{fitted.classes_.tolist()}; train from scratch"
+            )
+
+    for epoch in range(epochs):
+        for x, y in batches():
+            if classifier:
+                fitted.partial_fit(scaler.transform(x), y, classes=classes)
+            else:
+                fitted.partial_fit(scaler.transform(x), y)
+        logger.info(f"Epoch {epoch + 1}/{epochs} done.")
+
+    metrics = Metrics(classifier)
+    for x, y in batches(held_out=True):
+        metrics.update(y, model.predict(x))
+
+    import sklearn
+
+    metadata = {
+        "estimator": type(fitted).__name__,
+        "params": {k: repr(v) for k, v in fitted.get_params().items()},
+        "sklearn_version": sklearn.__version__,
+        "features": [{"name": name, "dtype": "float64"} for name in FEATURES],
+        "target": target,
+        "classes": classes.tolist() if classifier else None,
+        "training_rows": rows,
+        "epochs": epochs,
+        "batch_size": batch_size,
+        "warm_start": warm_start,
+        "metrics": metrics.to_dict(),
+        "training_seconds": time.perf_counter() - started,
+        "sources": [
+            {"path": str(f), "size": f.stat().st_size, "mtime": f.stat().st_mtime}
+            for f in files
+        ],
+    }
+    return model, metadata, reservoir.rows
+
+
+def write_artifacts(model, metadata: dict, sample: np.ndarray, version_dir: Path):
+    import joblib
+    from api.routes.predictor import get_prediction_labels
+    from services.compiled_model import compile_model
+
+    version_dir.mkdir(parents=True)
+    joblib.dump(model, version_dir / "model.pkl")
+
+    predictions = np.asarray(model.predict(sample), dtype=float)
+    try:
+        compiled = compile_model(model)
+    except ModelCompileException as err:
+        logger.info(f"Model not compiled: {err}")
+    else:
+        if np.allclose(compiled.predict(sample), predictions):
+            compiled.save(
+                str(version_dir / "model.npz"), source=str(version_dir / "model.pkl")
+            )
+        else:
+            logger.warning("Compiled model differs from sklearn, not writing it")
+    metadata["compiled"] = (version_dir / "model.npz").exists()
+
+    labels = get_prediction_labels(predictions)
+    reference = build_reference(sample, predictions, labels)
+    (version_dir / "reference_stats.json").write_text(json.dumps(reference))
+    (version_dir / "metadata.json").write_text(json.dumps(metadata, indent=2))
+
+
+@click.command()
+@click.argument("paths", nargs=-1, required=True, type=click.Path(exists=True))
+@click.option("--target", default="target", show_default=True, help="Label column.")
+@click.option(
+    "--estimator",
+    type=click.Choice(ESTIMATORS),
+    default="sgd-classifier",
+    show_default=True,
+)
+@click.option("--epochs", default=5, show_default=True)
+@click.option("--batch-size", default=50_000, show_default=True)
+@click.option("--holdout", default=0.1, show_default=True, help="Share held out.")
+@click.option("--warm-start", is_flag=True, help="Continue from the served model.")
+@click.option("--sample", default=100_000, show_default=True, help="Reference rows.")
+@click.option("--seed", default=0, show_default=True)
+@click.option("--model", "model_path", default=str(Path(MODEL_PATH) / MODEL_NAME))
+@click.option("--reference", default=DRIFT_REFERENCE, show_default=True)
+@click.option("--no-promote", is_flag=True, help="Only write the versioned artifacts.")
+def main(
+    paths,
+    target,
+    estimator,
+    epochs,
+    batch_size,
+    holdout,
+    warm_start,
+    sample,
+    seed,
+    model_path,
+    reference,
+    no_promote,
+):
+    """Trains a model on PATHS and writes a new model version."""
+    if not 0 <= holdout < 1:
+        raise click.BadParameter("must be in [0, 1)", param_hint="--holdout")
+    model, metadata, rows = train(
+        paths,
+        target=target,
+        estimator=estimator,
+        epochs=epochs,
+        batch_size=batch_size,
+        holdout=holdout,
+        warm_start=warm_start,
+        sample=sample,
+        seed=seed,
+        model_path=model_path,
+    )
+    versions = Path(model_path).parent / "versions"
+    version = new_version(versions)
+    metadata = {
+        "version": version,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        **metadata,
+    }
+    if warm_start:
+        latest = versions / "LATEST"
+        metadata["parent"] = latest.read_text().strip() if latest.exists() else None
+    write_artifacts(model, metadata, rows, versions / version)
+    logger.info(f"Wrote model {version}: {metadata['metrics']}.")
+    if not no_promote:
+        promote(versions / version, Path(model_path), Path(reference))
+        logger.info(f"Serving {version} from {model_path}.")
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
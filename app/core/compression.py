@@ -0,0 +1,159 @@
+"""Response compression negotiated via Accept-Encoding (brotli, gzip)."""
+
+import gzip
+import hashlib
+from collections import OrderedDict
+
+import brotli
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript")
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def select_encoding(accept_encoding: str) -> str | None:
+    """Pick the preferred supported encoding, honouring `q=0` opt-outs."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        accepted[name.strip().lower()] = q
+    for encoding in ("br", "gzip"):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+
+class CompressedBodyCache:
+    """LRU of compressed bodies keyed by (content hash, encoding).
+
+    Identical response bodies (same content version) are compressed once and
+    then served from memory on subsequent requests.
+    """
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[str, str], bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_or_compress(self, body: bytes, encoding: str) -> bytes:
+        key = (hashlib.blake2b(body, digest_size=16).hexdigest(), encoding)
+        compressed = self._entries.get(key)
+        if compressed is not None:
+            self._entries.move_to_end(key)
+            return compressed
+        compressed = compress(body, encoding)
+        self._entries[key] = compressed
+        if len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return compressed
+
+
+class CompressionMiddleware:
+    """Compress complete (non-streaming) responses above `minimum_size`.
+
+    Responses to public GET requests are treated as cacheable, so their
+    compressed variants are kept in a `CompressedBodyCache`. Streaming
+    responses and admin/authenticated traffic are compressed per request or
+    passed through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 500,
+        cache_size: int = 256,
+        max_cached_body_size: int = 1024 * 1024,
+        private_prefixes: tuple[str, ...] = ("/api/v1/admin",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.max_cached_body_size = max_cached_body_size
+        self.private_prefixes = private_prefixes
+        self.cache = CompressedBodyCache(cache_size)
+
+    def _is_cacheable(self, scope: Scope, headers: Headers) -> bool:
+        return (
+            scope["method"] == "GET"
+            and "authorization" not in headers
+            and not scope["path"].startswith(self.private_prefixes)
+        )
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_headers = Headers(scope=scope)
+        encoding = select_encoding(request_headers.get("accept-encoding", ""))
+        cacheable = self._is_cacheable(scope, request_headers)
+        start_message: Message | None = None
+        passthrough = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal start_message, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not content_type.startswith(
+                    COMPRESSIBLE_TYPES
+                ):
+                    passthrough = True
+                    await send(message)
+                    return
+                # Whether this body is compressed depends on Accept-Encoding,
+                # so shared caches must key on it even when it is not
+                headers.add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    passthrough = True
+                    await send(message)
+                else:
+                    start_message = message
+                return
+
+            if passthrough or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            assert start_message is not None and encoding is not None
+            body = message.get("body", b"")
+            if message.get("more_body", False) or len(body) < self.minimum_size:
+                # Streaming or small responses are sent as-is
+                passthrough = True
+                await send(start_message)
+                await send(message)
+                return
+
+            if (
+                cacheable
+                and start_message["status"] == 200
+                and len(body) <= self.max_cached_body_size
+            ):
+                compressed = self.cache.get_or_compress(body, encoding)
+            else:
+                compressed = compress(body, encoding)
+
+            headers = MutableHeaders(raw=start_message["headers"])
+            headers["Content-Encoding"] = encoding
+            headers["Content-Length"] = str(len(compressed))
+            await send(start_message)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_wrapper)
@@ -15,10 +15,29 @@ MAX_CONNECTIONS_COUNT: int = config("MAX_CONNECTIONS_COUNT", cast=int, default=1
 MIN_CONNECTIONS_COUNT: int = config("MIN_CONNECTIONS_COUNT", cast=int, default=10)
 SECRET_KEY: Secret = config("SECRET_KEY", cast=Secret, default="")
 MEMOIZATION_FLAG: bool = config("MEMOIZATION_FLAG", cast=bool, default=True)
+# "thread" predicts in the shared thread pool, "process" in a worker pool
+INFERENCE_BACKEND: str = config("INFERENCE_BACKEND", default="thread")
+INFERENCE_WORKERS: int = config("INFERENCE_WORKERS", cast=int, default=2)
 DATABASE_URL: str = config("DATABASE_URL", default="sqlite:///./app.db")
 
 PROJECT_NAME: str = config("PROJECT_NAME", default="Portfolio-Back-End")
 
+# Prometheus metrics exposed on /metrics
+METRICS_FLAG: bool = config("METRICS_FLAG", cast=bool, default=True)
+
+# SQL profiler (debugging only: adds X-SQL-Profile header and an admin endpoint)
+SQL_PROFILER_FLAG: bool = config("SQL_PROFILER_FLAG", cast=bool, default=False)
+SQL_PROFILER_N_PLUS_ONE_THRESHOLD: int = config(
+    "SQL_PROFILER_N_PLUS_ONE_THRESHOLD", cast=int, default=3
+)
+SQL_PROFILER_HISTORY: int = config("SQL_PROFILER_HISTORY", cast=int, default=50)
+
+# Response compression
+COMPRESSION_MINIMUM_SIZE: int = config(
+    "COMPRESSION_MINIMUM_SIZE", cast=int, default=500
+)
+COMPRESSION_CACHE_SIZE: int = config("COMPRESSION_CACHE_SIZE", cast=int, default=256)
+
 # Auth configuration
 ADMIN_USERNAME: str = config("ADMIN_USERNAME", default="admin")
 ADMIN_PASSWORD_HASH: str = config("ADMIN_PASSWORD_HASH", default="")
@@ -35,7 +54,45 @@ logger.configure(handlers=[{"sink": sys.stderr, "level": LOGGING_LEVEL}])
 
 MODEL_PATH = config("MODEL_PATH", default="./ml/model/")
 MODEL_NAME = config("MODEL_NAME", default="model.pkl")
+# Recorded with every logged prediction
+MODEL_VERSION: str = config("MODEL_VERSION", default=MODEL_NAME)
 INPUT_EXAMPLE = config("INPUT_EXAMPLE", default="./ml/model/examples/example.json")
+# Serve supported sklearn models from a compiled NumPy kernel (<model>.npz)
+MODEL_COMPILE_FLAG: bool = config("MODEL_COMPILE_FLAG", cast=bool, default=True)
+# float64 or float32; float32 halves compiled model memory (`make precision-report`
+# compares the two)
+MODEL_PRECISION: str = config("MODEL_PRECISION", default="float64")
+if MODEL_PRECISION not in ("float64", "float32"):
+    # Fail at startup rather than on every prediction
+    raise ValueError(
+        f"MODEL_PRECISION must be float64 or float32, not {MODEL_PRECISION!r}"
+    )
+# Largest matrix /predict/batch scores in one request
+PREDICT_BATCH_MAX_ROWS: int = config(
+    "PREDICT_BATCH_MAX_ROWS", cast=int, default=100_000
+)
+
+# Streaming feature/prediction statistics with drift against the training set
+DRIFT_FLAG: bool = config("DRIFT_FLAG", cast=bool, default=True)
+DRIFT_FLUSH_SECONDS: int = config("DRIFT_FLUSH_SECONDS", cast=int, default=60)
+DRIFT_REFERENCE = config("DRIFT_REFERENCE", default="./ml/model/reference_stats.json")
+
+# Precomputed features for /predict/by-key, written by ml.features.build_features
+FEATURE_STORE_PATH = config(
+    "FEATURE_STORE_PATH", default="./data/processed/features.npy"
+)
+FEATURE_STORE_REFRESH_SECONDS: float = config(
+    "FEATURE_STORE_REFRESH_SECONDS", cast=float, default=30.0
+)
+
+# Raw request log partitions older than this are dropped by cli.request_logs
+REQUEST_LOG_RETENTION_DAYS: int = config(
+    "REQUEST_LOG_RETENTION_DAYS", cast=int, default=90
+)
+# Rows fetched and encoded per chunk by the request log export
+REQUEST_LOG_EXPORT_CHUNK_SIZE: int = config(
+    "REQUEST_LOG_EXPORT_CHUNK_SIZE", cast=int, default=10_000
+)
 
 # R2 Storage configuration
 R2_ACCOUNT_ID: str = config("R2_ACCOUNT_ID", default="")
@@ -43,3 +100,6 @@ R2_ACCESS_KEY_ID: str = config("R2_ACCESS_KEY_ID", default="")
 R2_SECRET_ACCESS_KEY: str = config("R2_SECRET_ACCESS_KEY", default="")
 R2_BUCKET_NAME: str = config("R2_BUCKET_NAME", default="yarikama-portfolio-backend")
 R2_PUBLIC_URL: str = config("R2_PUBLIC_URL", default="")
+R2_PRESIGN_EXPIRES_SECONDS: int = config(
+    "R2_PRESIGN_EXPIRES_SECONDS", cast=int, default=900
+)
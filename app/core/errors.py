@@ -2,3 +2,12 @@ class PredictException(BaseException): ...
 
 
 class ModelLoadException(BaseException): ...
+
+
+class ModelCompileException(BaseException): ...
+
+
+class FeatureStoreException(BaseException): ...
+
+
+class PayloadException(BaseException): ...
@@ -1,22 +1,129 @@
+from datetime import date
 from typing import Callable
 
-import joblib
-from core.config import MEMOIZATION_FLAG
+from core.config import (
+    DRIFT_FLAG,
+    DRIFT_REFERENCE,
+    FEATURE_STORE_PATH,
+    FEATURE_STORE_REFRESH_SECONDS,
+    INFERENCE_BACKEND,
+    INFERENCE_WORKERS,
+    MEMOIZATION_FLAG,
+    MODEL_VERSION,
+)
 from fastapi import FastAPI
+from loguru import logger
 
 
 def preload_model():
     """
     In order to load model on memory to each worker
     """
-    from services.predict import MachineLearningModelHandlerScore
+    from services.predict import MachineLearningModelHandlerScore, load_joblib
 
-    MachineLearningModelHandlerScore.get_model(joblib.load)
+    MachineLearningModelHandlerScore.get_model(load_joblib)
+
+
+def start_inference_pool():
+    """
+    In order to predict in worker processes, each holding its own model
+    """
+    from services.inference_pool import inference_pool
+
+    inference_pool.start(INFERENCE_WORKERS)
+
+
+def build_suggestion_index():
+    """
+    In order to serve autocomplete from memory without hitting the database
+    """
+    from db.session import SessionLocal
+    from services.suggest import suggestion_index
+
+    try:
+        with SessionLocal() as db:
+            suggestion_index.load(db)
+        logger.info(f"Suggestion index built with {len(suggestion_index)} entries")
+    except Exception:
+        logger.exception("failed to build suggestion index")
+
+
+def load_drift_reference():
+    """
+    In order to score drift against the training distribution
+    """
+    from services.drift import drift_monitor, load_reference
+
+    reference = load_reference(DRIFT_REFERENCE)
+    if reference is None:
+        logger.warning(f"No drift reference at {DRIFT_REFERENCE}, drift unscored")
+    drift_monitor.configure(reference)
+
+
+def flush_drift():
+    """
+    In order to keep statistics collected since the last flush
+    """
+    from db.session import SessionLocal
+    from services.drift import flush
+
+    try:
+        flush(SessionLocal, MODEL_VERSION)
+    except Exception:
+        logger.exception("failed to flush drift statistics")
+
+
+def load_feature_store():
+    """
+    In order to predict by entity key from precomputed features
+    """
+    from services.feature_store import feature_store
+
+    feature_store.configure(FEATURE_STORE_PATH, FEATURE_STORE_REFRESH_SECONDS)
+    if feature_store.table is None:
+        logger.info(f"No feature table at {FEATURE_STORE_PATH}")
+
+
+def create_request_log_partitions():
+    """
+    In order to have this and the coming months' request_logs partitions even
+    when nothing schedules `make request-logs`
+    """
+    from db import request_logs
+    from db.session import SessionLocal, engine
+
+    if engine.dialect.name != "postgresql":
+        return
+    try:
+        with SessionLocal() as db:
+            created = request_logs.create_partitions(db, date.today(), 3)
+        if created:
+            logger.info(f"Created request log partitions: {', '.join(created)}")
+    except Exception:
+        logger.exception("failed to create request log partitions")
 
 
 def create_start_app_handler(app: FastAPI) -> Callable:
     def start_app() -> None:
-        if MEMOIZATION_FLAG:
+        if INFERENCE_BACKEND == "process":
+            start_inference_pool()
+        elif MEMOIZATION_FLAG:
             preload_model()
+        if DRIFT_FLAG:
+            load_drift_reference()
+        load_feature_store()
+        create_request_log_partitions()
+        build_suggestion_index()
 
     return start_app
+
+
+def create_stop_app_handler(app: FastAPI) -> Callable:
+    def stop_app() -> None:
+        from services.inference_pool import inference_pool
+
+        inference_pool.shutdown()
+        if DRIFT_FLAG:
+            flush_drift()
+
+    return stop_app
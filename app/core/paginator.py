@@ -1,3 +1,8 @@
+import base64
+import json
+from typing import Optional
+
+
 def offset_pagination(offset: int, limit: int, total: int) -> dict:
     """Return offset-based pagination metadata.
 
@@ -17,6 +22,45 @@ def offset_pagination(offset: int, limit: int, total: int) -> dict:
     }
 
 
+def keyset_pagination(limit: int, next_cursor: Optional[str]) -> dict:
+    """Return keyset (cursor) pagination metadata.
+
+    Args:
+        limit: Maximum number of items to return
+        next_cursor: Opaque cursor for the next page, None on the last page
+
+    Returns:
+        dict with limit, nextCursor, hasMore
+    """
+    return {
+        "limit": limit,
+        "nextCursor": next_cursor,
+        "hasMore": next_cursor is not None,
+    }
+
+
+def encode_cursor(position: dict) -> str:
+    """Encode a keyset position as an opaque, URL-safe cursor string."""
+    raw = json.dumps(position, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> dict:
+    """Decode a cursor produced by encode_cursor.
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        position = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as err:
+        raise ValueError("Invalid cursor") from err
+    if not isinstance(position, dict):
+        raise ValueError("Invalid cursor")
+    return position
+
+
 def pagenation(
     page_number=1, page_size=20, total_count=0, data=None, start_page_as_1=True
 ):
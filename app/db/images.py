@@ -0,0 +1,33 @@
+"""Which uploaded image URLs are still used by site content.
+
+Uploads are content-addressed, so one object can back any number of projects
+and lab notes; `services.storage` keeps objects that are still referenced.
+"""
+
+import os
+
+from db.models.lab_notes import LabNote
+from db.models.projects import Project
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+
+def referenced_urls(db: Session, urls: list[str]) -> set[str]:
+    """The `urls` a project uses as cover image or that appear in a project
+    description or lab note body.
+    """
+    wanted = set(urls)
+    if not wanted:
+        return set()
+    used = set(
+        db.scalars(select(Project.cover_image).where(Project.cover_image.in_(wanted)))
+    )
+    # One scan for every URL: narrow to texts containing the shared prefix,
+    # then match each URL in Python
+    prefix = os.path.commonprefix(sorted(wanted))
+    for column in (Project.description, LabNote.content):
+        for body in db.scalars(
+            select(column).where(column.contains(prefix, autoescape=True))
+        ):
+            used.update(url for url in wanted if url in body)
+    return used
@@ -0,0 +1,20 @@
+from db.session import Base
+from sqlalchemy import BigInteger, Column, DateTime, Identity, String
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+
+
+class DriftSnapshot(Base):
+    """Streaming prediction statistics accumulated by one worker between
+    flushes; snapshots in a window merge into its totals.
+    """
+
+    __tablename__ = "drift_snapshots"
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False, index=True
+    )
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    model_version = Column(String(64), nullable=False)
+    stats = Column(JSONB, nullable=False)
@@ -1,8 +1,10 @@
 import uuid
 
+from db.search import tags_text, weighted_tsvector
 from db.session import Base
-from sqlalchemy import Boolean, Column, Date, DateTime, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
+from sqlalchemy import Boolean, Column, Computed, Date, DateTime, Index, String, Text
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSVECTOR, UUID
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 
 
@@ -14,9 +16,32 @@ class LabNote(Base):
     title = Column(String(255), nullable=False)
     excerpt = Column(Text, nullable=False)
     content = Column(Text, nullable=False)
+    # Rendered from `content` on write, see services.render
+    content_html = Column(Text, nullable=True)
+    toc = Column(JSONB, nullable=True)
     tags = Column(ARRAY(String), nullable=False)
     read_time = Column(String(50), nullable=False)
     date = Column(Date, nullable=False)
     published = Column(Boolean, default=False)
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+
+    # Generated by Postgres; deferred so list/detail queries don't load it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                weighted_tsvector(
+                    ("title", "A"),
+                    (tags_text(), "B"),
+                    ("excerpt", "C"),
+                    ("content", "D"),
+                ),
+                persisted=True,
+            ),
+        )
+    )
+
+    __table_args__ = (
+        Index("ix_lab_notes_search_vector", search_vector, postgresql_using="gin"),
+    )
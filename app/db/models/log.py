@@ -1,10 +1,71 @@
 from db.session import Base
-from sqlalchemy import Column, Integer, Text
+from sqlalchemy import (
+    DDL,
+    BigInteger,
+    Column,
+    DateTime,
+    Float,
+    Identity,
+    Index,
+    Integer,
+    String,
+    event,
+)
+from sqlalchemy.sql import func
 
 
 class RequestLog(Base):
+    """One prediction, partitioned by month on created_at.
+
+    Monthly partitions are created ahead of time and dropped for retention by
+    `cli.request_logs`; rows outside every partition land in
+    request_logs_default.
+    """
+
     __tablename__ = "request_logs"
+    __table_args__ = (
+        Index("ix_request_logs_created_at", "created_at", postgresql_using="brin"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
+
+    id = Column(BigInteger, Identity(), primary_key=True)
+    # Part of the primary key: unique constraints must include the partition key
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now(),
+    )
+    model_version = Column(String(64), nullable=False, server_default="")
+    latency_ms = Column(Float, nullable=False)
+    feature1 = Column(Float, nullable=False)
+    feature2 = Column(Float, nullable=False)
+    feature3 = Column(Float, nullable=False)
+    feature4 = Column(Float, nullable=False)
+    feature5 = Column(Float, nullable=False)
+    prediction = Column(Float, nullable=False)
+    prediction_label = Column(String(32), nullable=False)
+
+
+event.listen(
+    RequestLog.__table__,
+    "after_create",
+    DDL(
+        "CREATE TABLE IF NOT EXISTS request_logs_default "
+        "PARTITION OF request_logs DEFAULT"
+    ).execute_if(dialect="postgresql"),
+)
+
+
+class RequestLogHourly(Base):
+    """Per-hour prediction aggregates, kept after raw partitions are dropped."""
+
+    __tablename__ = "request_log_hourly"
 
-    id = Column(Integer, primary_key=True, index=True)
-    request = Column(Text, nullable=False)
-    response = Column(Text, nullable=False)
+    hour = Column(DateTime(timezone=True), primary_key=True)
+    model_version = Column(String(64), primary_key=True)
+    prediction_label = Column(String(32), primary_key=True)
+    requests = Column(Integer, nullable=False)
+    mean_latency_ms = Column(Float, nullable=False)
+    p95_latency_ms = Column(Float, nullable=False)
+    max_latency_ms = Column(Float, nullable=False)
+    mean_prediction = Column(Float, nullable=False)
@@ -1,9 +1,20 @@
 import uuid
 
+from db.search import tags_text, weighted_tsvector
 from db.session import Base
-from sqlalchemy import Boolean, Column, DateTime, ForeignKey, Integer, String, Text
-from sqlalchemy.dialects.postgresql import ARRAY, UUID
-from sqlalchemy.orm import relationship
+from sqlalchemy import (
+    Boolean,
+    Column,
+    Computed,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR, UUID
+from sqlalchemy.orm import deferred, relationship
 from sqlalchemy.sql import func
 
 
@@ -37,5 +48,24 @@ class Project(Base):
     created_at = Column(DateTime, default=func.now())
     updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
 
+    # Generated by Postgres; deferred so list/detail queries don't load it
+    search_vector = deferred(
+        Column(
+            TSVECTOR,
+            Computed(
+                weighted_tsvector(
+                    ("title", "A"),
+                    (tags_text(), "B"),
+                    ("description", "C"),
+                ),
+                persisted=True,
+            ),
+        )
+    )
+
     # Relationship
     category_rel = relationship("Category", back_populates="projects")
+
+    __table_args__ = (
+        Index("ix_projects_search_vector", search_vector, postgresql_using="gin"),
+    )
@@ -0,0 +1,155 @@
+"""Per-request SQL profiling with probable N+1 detection.
+
+Listeners are only attached when the profiler is enabled, so a disabled
+profiler adds no per-statement work at all.
+"""
+
+import re
+import time
+from collections import Counter, deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from core.config import SQL_PROFILER_HISTORY
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+_PARAM = re.compile(r"%\(\w+\)s|\$\d+|\?|:\w+")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\?(?:, )?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_sql(statement: str) -> str:
+    """Reduce a statement to its shape by replacing literals and parameters."""
+    shape = _STRING.sub("?", statement)
+    shape = _PARAM.sub("?", shape)
+    shape = _NUMBER.sub("?", shape)
+    shape = _WHITESPACE.sub(" ", shape).strip()
+    return _IN_LIST.sub("IN (...)", shape)
+
+
+class QueryProfile:
+    """Statements executed during one unit of work (usually a request)."""
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self.statements: list[dict] = []
+
+    def record(self, statement: str, duration: float, rows: int) -> None:
+        self.statements.append(
+            {
+                "sql": normalize_sql(statement),
+                "duration_ms": round(duration * 1000, 3),
+                "rows": rows,
+            }
+        )
+
+    @property
+    def query_count(self) -> int:
+        return len(self.statements)
+
+    @property
+    def total_ms(self) -> float:
+        return round(sum(s["duration_ms"] for s in self.statements), 3)
+
+    def n_plus_one(self, threshold: int) -> list[dict]:
+        """Statement shapes repeated at least `threshold` times."""
+        counts = Counter(s["sql"] for s in self.statements)
+        return [
+            {
+                "sql": sql,
+                "count": count,
+                "total_ms": round(
+                    sum(s["duration_ms"] for s in self.statements if s["sql"] == sql),
+                    3,
+                ),
+            }
+            for sql, count in counts.most_common()
+            if count >= threshold
+        ]
+
+    def summary(self, threshold: int) -> dict:
+        return {
+            "label": self.label,
+            "query_count": self.query_count,
+            "total_ms": self.total_ms,
+            "n_plus_one": self.n_plus_one(threshold),
+            "statements": self.statements,
+        }
+
+
+# Summaries of the most recent profiled requests, served by the admin endpoint
+recent_profiles: deque = deque(maxlen=SQL_PROFILER_HISTORY)
+
+_current_profile: ContextVar[Optional[QueryProfile]] = ContextVar(
+    "current_query_profile", default=None
+)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_profile.get() is not None:
+        conn.info.setdefault("profiler_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is None:
+        return
+    elapsed = time.perf_counter() - conn.info["profiler_start_time"].pop()
+    profile.record(statement, elapsed, cursor.rowcount)
+
+
+def attach_profiler(engine: Engine) -> None:
+    """Attach the profiling listeners to an engine (idempotent)."""
+    if not event.contains(engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+
+@contextmanager
+def profile_queries(label: str = ""):
+    """Record every statement executed inside the block into a QueryProfile."""
+    profile = QueryProfile(label)
+    token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(token)
+
+
+class SQLProfilerMiddleware:
+    """Profile each request into `recent_profiles` and add an X-SQL-Profile header.
+
+    The header reflects statements executed before the response started, which
+    covers everything except streaming bodies.
+    """
+
+    def __init__(self, app: ASGIApp, n_plus_one_threshold: int = 3):
+        self.app = app
+        self.n_plus_one_threshold = n_plus_one_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                n_plus_one = profile.n_plus_one(self.n_plus_one_threshold)
+                headers = MutableHeaders(scope=message)
+                headers["X-SQL-Profile"] = (
+                    f"queries={profile.query_count}; time_ms={profile.total_ms}; "
+                    f"n_plus_one={len(n_plus_one)}"
+                )
+            await send(message)
+
+        with profile_queries(f"{scope['method']} {scope['path']}") as profile:
+            try:
+                await self.app(scope, receive, send_wrapper)
+            finally:
+                recent_profiles.append(profile.summary(self.n_plus_one_threshold))
@@ -0,0 +1,186 @@
+"""Partition maintenance and hourly rollups for request_logs.
+
+request_logs is range-partitioned by month on created_at. Retention drops
+whole partitions, which is a catalog operation instead of a DELETE that
+rewrites and vacuums millions of rows. Analytics read request_log_hourly,
+which `rollup` fills from complete hours of raw rows.
+"""
+
+import re
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+TABLE = "request_logs"
+DEFAULT_PARTITION = f"{TABLE}_default"
+PARTITION_NAME = re.compile(rf"{TABLE}_p(?P<year>\d{{4}})(?P<month>\d{{2}})")
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def next_month(day: date) -> date:
+    return (day.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def partition_name(month: date) -> str:
+    return f"{TABLE}_p{month:%Y%m}"
+
+
+def list_partitions(db: Session) -> list[dict]:
+    """Monthly partitions as {name, start, end}, oldest first.
+
+    Bounds come from the partition name, which `create_partitions` derives
+    from the month it covers.
+    """
+    names = db.scalars(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+            """
+        ),
+        {"table": TABLE},
+    ).all()
+    partitions = []
+    for name in names:
+        match = PARTITION_NAME.fullmatch(name)
+        if match:
+            start = date(int(match["year"]), int(match["month"]), 1)
+            partitions.append({"name": name, "start": start, "end": next_month(start)})
+    return sorted(partitions, key=lambda p: p["start"])
+
+
+def create_partitions(db: Session, start: date, months: int) -> list[str]:
+    """Create monthly partitions from `start`'s month for `months` months.
+
+    Existing partitions are left alone. A month whose rows already went to
+    the default partition (nobody created its partition in time) is
+    recovered in the same transaction: the default partition is detached,
+    the month created, its rows moved over and the default reattached.
+    Concurrent callers, such as instances starting together, are serialized
+    by an advisory lock.
+    """
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:table))"), {"table": TABLE})
+    existing = {p["name"] for p in list_partitions(db)}
+    created = []
+    month = month_start(start)
+    for _ in range(months):
+        name = partition_name(month)
+        if name not in existing:
+            _create_partition(db, name, month, next_month(month))
+            created.append(name)
+        month = next_month(month)
+    db.commit()
+    return created
+
+
+def _create_partition(db: Session, name: str, start: date, end: date) -> None:
+    bounds = {"start": f"{start} 00:00+00", "end": f"{end} 00:00+00"}
+    create = (
+        f"CREATE TABLE {name} PARTITION OF {TABLE} "
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    )
+    stranded = db.scalar(
+        text(
+            f"SELECT EXISTS (SELECT 1 FROM {DEFAULT_PARTITION} "
+            "WHERE created_at >= :start AND created_at < :end)"
+        ),
+        bounds,
+    )
+    if not stranded:
+        db.execute(text(create))
+        return
+    # PostgreSQL refuses to create a partition for rows the default holds
+    db.execute(text(f"ALTER TABLE {TABLE} DETACH PARTITION {DEFAULT_PARTITION}"))
+    db.execute(text(create))
+    db.execute(
+        text(
+            f"""
+            WITH moved AS (
+                DELETE FROM {DEFAULT_PARTITION}
+                WHERE created_at >= :start AND created_at < :end
+                RETURNING *
+            )
+            INSERT INTO {TABLE} SELECT * FROM moved
+            """
+        ),
+        bounds,
+    )
+    db.execute(
+        text(f"ALTER TABLE {TABLE} ATTACH PARTITION {DEFAULT_PARTITION} DEFAULT")
+    )
+
+
+def drop_partitions(db: Session, older_than: date) -> list[str]:
+    """Drop partitions whose whole month is before `older_than`."""
+    dropped = []
+    for partition in list_partitions(db):
+        if partition["end"] <= older_than:
+            db.execute(text(f"DROP TABLE {partition['name']}"))
+            dropped.append(partition["name"])
+    db.commit()
+    return dropped
+
+
+def purge_default(db: Session, older_than: date) -> int:
+    """Delete rows created before `older_than` from the default partition.
+
+    Rows land there when no monthly partition covers them, and dropping
+    partitions never reaches them; this is a plain DELETE, but of strays only.
+    """
+    deleted = db.execute(
+        text(f"DELETE FROM {DEFAULT_PARTITION} WHERE created_at < :cutoff"),
+        {"cutoff": older_than},
+    ).rowcount
+    db.commit()
+    return deleted
+
+
+def rollup(db: Session, since: datetime, until: datetime) -> int:
+    """Recompute hourly aggregates for hours in [since, until).
+
+    Idempotent: hours already rolled up are overwritten, so re-running over a
+    window that includes late rows corrects it. Returns the rows written.
+    """
+    result = db.execute(
+        text(
+            """
+            INSERT INTO request_log_hourly (
+                hour, model_version, prediction_label, requests,
+                mean_latency_ms, p95_latency_ms, max_latency_ms, mean_prediction
+            )
+            SELECT date_trunc('hour', created_at),
+                   model_version,
+                   prediction_label,
+                   count(*),
+                   avg(latency_ms),
+                   percentile_cont(0.95) WITHIN GROUP (ORDER BY latency_ms),
+                   max(latency_ms),
+                   avg(prediction)
+            FROM request_logs
+            WHERE created_at >= :since AND created_at < :until
+            GROUP BY 1, 2, 3
+            ON CONFLICT (hour, model_version, prediction_label) DO UPDATE SET
+                requests = EXCLUDED.requests,
+                mean_latency_ms = EXCLUDED.mean_latency_ms,
+                p95_latency_ms = EXCLUDED.p95_latency_ms,
+                max_latency_ms = EXCLUDED.max_latency_ms,
+                mean_prediction = EXCLUDED.mean_prediction
+            """
+        ),
+        {"since": since, "until": until},
+    )
+    db.commit()
+    return result.rowcount
+
+
+def last_complete_hour(now: Optional[datetime] = None) -> datetime:
+    now = now or datetime.now(timezone.utc)
+    return now.replace(minute=0, second=0, microsecond=0)
@@ -0,0 +1,33 @@
+"""Full-text search helpers shared by searchable models."""
+
+from db.session import Base
+from sqlalchemy import DDL, event
+
+SEARCH_CONFIG = "english"
+
+# array_to_string() is only STABLE, so generated columns cannot call it
+# directly. This wrapper is safe to mark IMMUTABLE for text arrays.
+CREATE_IMMUTABLE_ARRAY_TO_STRING = DDL(
+    "CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text) "
+    "RETURNS text LANGUAGE sql IMMUTABLE PARALLEL SAFE "
+    "AS $$SELECT array_to_string($1, $2)$$"
+)
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    CREATE_IMMUTABLE_ARRAY_TO_STRING.execute_if(dialect="postgresql"),
+)
+
+
+def weighted_tsvector(*columns: tuple[str, str]) -> str:
+    """Build a generated-column expression from (column SQL, weight) pairs."""
+    return " || ".join(
+        f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce({column}, '')), '{weight}')"
+        for column, weight in columns
+    )
+
+
+def tags_text(column: str = "tags") -> str:
+    """SQL expression flattening a tag array into searchable text."""
+    return f"immutable_array_to_string({column}::text[], ' ')"
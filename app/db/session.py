@@ -1,7 +1,14 @@
-from core.config import DATABASE_URL
+from core.config import DATABASE_URL, METRICS_FLAG, SQL_PROFILER_FLAG
+from core.metrics import instrument_engine
+from db.profiler import attach_profiler
 from sqlalchemy import create_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 engine = create_engine(DATABASE_URL)
+# Query timing feeds /metrics, which main.py only serves with METRICS_FLAG
+if METRICS_FLAG:
+    instrument_engine(engine)
+if SQL_PROFILER_FLAG:
+    attach_profiler(engine)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
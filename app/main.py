@@ -1,6 +1,19 @@
 from api.routes.api import router as api_router
-from core.config import API_PREFIX, DEBUG, PROJECT_NAME, VERSION
-from core.events import create_start_app_handler
+from core.compression import CompressionMiddleware
+from core.config import (
+    API_PREFIX,
+    COMPRESSION_CACHE_SIZE,
+    COMPRESSION_MINIMUM_SIZE,
+    DEBUG,
+    METRICS_FLAG,
+    PROJECT_NAME,
+    SQL_PROFILER_FLAG,
+    SQL_PROFILER_N_PLUS_ONE_THRESHOLD,
+    VERSION,
+)
+from core.events import create_start_app_handler, create_stop_app_handler
+from core.metrics import MetricsMiddleware, metrics
+from db.profiler import SQLProfilerMiddleware
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
@@ -26,8 +39,27 @@ def get_application() -> FastAPI:
         allow_headers=["*"],
     )
 
+    # gzip/brotli, with compressed public responses cached per content version
+    application.add_middleware(
+        CompressionMiddleware,
+        minimum_size=COMPRESSION_MINIMUM_SIZE,
+        cache_size=COMPRESSION_CACHE_SIZE,
+        private_prefixes=(f"{API_PREFIX}/v1/admin",),
+    )
+
+    if METRICS_FLAG:
+        application.add_middleware(MetricsMiddleware)
+        application.add_route("/metrics", metrics, include_in_schema=False)
+
+    if SQL_PROFILER_FLAG:
+        application.add_middleware(
+            SQLProfilerMiddleware,
+            n_plus_one_threshold=SQL_PROFILER_N_PLUS_ONE_THRESHOLD,
+        )
+
     application.include_router(api_router, prefix=API_PREFIX)
     application.add_event_handler("startup", create_start_app_handler(application))
+    application.add_event_handler("shutdown", create_stop_app_handler(application))
     return application
 
 
@@ -5,6 +5,12 @@ from uuid import UUID
 from schemas.base import BaseSchema
 
 
+class TocEntry(BaseSchema):
+    level: int
+    id: str
+    title: str
+
+
 class LabNoteBase(BaseSchema):
     title: str
     slug: str
@@ -17,7 +23,8 @@ class LabNoteBase(BaseSchema):
 
 
 class LabNoteCreate(LabNoteBase):
-    pass
+    # Derived from the content's word count when omitted
+    read_time: Optional[str] = None
 
 
 class LabNoteUpdate(BaseSchema):
@@ -33,6 +40,8 @@ class LabNoteUpdate(BaseSchema):
 
 class LabNoteResponse(LabNoteBase):
     id: UUID
+    content_html: Optional[str] = None
+    toc: Optional[list[TocEntry]] = None
     created_at: datetime.datetime
     updated_at: datetime.datetime
 
@@ -48,3 +57,10 @@ class LabNoteListResponse(BaseSchema):
     published: bool
     created_at: datetime.datetime
     updated_at: datetime.datetime
+
+
+class LabNoteDetailResponse(LabNoteListResponse):
+    """Public detail: pre-rendered HTML instead of the markdown source."""
+
+    content_html: str
+    toc: list[TocEntry]
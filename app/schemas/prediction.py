@@ -1,5 +1,9 @@
-import numpy as np
-from pydantic import BaseModel
+from typing import Union
+
+from pydantic import BaseModel, Field
+
+# Entity keys are matched as strings; integer ids may be sent as numbers
+EntityKey = Union[int, str]
 
 
 class MachineLearningResponse(BaseModel):
@@ -7,6 +11,15 @@ class MachineLearningResponse(BaseModel):
     prediction_label: str
 
 
+class KeyedPrediction(MachineLearningResponse):
+    key: str
+
+
+class MachineLearningBatchResponse(BaseModel):
+    predictions: list[KeyedPrediction]
+    missing: list[str]
+
+
 class HealthResponse(BaseModel):
     status: bool
 
@@ -18,7 +31,10 @@ class MachineLearningDataInput(BaseModel):
     feature4: float
     feature5: float
 
-    def get_np_array(self):
+    def get_np_array(self, dtype="float64"):
+        """The features as a (1, 5) array of `dtype`."""
+        import numpy as np
+
         return np.array(
             [
                 [
@@ -28,5 +44,14 @@ class MachineLearningDataInput(BaseModel):
                     self.feature4,
                     self.feature5,
                 ]
-            ]
+            ],
+            dtype=dtype,
         )
+
+
+class EntityKeyInput(BaseModel):
+    key: EntityKey
+
+
+class EntityKeysInput(BaseModel):
+    keys: list[EntityKey] = Field(..., min_length=1, max_length=1000)
@@ -0,0 +1,21 @@
+from typing import Literal, Optional
+from uuid import UUID
+
+from schemas.base import BaseSchema
+
+SearchResultType = Literal["project", "lab_note"]
+
+
+class SearchResult(BaseSchema):
+    type: SearchResultType
+    id: UUID
+    slug: str
+    title: str
+    snippet: str
+    rank: float
+
+
+class Suggestion(BaseSchema):
+    type: Literal["project", "lab_note", "tag"]
+    title: str
+    slug: Optional[str] = None
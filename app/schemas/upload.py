@@ -1,5 +1,6 @@
 from typing import Optional
 
+from pydantic import Field
 from schemas.base import BaseSchema
 
 
@@ -14,3 +15,47 @@ class UploadResponse(BaseSchema):
 
 class DeleteResponse(BaseSchema):
     message: str
+
+
+class PresignUploadRequest(BaseSchema):
+    filename: Optional[str] = None
+    content_type: str
+    folder: str = "images"
+
+
+class PresignUploadData(BaseSchema):
+    upload_url: str
+    url: str
+    key: str
+    expires_in: int
+    headers: dict[str, str]
+
+
+class PresignUploadResponse(BaseSchema):
+    data: PresignUploadData
+
+
+class UploadCompleteRequest(BaseSchema):
+    key: str
+    filename: Optional[str] = None
+
+
+class BatchDeleteRequest(BaseSchema):
+    urls: list[str] = Field(..., min_length=1)
+
+
+class BatchDeleteItem(BaseSchema):
+    url: str
+    key: str
+    deleted: bool
+    error: Optional[str] = None
+
+
+class BatchDeleteData(BaseSchema):
+    deleted: int
+    failed: int
+    results: list[BatchDeleteItem]
+
+
+class BatchDeleteResponse(BaseSchema):
+    data: BatchDeleteData
@@ -0,0 +1,190 @@
+"""Batch prediction payloads: JSON, NumPy .npy and Arrow IPC.
+
+`decode` turns a request body into the (n, 5) float matrix the model scores,
+chosen by Content-Type, and `encode` writes the predictions back in the same
+format. The binary formats are read without a per-row pass:
+
+- .npy: the header is parsed and the array is a view of the body bytes
+  (`np.frombuffer`), whatever its size
+- Arrow: a single `fixed_size_list<float, 5>` column is viewed the same way;
+  FEATURES columns are stacked into the matrix in one copy
+
+Shape, dtype and finiteness are checked on the whole matrix at once.
+"""
+
+import io
+import json
+
+from core.errors import PayloadException
+
+FEATURES = ("feature1", "feature2", "feature3", "feature4", "feature5")
+
+JSON = "application/json"
+NPY = "application/x-npy"
+ARROW_STREAM = "application/vnd.apache.arrow.stream"
+ARROW_FILE = "application/vnd.apache.arrow.file"
+MEDIA_TYPES = (JSON, NPY, ARROW_STREAM, ARROW_FILE)
+
+
+def media_type(content_type: str) -> str:
+    """`content_type` without parameters such as charset."""
+    return content_type.split(";")[0].strip().lower()
+
+
+def _check(matrix):
+    import numpy as np
+
+    if matrix.ndim != 2 or matrix.shape[1] != len(FEATURES):
+        raise PayloadException(
+            f"expected an (n, {len(FEATURES)}) matrix, got shape {matrix.shape}"
+        )
+    if not len(matrix):
+        raise PayloadException("no rows")
+    if not np.isfinite(matrix).all():
+        raise PayloadException("features must be finite numbers")
+    return matrix
+
+
+def _float_dtype(dtype) -> bool:
+    return dtype.kind == "f" and dtype.itemsize in (4, 8)
+
+
+def _arrow_float(data_type) -> bool:
+    import pyarrow as pa
+
+    return pa.types.is_float32(data_type) or pa.types.is_float64(data_type)
+
+
+def _decode_json(body: bytes):
+    import numpy as np
+
+    try:
+        rows = json.loads(body)["features"]
+        matrix = np.array(rows, dtype=np.float64)
+    except (ValueError, TypeError, KeyError) as err:
+        raise PayloadException(
+            f'expected {{"features": [[{", ".join(FEATURES)}], ...]}}: {err}'
+        ) from None
+    return matrix
+
+
+def _decode_npy(body: bytes):
+    import numpy as np
+
+    readers = {
+        (1, 0): np.lib.format.read_array_header_1_0,
+        (2, 0): np.lib.format.read_array_header_2_0,
+    }
+    stream = io.BytesIO(body)
+    try:
+        version = np.lib.format.read_magic(stream)
+        if version not in readers:
+            raise ValueError(f"unsupported .npy version {version}")
+        shape, fortran_order, dtype = readers[version](stream)
+    except ValueError as err:
+        raise PayloadException(f"invalid .npy payload: {err}") from None
+    if not _float_dtype(dtype):
+        raise PayloadException(f"expected float32 or float64, got {dtype}")
+    if len(shape) != 2:
+        raise PayloadException(f"expected a 2-D array, got shape {shape}")
+
+    count = shape[0] * shape[1]
+    try:
+        flat = np.frombuffer(body, dtype=dtype, count=count, offset=stream.tell())
+    except ValueError:
+        raise PayloadException("truncated .npy payload") from None
+    return flat.reshape(shape, order="F" if fortran_order else "C")
+
+
+def _decode_arrow(body: bytes, file: bool):
+    import numpy as np
+    import pyarrow as pa
+
+    try:
+        reader = pa.ipc.open_file(body) if file else pa.ipc.open_stream(body)
+        table = reader.read_all()
+    except (pa.ArrowException, OSError) as err:
+        raise PayloadException(f"invalid Arrow payload: {err}") from None
+
+    schema = table.schema
+    if len(schema) == 1 and pa.types.is_fixed_size_list(schema[0].type):
+        column = table.column(0).combine_chunks()
+        if column.type.list_size != len(FEATURES):
+            raise PayloadException(
+                f"expected lists of {len(FEATURES)} features, "
+                f"got {column.type.list_size}"
+            )
+        values = column.flatten()
+        if column.null_count or values.null_count:
+            raise PayloadException("features must not be null")
+        if not _arrow_float(values.type):
+            raise PayloadException(f"expected float32 or float64, got {values.type}")
+        return values.to_numpy(zero_copy_only=True).reshape(-1, len(FEATURES))
+
+    missing = [name for name in FEATURES if name not in schema.names]
+    if missing:
+        raise PayloadException(
+            f"expected a fixed_size_list column or columns {', '.join(FEATURES)}; "
+            f"missing {', '.join(missing)}"
+        )
+    columns = [table.column(name) for name in FEATURES]
+    for name, column in zip(FEATURES, columns):
+        if not _arrow_float(column.type):
+            raise PayloadException(
+                f"expected float32 or float64 for {name}, got {column.type}"
+            )
+        if column.null_count:
+            raise PayloadException(f"{name} must not be null")
+    return np.column_stack([column.to_numpy() for column in columns])
+
+
+def decode(content_type: str, body: bytes):
+    """The (n, 5) feature matrix of a request body in `content_type`.
+
+    Raises PayloadException when the body is malformed or not an (n, 5) matrix
+    of finite float32/float64 values.
+    """
+    kind = media_type(content_type)
+    if kind == JSON:
+        matrix = _decode_json(body)
+    elif kind == NPY:
+        matrix = _decode_npy(body)
+    elif kind in (ARROW_STREAM, ARROW_FILE):
+        matrix = _decode_arrow(body, file=kind == ARROW_FILE)
+    else:
+        raise PayloadException(f"unsupported media type {kind}")
+    return _check(matrix)
+
+
+def encode(content_type: str, predictions, labels) -> bytes:
+    """Predictions and their labels in the format of `content_type`.
+
+    .npy carries the predictions only, as a float64 vector.
+    """
+    import numpy as np
+
+    predictions = np.asarray(predictions, dtype=np.float64)
+    kind = media_type(content_type)
+    if kind == JSON:
+        return json.dumps(
+            {"predictions": predictions.tolist(), "prediction_labels": list(labels)}
+        ).encode()
+    if kind == NPY:
+        buffer = io.BytesIO()
+        np.lib.format.write_array(buffer, predictions, allow_pickle=False)
+        return buffer.getvalue()
+    if kind in (ARROW_STREAM, ARROW_FILE):
+        import pyarrow as pa
+
+        table = pa.table(
+            {
+                "prediction": pa.array(predictions),
+                "prediction_label": pa.array(labels, type=pa.string()),
+            }
+        )
+        sink = pa.BufferOutputStream()
+        new_writer = pa.ipc.new_file if kind == ARROW_FILE else pa.ipc.new_stream
+        with new_writer(sink, table.schema) as writer:
+            writer.write_table(table)
+        return sink.getvalue().to_pybytes()
+    raise PayloadException(f"unsupported media type {kind}")
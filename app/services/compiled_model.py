@@ -0,0 +1,477 @@
+"""Compile fitted scikit-learn estimators into array-based NumPy kernels.
+
+sklearn's `predict` validates its input and dispatches through several layers
+on every call, which dominates the cost of single-row predictions. A compiled
+model keeps only the fitted arrays and evaluates them with vectorized NumPy:
+
+- scalers (Standard, MinMax, MaxAbs, Robust) as affine transforms
+- linear regressors and classifiers as a matrix product
+- decision trees, random forests, extra trees and gradient boosting as padded
+  node arrays traversed for all trees and rows at once
+
+Pipelines made of supported scalers followed by a supported estimator compile
+too. Inputs are checked like sklearn checks them: infinity always raises
+ValueError, and NaN does unless the estimator accepts it (trees route it to a
+child). Anything else raises ModelCompileException and callers keep the original
+estimator. Compiled models are saved as `.npz`, which loads with NumPy alone.
+
+`astype(np.float32)` gives a reduced-precision copy that keeps its parameters
+(and tree node indices, as int32) and casts its inputs to float32, halving
+model memory and the bandwidth of batch scoring. Tree thresholds are rounded
+down to float32, which keeps every split decision on float32 inputs
+identical; other parameters round to nearest.
+"""
+
+import hashlib
+from typing import Optional
+
+import numpy as np
+from core.errors import ModelCompileException
+
+COMPILED_SUFFIX = ".npz"
+# Parameters cast by `CompiledModel.astype`; classes keep their labels
+_FLOAT_PARAMETERS = ("coef", "intercept", "value", "base")
+# Node indices, narrowed along with reduced precision
+_INDEX_PARAMETERS = ("feature", "left", "right")
+
+
+# ============================================================================
+# Compilation
+# ============================================================================
+
+
+def source_hash(path: str) -> str:
+    """Digest of a model file, stored in kernels compiled from it."""
+    digest = hashlib.blake2b(digest_size=16)
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _compile_scaler(step) -> tuple[str, np.ndarray, np.ndarray]:
+    """Return (op, a, b): `center` is (x - a) / b, `affine` is x * a + b."""
+    from sklearn.preprocessing import (
+        MaxAbsScaler,
+        MinMaxScaler,
+        RobustScaler,
+        StandardScaler,
+    )
+
+    n_features = step.n_features_in_
+    zeros, ones = np.zeros(n_features), np.ones(n_features)
+    if isinstance(step, StandardScaler):
+        mean = step.mean_ if step.mean_ is not None and step.with_mean else zeros
+        scale = step.scale_ if step.scale_ is not None else ones
+        return "center", np.asarray(mean, float), np.asarray(scale, float)
+    if isinstance(step, RobustScaler):
+        center = step.center_ if step.center_ is not None else zeros
+        scale = step.scale_ if step.scale_ is not None else ones
+        return "center", np.asarray(center, float), np.asarray(scale, float)
+    if isinstance(step, MaxAbsScaler):
+        return "center", zeros, np.asarray(step.scale_, float)
+    if isinstance(step, MinMaxScaler) and not step.clip:
+        return "affine", np.asarray(step.scale_, float), np.asarray(step.min_, float)
+    raise ModelCompileException(f"unsupported transformer {type(step).__name__}")
+
+
+def _compile_linear(estimator) -> dict:
+    from sklearn.linear_model import (
+        BayesianRidge,
+        ElasticNet,
+        ElasticNetCV,
+        HuberRegressor,
+        Lasso,
+        LassoCV,
+        LinearRegression,
+        LogisticRegression,
+        LogisticRegressionCV,
+        Perceptron,
+        Ridge,
+        RidgeClassifier,
+        RidgeClassifierCV,
+        RidgeCV,
+        SGDClassifier,
+        SGDRegressor,
+    )
+    from sklearn.svm import LinearSVC, LinearSVR
+
+    regressors = (
+        BayesianRidge,
+        ElasticNet,
+        ElasticNetCV,
+        HuberRegressor,
+        Lasso,
+        LassoCV,
+        LinearRegression,
+        LinearSVR,
+        Ridge,
+        RidgeCV,
+        SGDRegressor,
+    )
+    classifiers = (
+        LinearSVC,
+        LogisticRegression,
+        LogisticRegressionCV,
+        Perceptron,
+        RidgeClassifier,
+        RidgeClassifierCV,
+        SGDClassifier,
+    )
+    if not isinstance(estimator, regressors + classifiers):
+        raise ModelCompileException(f"unsupported model {type(estimator).__name__}")
+
+    coef = np.asarray(estimator.coef_, float)
+    single_output = coef.ndim == 1
+    coef = np.atleast_2d(coef)
+    intercept = np.broadcast_to(
+        np.asarray(estimator.intercept_, float), coef.shape[:1]
+    ).copy()
+    arrays = {"kind": "linear", "coef": coef, "intercept": intercept}
+    if isinstance(estimator, classifiers):
+        arrays.update(task="classification", classes=_classes(estimator))
+    else:
+        arrays.update(task="regression", single_output=single_output)
+    return arrays
+
+
+def _classes(estimator) -> np.ndarray:
+    classes = np.asarray(estimator.classes_)
+    if classes.ndim != 1 or classes.dtype == object:
+        raise ModelCompileException("only single-output numeric/str labels compile")
+    return classes
+
+
+def _pack_trees(trees: list) -> dict:
+    """Pad every tree's node arrays to the same length so they stack."""
+    n_nodes = max(t.node_count for t in trees)
+    n_values = trees[0].value.shape[-1]
+    shape = (len(trees), n_nodes)
+    feature = np.zeros(shape, np.intp)
+    threshold = np.zeros(shape, float)
+    left = np.full(shape, -1, np.intp)
+    right = np.full(shape, -1, np.intp)
+    missing_left = np.zeros(shape, bool)
+    value = np.zeros((*shape, n_values), float)
+    for i, tree in enumerate(trees):
+        if tree.n_outputs != 1:
+            raise ModelCompileException("multi-output trees are not supported")
+        n = tree.node_count
+        # Leaves have feature -2; 0 keeps the gather in bounds, it is unused
+        feature[i, :n] = np.maximum(tree.feature, 0)
+        threshold[i, :n] = tree.threshold
+        left[i, :n] = tree.children_left
+        right[i, :n] = tree.children_right
+        missing_left[i, :n] = getattr(tree, "missing_go_to_left", 0)
+        value[i, :n] = tree.value[:, 0, :]
+    return {
+        "feature": feature,
+        "threshold": threshold,
+        "left": left,
+        "right": right,
+        "missing_left": missing_left,
+        "value": value,
+        "depth": max(t.max_depth for t in trees),
+    }
+
+
+def _compile_trees(estimator) -> dict:
+    from sklearn.ensemble import (
+        ExtraTreesClassifier,
+        ExtraTreesRegressor,
+        GradientBoostingClassifier,
+        GradientBoostingRegressor,
+        RandomForestClassifier,
+        RandomForestRegressor,
+    )
+    from sklearn.tree import (
+        DecisionTreeClassifier,
+        DecisionTreeRegressor,
+        ExtraTreeClassifier,
+        ExtraTreeRegressor,
+    )
+
+    single = (
+        DecisionTreeClassifier,
+        DecisionTreeRegressor,
+        ExtraTreeClassifier,
+        ExtraTreeRegressor,
+    )
+    forests = (
+        ExtraTreesClassifier,
+        ExtraTreesRegressor,
+        RandomForestClassifier,
+        RandomForestRegressor,
+    )
+    boosting = (GradientBoostingClassifier, GradientBoostingRegressor)
+    classifier = isinstance(
+        estimator,
+        (
+            DecisionTreeClassifier,
+            ExtraTreeClassifier,
+            ExtraTreesClassifier,
+            RandomForestClassifier,
+            GradientBoostingClassifier,
+        ),
+    )
+
+    if isinstance(estimator, single + forests):
+        members = (
+            [estimator] if isinstance(estimator, single) else estimator.estimators_
+        )
+        arrays = _pack_trees([m.tree_ for m in members])
+        if classifier:
+            # Per-tree class proportions, averaged like predict_proba
+            totals = arrays["value"].sum(axis=-1, keepdims=True)
+            arrays["value"] = np.divide(
+                arrays["value"],
+                totals,
+                out=np.zeros_like(arrays["value"]),
+                where=totals > 0,
+            )
+        arrays["mode"] = "average"
+    elif isinstance(estimator, boosting):
+        stages = estimator.estimators_
+        if estimator.init_ != "zero" and type(estimator.init_).__name__ not in (
+            "DummyClassifier",
+            "DummyRegressor",
+        ):
+            raise ModelCompileException("boosting with a custom init is not supported")
+        n_outputs = stages.shape[1]
+        arrays = _pack_trees([tree.tree_ for tree in stages.ravel()])
+        arrays["mode"] = "boosting"
+        arrays["tree_output"] = np.tile(np.arange(n_outputs), stages.shape[0])
+        arrays["learning_rate"] = float(estimator.learning_rate)
+        # The constant raw prediction of init_ is whatever remains once every
+        # stage's contribution is removed from the raw output
+        probe = np.zeros((1, estimator.n_features_in_))
+        raw = (
+            estimator.decision_function(probe)
+            if classifier
+            else estimator.predict(probe)
+        )
+        contributions = np.array(
+            [
+                sum(tree.predict(probe.astype(np.float32))[0] for tree in stages[:, k])
+                for k in range(n_outputs)
+            ]
+        )
+        arrays["base"] = (
+            np.asarray(raw, float).ravel() - estimator.learning_rate * contributions
+        )
+    else:
+        raise ModelCompileException(f"unsupported model {type(estimator).__name__}")
+
+    arrays["kind"] = "trees"
+    if classifier:
+        arrays.update(task="classification", classes=_classes(estimator))
+    else:
+        arrays["task"] = "regression"
+    return arrays
+
+
+def _accepts_nan(estimator) -> bool:
+    """Whether sklearn predicts rows holding NaN (trees route them to a child)
+    or rejects them, like it rejects infinity for every estimator.
+    """
+    try:
+        estimator.predict(np.full((1, estimator.n_features_in_), np.nan))
+    except ValueError:
+        return False
+    return True
+
+
+def compile_model(estimator) -> "CompiledModel":
+    """Compile a fitted estimator or pipeline.
+
+    Raises:
+        ModelCompileException: the estimator (or a pipeline step) is not
+            supported; callers should keep using the original estimator.
+    """
+    if not type(estimator).__module__.startswith("sklearn."):
+        raise ModelCompileException(f"not a scikit-learn model: {type(estimator)}")
+
+    from sklearn.pipeline import Pipeline
+
+    fitted, transforms = estimator, []
+    if isinstance(estimator, Pipeline):
+        *steps, (_, estimator) = estimator.steps
+        transforms = [
+            _compile_scaler(step)
+            for _, step in steps
+            if step not in (None, "passthrough")
+        ]
+    if not hasattr(estimator, "n_features_in_"):
+        raise ModelCompileException("estimator is not fitted")
+
+    try:
+        arrays = _compile_linear(estimator)
+    except ModelCompileException:
+        arrays = _compile_trees(estimator)
+    arrays["transforms"] = transforms
+    arrays["allow_nan"] = _accepts_nan(fitted)
+    return CompiledModel(arrays)
+
+
+# ============================================================================
+# Inference
+# ============================================================================
+
+
+class CompiledModel:
+    """Drop-in replacement for a fitted estimator's `predict`."""
+
+    def __init__(self, arrays: dict):
+        self.arrays = arrays
+        self.kind = arrays["kind"]
+        self.task = arrays["task"]
+        self.transforms = arrays["transforms"]
+        self.dtype = np.dtype(arrays.get("precision", "float64"))
+        # Kernels compiled before this was recorded reject NaN
+        self.allow_nan = bool(arrays.get("allow_nan", False))
+
+    def __repr__(self) -> str:
+        return (
+            f"CompiledModel(kind={self.kind!r}, task={self.task!r}, "
+            f"dtype={self.dtype.name!r})"
+        )
+
+    @property
+    def nbytes(self) -> int:
+        """Memory held by the model's arrays."""
+        arrays = [v for v in self.arrays.values() if isinstance(v, np.ndarray)]
+        arrays += [x for _, a, b in self.transforms for x in (a, b)]
+        return sum(a.nbytes for a in arrays)
+
+    def astype(self, dtype) -> "CompiledModel":
+        """Copy computing in `dtype`: parameters and inputs are cast to it."""
+        dtype = np.dtype(dtype)
+        arrays = dict(self.arrays)
+        for key in _FLOAT_PARAMETERS:
+            if key in arrays:
+                arrays[key] = arrays[key].astype(dtype)
+        if "threshold" in arrays:
+            threshold = arrays["threshold"]
+            rounded = threshold.astype(dtype)
+            # Largest representable value <= threshold: x <= t is unchanged
+            # for every x representable in `dtype`
+            above = rounded > threshold
+            rounded[above] = np.nextafter(rounded[above], dtype.type(-np.inf))
+            arrays["threshold"] = rounded
+        if dtype.itemsize < 8:
+            for key in _INDEX_PARAMETERS:
+                if key in arrays:
+                    arrays[key] = arrays[key].astype(np.int32)
+        arrays["transforms"] = [
+            (op, np.asarray(a).astype(dtype), np.asarray(b).astype(dtype))
+            for op, a, b in self.transforms
+        ]
+        arrays["precision"] = dtype.name
+        return CompiledModel(arrays)
+
+    def _transform(self, data: np.ndarray) -> np.ndarray:
+        for op, a, b in self.transforms:
+            data = (data - a) / b if op == "center" else data * a + b
+        return data
+
+    def _tree_values(self, data: np.ndarray) -> np.ndarray:
+        """Leaf values reached by every row in every tree: (trees, rows, values)."""
+        a = self.arrays
+        # Trees split on float32 features, exactly like sklearn
+        data = np.asarray(data, dtype=np.float32)
+        n_trees = a["feature"].shape[0]
+        trees = np.arange(n_trees)[:, None]
+        rows = np.arange(data.shape[0])[None, :]
+        node = np.zeros((n_trees, data.shape[0]), np.intp)
+        for _ in range(a["depth"]):
+            x = data[rows, a["feature"][trees, node]]
+            go_left = np.where(
+                np.isnan(x),
+                a["missing_left"][trees, node],
+                x <= a["threshold"][trees, node],
+            )
+            child = np.where(go_left, a["left"][trees, node], a["right"][trees, node])
+            node = np.where(child >= 0, child, node)
+        return a["value"][trees, node]
+
+    def _raw(self, data: np.ndarray) -> np.ndarray:
+        a = self.arrays
+        if self.kind == "linear":
+            return data @ a["coef"].T + a["intercept"]
+        values = self._tree_values(data)
+        if a["mode"] == "average":
+            return values.mean(axis=0)
+        raw = np.tile(a["base"], (data.shape[0], 1))
+        contributions = a["learning_rate"] * values[..., 0]
+        for k in range(raw.shape[1]):
+            raw[:, k] += contributions[a["tree_output"] == k].sum(axis=0)
+        return raw
+
+    def _check_finite(self, data: np.ndarray) -> None:
+        """Raise ValueError on the inputs sklearn's check_array rejects."""
+        if np.isfinite(data).all():
+            return
+        if not self.allow_nan and np.isnan(data).any():
+            raise ValueError("Input X contains NaN.")
+        if np.isinf(data).any():
+            raise ValueError(
+                f"Input X contains infinity or a value too large for {data.dtype!r}."
+            )
+
+    def predict(self, data) -> np.ndarray:
+        data = np.asarray(data, dtype=self.dtype)
+        self._check_finite(data)
+        data = self._transform(data)
+        raw = self._raw(data)
+        if self.task == "regression":
+            if self.kind == "linear" and not self.arrays["single_output"]:
+                return raw
+            return raw[:, 0]
+        classes = self.arrays["classes"]
+        if raw.shape[1] == 1:
+            # Binary decision function: positive means classes[1]
+            return classes[(raw[:, 0] > 0).astype(np.intp)]
+        return classes[raw.argmax(axis=1)]
+
+    # ------------------------------------------------------------------------
+    # Persistence
+    # ------------------------------------------------------------------------
+
+    def save(self, path: str, source: Optional[str] = None) -> None:
+        """Write the kernel to `path`, recording the digest of the `source`
+        pickle it was compiled from so loaders can tell a stale kernel.
+        """
+        arrays = {k: v for k, v in self.arrays.items() if k != "transforms"}
+        if source is not None:
+            arrays["source_hash"] = source_hash(source)
+        arrays["transform_ops"] = np.array([op for op, _, _ in self.transforms], str)
+        for i, (_, a, b) in enumerate(self.transforms):
+            arrays[f"transform_{i}_a"] = a
+            arrays[f"transform_{i}_b"] = b
+        with open(path, "wb") as f:
+            np.savez(f, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> "CompiledModel":
+        with np.load(path, allow_pickle=False) as data:
+            arrays = {key: data[key] for key in data.files}
+        ops = arrays.pop("transform_ops")
+        arrays["transforms"] = [
+            (str(op), arrays.pop(f"transform_{i}_a"), arrays.pop(f"transform_{i}_b"))
+            for i, op in enumerate(ops)
+        ]
+        # Scalars come back as 0-d arrays
+        for key, cast in (
+            ("kind", str),
+            ("task", str),
+            ("mode", str),
+            ("depth", int),
+            ("learning_rate", float),
+            ("single_output", bool),
+            ("precision", str),
+            ("allow_nan", bool),
+            ("source_hash", str),
+        ):
+            if key in arrays:
+                arrays[key] = cast(arrays[key])
+        return cls(arrays)
@@ -0,0 +1,432 @@
+"""Streaming feature and prediction statistics with drift scores.
+
+Every prediction updates in-memory statistics in O(1), and a batch of them in
+one vectorized pass: a Welford running mean/variance per input feature and
+for the prediction, fixed-bin histograms over the reference distribution's
+bin edges, and label counts. The predict
+route flushes them as a DriftSnapshot every DRIFT_FLUSH_SECONDS and starts
+over, so each snapshot is the delta seen by one worker. Snapshots merge
+exactly (Chan et al. for the moments, plain sums for the counts), which lets
+the admin endpoint report any time window without reading request_logs.
+
+Drift is scored against a reference computed from the training set
+(`build_reference`, stored as JSON next to the model):
+
+- PSI (population stability index) of each histogram and of label ratios,
+  read as stable below 0.1, moderate below 0.25 and significant above
+- mean shift in units of the reference standard deviation
+"""
+
+import json
+import math
+import threading
+from bisect import bisect_left
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+FEATURES = ("feature1", "feature2", "feature3", "feature4", "feature5")
+PSI_MODERATE = 0.1
+PSI_SIGNIFICANT = 0.25
+# Empty bins would make PSI infinite
+_PSI_FLOOR = 1e-4
+
+
+class RunningStats:
+    """Count, mean, variance (Welford), min and max of a stream."""
+
+    def __init__(self, count=0, mean=0.0, m2=0.0, min=math.inf, max=-math.inf):
+        self.count = count
+        self.mean = mean
+        self.m2 = m2
+        self.min = min
+        self.max = max
+
+    def update(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    @classmethod
+    def from_values(cls, values) -> "RunningStats":
+        """Statistics of an array of values, computed in one pass each."""
+        import numpy as np
+
+        values = np.asarray(values, dtype=float)
+        if not len(values):
+            return cls()
+        mean = float(values.mean())
+        return cls(
+            len(values),
+            mean,
+            float(np.square(values - mean).sum()),
+            float(values.min()),
+            float(values.max()),
+        )
+
+    def merge(self, other: "RunningStats") -> None:
+        if not other.count:
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance."""
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.variance)
+
+    def to_dict(self) -> dict:
+        data = {"count": self.count, "mean": self.mean, "m2": self.m2}
+        if self.count:
+            data.update(min=self.min, max=self.max)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RunningStats":
+        return cls(
+            data["count"],
+            data["mean"],
+            data["m2"],
+            data.get("min", math.inf),
+            data.get("max", -math.inf),
+        )
+
+
+def bin_index(edges: list[float], value: float) -> int:
+    """Bin of `value` for interior `edges`: bin i holds (edges[i-1], edges[i]]."""
+    return bisect_left(edges, value)
+
+
+def psi(expected: list[float], actual_counts: list[int]) -> Optional[float]:
+    """Population stability index of observed counts against proportions."""
+    total = sum(actual_counts)
+    if not total:
+        return None
+    score = 0.0
+    for e, count in zip(expected, actual_counts):
+        e = max(e, _PSI_FLOOR)
+        a = max(count / total, _PSI_FLOOR)
+        score += (a - e) * math.log(a / e)
+    return score
+
+
+def psi_status(score: Optional[float]) -> Optional[str]:
+    if score is None:
+        return None
+    if score < PSI_MODERATE:
+        return "stable"
+    if score < PSI_SIGNIFICANT:
+        return "moderate"
+    return "significant"
+
+
+# ============================================================================
+# Reference
+# ============================================================================
+
+
+def _distribution(values, bins: int) -> dict:
+    import numpy as np
+
+    values = np.asarray(values, dtype=float)
+    # Quantile edges give every bin a similar share of the reference
+    edges = np.unique(np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]))
+    counts = np.bincount(
+        np.searchsorted(edges, values, side="left"), minlength=len(edges) + 1
+    )
+    return {
+        "mean": float(values.mean()),
+        "std": float(values.std(ddof=1)) if len(values) > 1 else 0.0,
+        "edges": edges.tolist(),
+        "proportions": (counts / counts.sum()).tolist(),
+    }
+
+
+def build_reference(features, predictions, labels=None, bins: int = 10) -> dict:
+    """Reference distributions from training data.
+
+    `features` is an (n, 5) array in FEATURES order, `predictions` the model's
+    predictions on it and `labels` the matching prediction labels, if any.
+    """
+    import numpy as np
+
+    features = np.asarray(features, dtype=float)
+    reference = {
+        "count": len(features),
+        "features": {
+            name: _distribution(features[:, i], bins) for i, name in enumerate(FEATURES)
+        },
+        "prediction": _distribution(predictions, bins),
+    }
+    if labels is not None:
+        names, counts = np.unique(np.asarray(labels, dtype=str), return_counts=True)
+        reference["labels"] = {
+            str(name): float(count / counts.sum()) for name, count in zip(names, counts)
+        }
+    return reference
+
+
+def load_reference(path: str) -> Optional[dict]:
+    file = Path(path)
+    if not file.exists():
+        return None
+    return json.loads(file.read_text())
+
+
+# ============================================================================
+# Monitor
+# ============================================================================
+
+
+class DriftStats:
+    """Mergeable statistics over a set of predictions."""
+
+    def __init__(self, reference: Optional[dict] = None):
+        self.edges = {
+            name: dist["edges"]
+            for name, dist in _reference_distributions(reference).items()
+        }
+        self.stats = {name: RunningStats() for name in (*FEATURES, "prediction")}
+        self.histograms = {
+            name: [0] * (len(edges) + 1) for name, edges in self.edges.items()
+        }
+        self.labels: dict[str, int] = {}
+
+    @property
+    def count(self) -> int:
+        return self.stats["prediction"].count
+
+    def observe(self, features: dict, prediction: float, label: str) -> None:
+        """Add one prediction; rows with NaN or infinite values are skipped,
+        they would poison the moments and could not be stored as JSON.
+        """
+        values = {**features, "prediction": prediction}
+        if not all(math.isfinite(value) for value in values.values()):
+            return
+        for name, stats in self.stats.items():
+            stats.update(values[name])
+        for name, histogram in self.histograms.items():
+            histogram[bin_index(self.edges[name], values[name])] += 1
+        self.labels[label] = self.labels.get(label, 0) + 1
+
+    def observe_batch(self, features, predictions, labels) -> None:
+        """`observe` for an (n, 5) array of features at once, vectorized."""
+        import numpy as np
+
+        features = np.asarray(features, dtype=float)
+        predictions = np.asarray(predictions, dtype=float)
+        finite = np.isfinite(features).all(axis=1) & np.isfinite(predictions)
+        if not finite.all():
+            features, predictions = features[finite], predictions[finite]
+            labels = np.asarray(labels, dtype=str)[finite]
+        values = {name: features[:, i] for i, name in enumerate(FEATURES)}
+        values["prediction"] = predictions
+        for name, stats in self.stats.items():
+            stats.merge(RunningStats.from_values(values[name]))
+        for name, histogram in self.histograms.items():
+            index = np.searchsorted(self.edges[name], values[name], side="left")
+            counts = np.bincount(index, minlength=len(histogram))
+            self.histograms[name] = [a + int(b) for a, b in zip(histogram, counts)]
+        names, counts = np.unique(np.asarray(labels, dtype=str), return_counts=True)
+        for label, count in zip(names.tolist(), counts.tolist()):
+            self.labels[label] = self.labels.get(label, 0) + count
+
+    def merge(self, other: "DriftStats") -> None:
+        for name, stats in self.stats.items():
+            stats.merge(other.stats[name])
+        for name, histogram in self.histograms.items():
+            # Snapshots taken against other bin edges cannot be added up
+            if other.edges.get(name) == self.edges[name]:
+                counts = other.histograms[name]
+                self.histograms[name] = [a + b for a, b in zip(histogram, counts)]
+        for label, count in other.labels.items():
+            self.labels[label] = self.labels.get(label, 0) + count
+
+    def to_dict(self) -> dict:
+        return {
+            "stats": {name: s.to_dict() for name, s in self.stats.items()},
+            "edges": self.edges,
+            "histograms": self.histograms,
+            "labels": self.labels,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "DriftStats":
+        stats = cls()
+        stats.stats = {
+            name: RunningStats.from_dict(s) for name, s in data["stats"].items()
+        }
+        stats.edges = data["edges"]
+        stats.histograms = data["histograms"]
+        stats.labels = data["labels"]
+        return stats
+
+    def report(self, reference: Optional[dict]) -> dict:
+        """Summary statistics with drift scores against `reference`."""
+        distributions = _reference_distributions(reference)
+        report = {"count": self.count}
+        for name, stats in self.stats.items():
+            entry = {
+                "count": stats.count,
+                "mean": stats.mean if stats.count else None,
+                "std": stats.std if stats.count else None,
+                "min": stats.min if stats.count else None,
+                "max": stats.max if stats.count else None,
+            }
+            ref = distributions.get(name)
+            if ref is not None:
+                score = None
+                if self.edges.get(name) == ref["edges"]:
+                    score = psi(ref["proportions"], self.histograms[name])
+                shift = None
+                if stats.count and ref["std"]:
+                    shift = (stats.mean - ref["mean"]) / ref["std"]
+                entry.update(
+                    reference_mean=ref["mean"],
+                    reference_std=ref["std"],
+                    mean_shift=shift,
+                    psi=score,
+                    status=psi_status(score),
+                )
+            report[name] = entry
+
+        total = sum(self.labels.values())
+        labels = {
+            "counts": self.labels,
+            "ratios": {k: v / total for k, v in self.labels.items()} if total else {},
+        }
+        if reference and reference.get("labels"):
+            expected = reference["labels"]
+            names = sorted(set(expected) | set(self.labels))
+            score = psi(
+                [expected.get(n, 0.0) for n in names],
+                [self.labels.get(n, 0) for n in names],
+            )
+            labels.update(reference=expected, psi=score, status=psi_status(score))
+        report["labels"] = labels
+
+        statuses = [
+            entry.get("status")
+            for entry in (*(report[n] for n in self.stats), labels)
+            if entry.get("status")
+        ]
+        order = ["stable", "moderate", "significant"]
+        report["status"] = max(statuses, key=order.index) if statuses else None
+        return report
+
+
+def _reference_distributions(reference: Optional[dict]) -> dict:
+    if not reference:
+        return {}
+    distributions = dict(reference.get("features", {}))
+    if reference.get("prediction"):
+        distributions["prediction"] = reference["prediction"]
+    return distributions
+
+
+class DriftMonitor:
+    """Per-process statistics since the last flush."""
+
+    def __init__(self, reference: Optional[dict] = None):
+        self._lock = threading.Lock()
+        self.reference = reference
+        self.current = DriftStats(reference)
+        self.started_at = datetime.now(timezone.utc)
+
+    def configure(self, reference: Optional[dict]) -> None:
+        with self._lock:
+            self.reference = reference
+            self.current = DriftStats(reference)
+            self.started_at = datetime.now(timezone.utc)
+
+    def observe(self, features: dict, prediction: float, label: str) -> None:
+        with self._lock:
+            self.current.observe(features, prediction, label)
+
+    def observe_batch(self, features, predictions, labels) -> None:
+        with self._lock:
+            self.current.observe_batch(features, predictions, labels)
+
+    def due(self, interval: float) -> bool:
+        elapsed = datetime.now(timezone.utc) - self.started_at
+        return self.current.count > 0 and elapsed.total_seconds() >= interval
+
+    def take(self) -> tuple[datetime, DriftStats]:
+        """Hand over the statistics collected so far and start afresh."""
+        with self._lock:
+            taken = (self.started_at, self.current)
+            self.current = DriftStats(self.reference)
+            self.started_at = datetime.now(timezone.utc)
+        return taken
+
+    def restore(self, stats: DriftStats) -> None:
+        """Put back statistics that `take` handed over but could not persist."""
+        with self._lock:
+            self.current.merge(stats)
+
+    def merge_into(self, stats: DriftStats) -> None:
+        with self._lock:
+            stats.merge(self.current)
+
+
+drift_monitor = DriftMonitor()
+
+
+# ============================================================================
+# Persistence
+# ============================================================================
+
+
+def flush(session_factory, model_version: str) -> bool:
+    """Persist what `drift_monitor` collected as a DriftSnapshot.
+
+    On failure the statistics are merged back so the next flush retries them.
+    """
+    from db.models.drift import DriftSnapshot
+
+    started_at, stats = drift_monitor.take()
+    if not stats.count:
+        return False
+    try:
+        with session_factory() as db:
+            db.add(
+                DriftSnapshot(
+                    started_at=started_at,
+                    model_version=model_version,
+                    stats=stats.to_dict(),
+                )
+            )
+            db.commit()
+    except Exception:
+        drift_monitor.restore(stats)
+        raise
+    return True
+
+
+def window(db, since: datetime, model_version: Optional[str] = None) -> DriftStats:
+    """Merged statistics of snapshots created since `since`, plus this
+    process's unflushed ones.
+    """
+    from db.models.drift import DriftSnapshot
+    from sqlalchemy import select
+
+    query = select(DriftSnapshot.stats).where(DriftSnapshot.created_at >= since)
+    if model_version is not None:
+        query = query.where(DriftSnapshot.model_version == model_version)
+    merged = DriftStats(drift_monitor.reference)
+    for stats in db.scalars(query):
+        merged.merge(DriftStats.from_dict(stats))
+    drift_monitor.merge_into(merged)
+    return merged
@@ -0,0 +1,105 @@
+"""Precomputed features looked up by entity key.
+
+The table is the structured .npy written by
+`ml.features.build_features --feature-table`: a `key` bytes field sorted
+ascending and a `features` field holding the model inputs in FEATURES order.
+It is memory-mapped, so only the pages a lookup touches are read and workers
+share the page cache, and a batch of keys is found with one vectorized binary
+search (O(log n) per key).
+
+The writer replaces the file atomically. Lookups stat it at most every
+`refresh_seconds` and, when it changed, swap in a mapping of the new file;
+lookups already holding the old mapping finish on it.
+"""
+
+import os
+import threading
+import time
+from typing import Optional
+
+from core.errors import FeatureStoreException
+from loguru import logger
+
+
+class FeatureTable:
+    """Read-only mapping of one feature table file."""
+
+    def __init__(self, path: str):
+        import numpy as np
+
+        table = np.load(path, mmap_mode="r")
+        if table.dtype.names != ("key", "features") or table.dtype["key"].kind != "S":
+            raise ValueError(f"{path} is not a feature table")
+        self.path = path
+        self.keys = table["key"]
+        self.features = table["features"]
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def lookup(self, keys: list[str]) -> tuple:
+        """Features of the keys that exist, and a mask of which ones do."""
+        import numpy as np
+
+        encoded = [str(key).encode() for key in keys]
+        # Longer keys would be truncated to the key width and could match
+        fits = np.array([len(key) <= self.keys.itemsize for key in encoded])
+        wanted = np.array(encoded, dtype=self.keys.dtype)
+        index = np.searchsorted(self.keys, wanted)
+        found = fits & (index < len(self))
+        found[found] = self.keys[index[found]] == wanted[found]
+        return np.asarray(self.features[index[found]]), found
+
+
+class FeatureStore:
+    """The current FeatureTable of a path, refreshed when the file changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.path: Optional[str] = None
+        self.refresh_seconds = 30.0
+        self.table: Optional[FeatureTable] = None
+        self._stamp = None
+        self._checked = 0.0
+
+    def configure(self, path: str, refresh_seconds: float = 30.0) -> None:
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self.table = None
+        self._stamp = None
+        self.refresh()
+
+    def refresh(self) -> bool:
+        """Map the file again if it changed; returns whether it did."""
+        self._checked = time.monotonic()
+        if self.path is None:
+            return False
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if stamp == self._stamp:
+                return False
+            try:
+                table = FeatureTable(self.path)
+            except Exception:
+                # Keep serving the previous table
+                logger.exception(f"failed to load feature table {self.path}")
+                self._stamp = stamp
+                return False
+            self.table, self._stamp = table, stamp
+        logger.info(f"Loaded {len(table)} feature rows from {self.path}")
+        return True
+
+    def lookup(self, keys: list[str]) -> tuple:
+        if time.monotonic() - self._checked >= self.refresh_seconds:
+            self.refresh()
+        table = self.table
+        if table is None:
+            raise FeatureStoreException("no feature table loaded")
+        return table.lookup(keys)
+
+
+feature_store = FeatureStore()
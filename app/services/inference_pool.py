@@ -0,0 +1,132 @@
+"""Run model inference in worker processes instead of the shared thread pool.
+
+Predicting in Starlette's thread pool holds the GIL while the model runs, so a
+CPU-bound model slows down every other request the worker is handling. With
+`INFERENCE_BACKEND=process` predictions go to a pool of worker processes that
+each load the model once (compiled kernel if available, see
+services.compiled_model) in their initializer.
+
+Feature batches travel through pre-allocated shared memory slots: the event
+loop copies the array into a free slot and workers read it in place, so only
+the slot name, shape and dtype are pickled. Batches larger than a slot, or
+arriving while every slot is busy, are pickled instead. Predictions are small
+and come back through the executor as usual.
+"""
+
+import asyncio
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+from typing import Optional
+
+from core.errors import ModelLoadException
+from core.metrics import MODEL_INFERENCE_DURATION
+from loguru import logger
+
+SLOT_BYTES = 64 * 1024
+
+# Worker-side state, one copy per process
+_segments: dict[str, SharedMemory] = {}
+
+
+def _init_worker() -> None:
+    from services.predict import MachineLearningModelHandlerScore, load_joblib
+
+    try:
+        MachineLearningModelHandlerScore.get_model(load_joblib)
+    except (Exception, ModelLoadException):
+        # Surfaces again on the first predict; a raising initializer would
+        # instead break the whole pool
+        logger.exception("inference worker could not preload the model")
+
+
+def _predict(data, method: str):
+    from services.predict import MachineLearningModelHandlerScore, load_joblib
+
+    return MachineLearningModelHandlerScore.predict(
+        data, load_wrapper=load_joblib, method=method
+    )
+
+
+def _predict_shared(name: str, shape: tuple, dtype: str, method: str):
+    import numpy as np
+
+    segment = _segments.get(name)
+    if segment is None:
+        segment = _segments[name] = SharedMemory(name=name)
+    data = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+    return _predict(data, method)
+
+
+class InferencePool:
+    """Process pool holding one model per worker, fed through shared memory."""
+
+    def __init__(self):
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.slots: list[SharedMemory] = []
+        self.free: queue.SimpleQueue = queue.SimpleQueue()
+
+    @property
+    def running(self) -> bool:
+        return self.executor is not None
+
+    def start(self, workers: int, slot_bytes: int = SLOT_BYTES) -> None:
+        if self.running:
+            return
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        # Two slots per worker keep the next batch ready while one is predicted
+        for _ in range(2 * workers):
+            slot = SharedMemory(create=True, size=slot_bytes)
+            self.slots.append(slot)
+            self.free.put(slot)
+        logger.info(f"Inference pool started with {workers} worker processes")
+
+    def shutdown(self) -> None:
+        if not self.running:
+            return
+        self.executor.shutdown(wait=True, cancel_futures=True)
+        self.executor = None
+        for slot in self.slots:
+            slot.close()
+            slot.unlink()
+        self.slots = []
+        self.free = queue.SimpleQueue()
+
+    def _acquire(self, data) -> Optional[SharedMemory]:
+        if data.dtype.hasobject or data.nbytes > self.slots[0].size:
+            return None
+        try:
+            return self.free.get_nowait()
+        except queue.Empty:
+            return None
+
+    async def predict(self, data, method: str = "predict"):
+        import numpy as np
+
+        slot = self._acquire(data)
+        with MODEL_INFERENCE_DURATION.time():
+            if slot is None:
+                future = self.executor.submit(_predict, data, method)
+            else:
+                np.ndarray(data.shape, data.dtype, buffer=slot.buf)[...] = data
+                try:
+                    future = self.executor.submit(
+                        _predict_shared, slot.name, data.shape, data.dtype.str, method
+                    )
+                except BaseException:
+                    self.free.put(slot)
+                    raise
+                # Released once the worker is done with it, even when the
+                # request is cancelled while waiting
+                free = self.free
+                future.add_done_callback(lambda _: free.put(slot))
+            return await asyncio.wrap_future(future)
+
+
+inference_pool = InferencePool()
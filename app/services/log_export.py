@@ -0,0 +1,151 @@
+"""Stream request logs out as NDJSON, CSV or Parquet in constant memory.
+
+Rows are read with a server-side cursor (`yield_per`), so PostgreSQL hands
+them over `chunk_size` at a time instead of materializing the whole result in
+the client. Each chunk is encoded and yielded as bytes before the next one is
+fetched; a Parquet export writes one row group per chunk. Memory is bounded
+by the chunk size whatever the time range.
+"""
+
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import datetime
+from typing import Callable, Optional
+
+from db.models.log import RequestLog
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+COLUMNS = (
+    "id",
+    "created_at",
+    "model_version",
+    "latency_ms",
+    "feature1",
+    "feature2",
+    "feature3",
+    "feature4",
+    "feature5",
+    "prediction",
+    "prediction_label",
+)
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+def iter_chunks(
+    session_factory: Callable[[], Session],
+    start: datetime,
+    end: datetime,
+    model_version: Optional[str] = None,
+    chunk_size: int = 10_000,
+) -> Iterator[list[tuple]]:
+    """Rows with created_at in [start, end), oldest first, in lists of
+    at most `chunk_size`.
+    """
+    query = (
+        select(*(getattr(RequestLog, name) for name in COLUMNS))
+        .where(RequestLog.created_at >= start, RequestLog.created_at < end)
+        .order_by(RequestLog.created_at, RequestLog.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    if model_version is not None:
+        query = query.where(RequestLog.model_version == model_version)
+    with session_factory() as db:
+        for partition in db.execute(query).partitions():
+            yield [tuple(row) for row in partition]
+
+
+def encode_ndjson(chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    for rows in chunks:
+        lines = [
+            json.dumps(dict(zip(COLUMNS, (row[0], row[1].isoformat(), *row[2:]))))
+            for row in rows
+        ]
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def encode_csv(chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    for rows in chunks:
+        writer.writerows((row[0], row[1].isoformat(), *row[2:]) for row in rows)
+        yield buffer.getvalue().encode()
+        buffer.seek(0)
+        buffer.truncate()
+    # Header only when there were no rows
+    if buffer.tell():
+        yield buffer.getvalue().encode()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands out what was written since the last drain.
+
+    ParquetWriter records byte offsets in the footer from `tell()`, so the
+    position keeps counting while the written bytes are released.
+    """
+
+    def __init__(self):
+        self.parts: list[bytes] = []
+        self.position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self.parts.append(bytes(data))
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def drain(self) -> bytes:
+        data, self.parts = b"".join(self.parts), []
+        return data
+
+
+def encode_parquet(chunks: Iterator[list[tuple]]) -> Iterator[bytes]:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("created_at", pa.timestamp("us", tz="UTC")),
+            ("model_version", pa.string()),
+            ("latency_ms", pa.float64()),
+            *((f"feature{k}", pa.float64()) for k in range(1, 6)),
+            ("prediction", pa.float64()),
+            ("prediction_label", pa.string()),
+        ]
+    )
+    sink = _ChunkSink()
+    with pq.ParquetWriter(sink, schema, compression="zstd") as writer:
+        for rows in chunks:
+            columns = list(zip(*rows))
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+            yield sink.drain()
+    yield sink.drain()
+
+
+ENCODERS = {"ndjson": encode_ndjson, "csv": encode_csv, "parquet": encode_parquet}
+
+
+def export(
+    session_factory: Callable[[], Session],
+    fmt: str,
+    start: datetime,
+    end: datetime,
+    model_version: Optional[str] = None,
+    chunk_size: int = 10_000,
+) -> Iterator[bytes]:
+    chunks = iter_chunks(session_factory, start, end, model_version, chunk_size)
+    return ENCODERS[fmt](chunks)
@@ -1,10 +1,23 @@
 import os
 
-from core.config import MODEL_NAME, MODEL_PATH
-from core.errors import ModelLoadException, PredictException
+from core.config import MODEL_COMPILE_FLAG, MODEL_NAME, MODEL_PATH, MODEL_PRECISION
+from core.errors import ModelCompileException, ModelLoadException, PredictException
+from core.metrics import MODEL_INFERENCE_DURATION
 from loguru import logger
 
 
+def load_joblib(path):
+    """joblib.load, imported on first use since joblib pulls in numpy."""
+    import joblib
+
+    return joblib.load(path)
+
+
+def compiled_path(path: str) -> str:
+    """Where the compiled kernel for the model at `path` lives."""
+    return f"{os.path.splitext(path)[0]}.npz"
+
+
 class MachineLearningModelHandlerScore:
     model = None
 
@@ -12,9 +25,18 @@ class MachineLearningModelHandlerScore:
     def predict(cls, input, load_wrapper=None, method="predict"):
         clf = cls.get_model(load_wrapper)
         if hasattr(clf, method):
-            return getattr(clf, method)(input)
+            with MODEL_INFERENCE_DURATION.time():
+                return getattr(clf, method)(input)
         raise PredictException(f"'{method}' attribute is missing")
 
+    @classmethod
+    def input_dtype(cls) -> str:
+        """dtype to build inputs in: the loaded model's (a float32 compiled
+        model), else float64, which every model accepts.
+        """
+        dtype = getattr(cls.model, "dtype", None)
+        return "float64" if dtype is None else dtype.name
+
     @classmethod
     def get_model(cls, load_wrapper):
         if cls.model is None and load_wrapper:
@@ -23,6 +45,21 @@ class MachineLearningModelHandlerScore:
 
     @staticmethod
     def load(load_wrapper):
+        model = MachineLearningModelHandlerScore._load(load_wrapper)
+        if MODEL_PRECISION == "float32":
+            from services.compiled_model import CompiledModel
+
+            if isinstance(model, CompiledModel):
+                logger.info("Serving the compiled model in float32")
+                return model.astype("float32")
+            logger.warning(
+                f"MODEL_PRECISION=float32 needs a compiled model, "
+                f"serving {type(model).__name__} in float64"
+            )
+        return model
+
+    @staticmethod
+    def _load(load_wrapper):
         model = None
         if MODEL_PATH.endswith("/"):
             path = f"{MODEL_PATH}{MODEL_NAME}"
@@ -32,9 +69,26 @@ class MachineLearningModelHandlerScore:
             message = f"Machine learning model at {path} not exists!"
             logger.error(message)
             raise FileNotFoundError(message)
+        compiled = compiled_path(path)
+        if MODEL_COMPILE_FLAG and os.path.exists(compiled):
+            from services.compiled_model import CompiledModel, source_hash
+
+            kernel = CompiledModel.load(compiled)
+            # mtimes do not survive checkouts and copies; the digest does
+            if kernel.arrays.get("source_hash") == source_hash(path):
+                logger.info(f"Loading compiled model from {compiled}")
+                return kernel
+            logger.warning(f"{compiled} was not compiled from {path}, ignoring it")
         model = load_wrapper(path)
         if not model:
             message = f"Model {model} could not load!"
             logger.error(message)
             raise ModelLoadException(message)
+        if MODEL_COMPILE_FLAG and type(model).__module__.startswith("sklearn."):
+            from services.compiled_model import compile_model
+
+            try:
+                return compile_model(model)
+            except ModelCompileException as err:
+                logger.info(f"Serving {type(model).__name__} with sklearn: {err}")
         return model
@@ -0,0 +1,100 @@
+"""Render lab note markdown into sanitized HTML once, at write time."""
+
+import html
+import re
+
+import markdown
+import nh3
+
+WORDS_PER_MINUTE = 200
+
+MARKDOWN_EXTENSIONS = ["fenced_code", "codehilite", "tables", "toc", "sane_lists"]
+MARKDOWN_EXTENSION_CONFIGS = {
+    "codehilite": {"css_class": "highlight", "guess_lang": False},
+    "toc": {"toc_depth": "2-4"},
+}
+
+ALLOWED_TAGS = nh3.ALLOWED_TAGS | {"tfoot"}
+ALLOWED_ATTRIBUTES = {
+    **{tag: set(attrs) for tag, attrs in nh3.ALLOWED_ATTRIBUTES.items()},
+    **{f"h{level}": {"id"} for level in range(1, 7)},
+    "span": {"class"},
+    "div": {"class"},
+    "code": {"class"},
+    "pre": {"class"},
+}
+
+# Code is matched first so `$` inside code spans and fences is left alone
+_MATH_OR_CODE = re.compile(
+    r"(?P<fence>^(?P<marker>```|~~~).*?^(?P=marker))"
+    r"|(?P<code>`[^`\n]+`)"
+    r"|\$\$(?P<display>.+?)\$\$"
+    r"|(?<![\\\w$])\$(?P<inline>[^\s$](?:[^$\n]*[^\s$])?)\$(?!\w)",
+    re.DOTALL | re.MULTILINE,
+)
+_WORD = re.compile(r"\w+")
+
+
+def _protect_math(content: str) -> tuple[str, dict[str, str]]:
+    """Swap math spans for placeholders so markdown doesn't mangle them.
+
+    Math is emitted as escaped TeX in `math` elements for client-side
+    typesetting (e.g. KaTeX auto-render).
+    """
+    placeholders = {}
+
+    def replace(match: re.Match) -> str:
+        if match.group("fence") or match.group("code"):
+            return match.group(0)
+        token = f"MATHPLACEHOLDER{len(placeholders)}X"
+        if match.group("display") is not None:
+            tex = html.escape(match.group("display").strip())
+            placeholders[token] = f'<div class="math display">\\[{tex}\\]</div>'
+        else:
+            tex = html.escape(match.group("inline"))
+            placeholders[token] = f'<span class="math inline">\\({tex}\\)</span>'
+        return token
+
+    return _MATH_OR_CODE.sub(replace, content), placeholders
+
+
+def _restore_math(rendered: str, placeholders: dict[str, str]) -> str:
+    for token, replacement in placeholders.items():
+        if replacement.startswith("<div"):
+            rendered = rendered.replace(f"<p>{token}</p>", replacement)
+        rendered = rendered.replace(token, replacement)
+    return rendered
+
+
+def _flatten_toc(tokens: list[dict]) -> list[dict]:
+    toc = []
+    for token in tokens:
+        toc.append({"level": token["level"], "id": token["id"], "title": token["name"]})
+        toc.extend(_flatten_toc(token["children"]))
+    return toc
+
+
+def estimate_read_time(content: str) -> str:
+    """Return a display read time derived from the word count."""
+    minutes = max(1, round(len(_WORD.findall(content)) / WORDS_PER_MINUTE))
+    return f"{minutes} min read"
+
+
+def render_lab_note(content: str) -> dict:
+    """Render lab note markdown.
+
+    Returns:
+        dict with html (sanitized), toc (flat list of headings) and read_time
+    """
+    source, placeholders = _protect_math(content)
+    md = markdown.Markdown(
+        extensions=MARKDOWN_EXTENSIONS,
+        extension_configs=MARKDOWN_EXTENSION_CONFIGS,
+    )
+    rendered = _restore_math(md.convert(source), placeholders)
+    sanitized = nh3.clean(rendered, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRIBUTES)
+    return {
+        "html": sanitized,
+        "toc": _flatten_toc(md.toc_tokens),
+        "read_time": estimate_read_time(content),
+    }
@@ -1,10 +1,33 @@
+import asyncio
+import hashlib
+import re
 import uuid
 from datetime import datetime
 
-import aioboto3
+from botocore.exceptions import ClientError
 from core import config
 from fastapi import HTTPException, UploadFile
 
+ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/png", "image/gif", "image/webp"]
+IMAGE_EXTENSIONS = {
+    "image/jpeg": "jpg",
+    "image/png": "png",
+    "image/gif": "gif",
+    "image/webp": "webp",
+}
+CONTENT_KEY = re.compile(
+    rf"(?:.+/)?[0-9a-f]{{64}}\.(?:{'|'.join(IMAGE_EXTENSIONS.values())})"
+)
+HASH_CHUNK_SIZE = 1024 * 1024
+# S3 DeleteObjects accepts at most 1000 keys per request
+DELETE_BATCH_SIZE = 1000
+DELETE_BATCH_CONCURRENCY = 4
+IN_USE = "still used by a project or lab note"
+
+
+def _is_not_found(err: ClientError) -> bool:
+    return err.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound")
+
 
 class R2StorageService:
     def __init__(self):
@@ -12,30 +35,82 @@ class R2StorageService:
         self.bucket_name = config.R2_BUCKET_NAME
         self.public_url = config.R2_PUBLIC_URL
 
-    async def upload_image(self, file: UploadFile, folder: str = "images") -> str:
-        """Upload an image to R2 and return the public URL."""
-        allowed_types = ["image/jpeg", "image/png", "image/gif", "image/webp"]
-        if file.content_type not in allowed_types:
-            raise HTTPException(400, f"Unsupported file type: {file.content_type}")
-
-        # Generate unique filename
-        if file.filename and "." in file.filename:
-            ext = file.filename.split(".")[-1]
-        else:
-            ext = "jpg"
-        timestamp = datetime.now().strftime("%Y%m%d")
-        unique_id = uuid.uuid4().hex[:8]
-        key = f"{folder}/{timestamp}/{unique_id}.{ext}"
+    def _client(self):
+        """Return an async context manager yielding an S3 client bound to R2."""
+        # Imported on first use: aioboto3 pulls in aiohttp and botocore's
+        # client machinery, which only the upload routes need
+        import aioboto3
 
-        # Upload to R2
         session = aioboto3.Session()
-        async with session.client(  # type: ignore[attr-defined]
+        return session.client(  # type: ignore[attr-defined]
             "s3",
             endpoint_url=self.endpoint_url,
             aws_access_key_id=config.R2_ACCESS_KEY_ID,
             aws_secret_access_key=config.R2_SECRET_ACCESS_KEY,
             region_name="auto",
-        ) as s3:
+        )
+
+    @staticmethod
+    def _validate_content_type(content_type: str | None) -> None:
+        if content_type not in ALLOWED_IMAGE_TYPES:
+            raise HTTPException(400, f"Unsupported file type: {content_type}")
+
+    @staticmethod
+    def _build_key(folder: str, filename: str | None) -> str:
+        """Generate a unique object key as `folder/date/id.ext`."""
+        ext = filename.split(".")[-1] if filename and "." in filename else "jpg"
+        timestamp = datetime.now().strftime("%Y%m%d")
+        unique_id = uuid.uuid4().hex[:8]
+        return f"{folder}/{timestamp}/{unique_id}.{ext}"
+
+    @staticmethod
+    def _build_content_key(folder: str, digest: str, content_type: str) -> str:
+        """Generate a content-addressed object key as `folder/sha256.ext`."""
+        return f"{folder}/{digest}.{IMAGE_EXTENSIONS[content_type]}"
+
+    @staticmethod
+    async def _hash_file(file: UploadFile) -> str:
+        """Hash the upload in chunks and rewind it for the actual upload."""
+        digest = hashlib.sha256()
+        while chunk := await file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+        await file.seek(0)
+        return digest.hexdigest()
+
+    async def _object_exists(self, s3, key: str) -> bool:
+        # Always asked of the bucket: another worker may have deleted the key
+        try:
+            await s3.head_object(Bucket=self.bucket_name, Key=key)
+        except ClientError as err:
+            if _is_not_found(err):
+                return False
+            raise
+        return True
+
+    def _key_from_url(self, url: str) -> str:
+        return url.replace(f"{self.public_url}/", "")
+
+    def _url_from_key(self, key: str) -> str:
+        return f"{self.public_url}/{key}"
+
+    def is_content_url(self, url: str) -> bool:
+        """Whether `url` is a content-addressed upload, which records may share."""
+        return CONTENT_KEY.fullmatch(self._key_from_url(url)) is not None
+
+    async def upload_image(self, file: UploadFile, folder: str = "images") -> str:
+        """Upload an image to R2 and return the public URL.
+
+        Objects are keyed by the SHA-256 of their content, so re-uploading the
+        same image returns the existing URL without sending the bytes again.
+        """
+        self._validate_content_type(file.content_type)
+        digest = await self._hash_file(file)
+        key = self._build_content_key(folder, digest, file.content_type)
+
+        async with self._client() as s3:
+            if await self._object_exists(s3, key):
+                return self._url_from_key(key)
+
             await s3.upload_fileobj(
                 file.file,
                 self.bucket_name,
@@ -43,24 +118,123 @@ class R2StorageService:
                 ExtraArgs={"ContentType": file.content_type},
             )
 
-        return f"{self.public_url}/{key}"
+        return self._url_from_key(key)
+
+    async def create_presigned_upload(
+        self, filename: str | None, content_type: str, folder: str = "images"
+    ) -> dict:
+        """Create a presigned PUT URL so clients can upload directly to R2.
+
+        The signature covers the Content-Type header, so the client must send
+        the same content type it requested here.
+        """
+        self._validate_content_type(content_type)
+        key = self._build_key(folder, filename)
+        expires_in = config.R2_PRESIGN_EXPIRES_SECONDS
+
+        async with self._client() as s3:
+            upload_url = await s3.generate_presigned_url(
+                "put_object",
+                Params={
+                    "Bucket": self.bucket_name,
+                    "Key": key,
+                    "ContentType": content_type,
+                },
+                ExpiresIn=expires_in,
+            )
+
+        return {
+            "upload_url": upload_url,
+            "url": self._url_from_key(key),
+            "key": key,
+            "expires_in": expires_in,
+            "headers": {"Content-Type": content_type},
+        }
+
+    async def confirm_upload(self, key: str) -> str:
+        """Confirm a presigned upload landed in R2 and return its public URL."""
+        async with self._client() as s3:
+            try:
+                head = await s3.head_object(Bucket=self.bucket_name, Key=key)
+            except ClientError as err:
+                if _is_not_found(err):
+                    raise HTTPException(404, f"Object not found: {key}") from err
+                raise
+
+            if head.get("ContentType") not in ALLOWED_IMAGE_TYPES:
+                await s3.delete_object(Bucket=self.bucket_name, Key=key)
+                raise HTTPException(
+                    400, f"Unsupported file type: {head.get('ContentType')}"
+                )
+
+        return self._url_from_key(key)
 
     async def delete_image(self, url: str) -> bool:
-        """Delete an image from R2 by its public URL."""
-        # Extract key from URL
-        key = url.replace(f"{self.public_url}/", "")
+        """Delete an image from R2 by its public URL.
 
-        session = aioboto3.Session()
-        async with session.client(  # type: ignore[attr-defined]
-            "s3",
-            endpoint_url=self.endpoint_url,
-            aws_access_key_id=config.R2_ACCESS_KEY_ID,
-            aws_secret_access_key=config.R2_SECRET_ACCESS_KEY,
-            region_name="auto",
-        ) as s3:
+        Content-addressed images can be shared by several records; callers
+        check `db.images.referenced_urls` before deleting them.
+        """
+        key = self._key_from_url(url)
+
+        async with self._client() as s3:
             await s3.delete_object(Bucket=self.bucket_name, Key=key)
 
         return True
 
+    async def _delete_batch(
+        self, s3, keys: list[str], semaphore: asyncio.Semaphore
+    ) -> dict[str, str | None]:
+        """Delete one batch of keys and return an error message per failed key."""
+        async with semaphore:
+            try:
+                response = await s3.delete_objects(
+                    Bucket=self.bucket_name,
+                    Delete={"Objects": [{"Key": key} for key in keys], "Quiet": True},
+                )
+            except ClientError as err:
+                return dict.fromkeys(keys, str(err))
+
+        errors = {
+            error["Key"]: f"{error.get('Code')}: {error.get('Message')}"
+            for error in response.get("Errors", [])
+        }
+        return {key: errors.get(key) for key in keys}
+
+    async def delete_images(
+        self, urls: list[str], keep: frozenset[str] = frozenset()
+    ) -> list[dict]:
+        """Delete many images by public URL using batched DeleteObjects calls.
+
+        URLs in `keep`, which are still referenced, are reported as not deleted
+        and left in the bucket.
+        """
+        keys = list(
+            dict.fromkeys(self._key_from_url(url) for url in urls if url not in keep)
+        )
+        batches = [
+            keys[i : i + DELETE_BATCH_SIZE]
+            for i in range(0, len(keys), DELETE_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(DELETE_BATCH_CONCURRENCY)
+
+        async with self._client() as s3:
+            batch_results = await asyncio.gather(
+                *(self._delete_batch(s3, batch, semaphore) for batch in batches)
+            )
+
+        errors = {self._key_from_url(url): IN_USE for url in keep}
+        for batch_result in batch_results:
+            errors.update(batch_result)
+
+        results = []
+        for url in urls:
+            key = self._key_from_url(url)
+            error = errors[key]
+            results.append(
+                {"url": url, "key": key, "deleted": error is None, "error": error}
+            )
+        return results
+
 
 storage_service = R2StorageService()
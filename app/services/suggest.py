@@ -0,0 +1,180 @@
+import re
+import threading
+from bisect import bisect_left, insort
+from collections import Counter
+
+from db.models.lab_notes import LabNote
+from db.models.projects import Project
+from sqlalchemy.orm import Session
+
+_WORD_SPLIT = re.compile(r"[\s\-_/]+")
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+class SuggestionIndex:
+    """In-process prefix index over published project and lab note titles,
+    slugs and tags.
+
+    Terms are kept in a sorted list of `(term, kind, key)` tuples so a prefix
+    lookup is a bisect followed by a short scan. Keystroke traffic is served
+    entirely from memory; admin write routes keep the index up to date.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._terms: list[tuple[str, str, str]] = []
+        self._docs: dict[tuple[str, str], dict] = {}
+        self._tags: dict[str, str] = {}
+        self._tag_refs: Counter = Counter()
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _doc_terms(title: str, slug: str) -> set[str]:
+        terms = {_normalize(title), slug.lower()}
+        terms.update(w for w in _WORD_SPLIT.split(title.lower()) if w)
+        terms.update(w for w in slug.lower().split("-") if w)
+        return terms
+
+    def _add_tag(self, tag: str) -> None:
+        key = _normalize(tag)
+        if not key:
+            return
+        if self._tag_refs[key] == 0:
+            self._tags[key] = tag
+            insort(self._terms, (key, "tag", key))
+        self._tag_refs[key] += 1
+
+    def _remove_tag(self, tag: str) -> None:
+        key = _normalize(tag)
+        if self._tag_refs[key] == 0:
+            return
+        self._tag_refs[key] -= 1
+        if self._tag_refs[key] == 0:
+            del self._tag_refs[key]
+            del self._tags[key]
+            self._remove_term((key, "tag", key))
+
+    def _remove_term(self, entry: tuple[str, str, str]) -> None:
+        i = bisect_left(self._terms, entry)
+        if i < len(self._terms) and self._terms[i] == entry:
+            del self._terms[i]
+
+    def _remove_locked(self, kind: str, key: str) -> None:
+        doc = self._docs.pop((kind, key), None)
+        if doc is None:
+            return
+        for term in doc["terms"]:
+            self._remove_term((term, kind, key))
+        for tag in doc["tags"]:
+            self._remove_tag(tag)
+
+    def _upsert_locked(
+        self, kind: str, key: str, title: str, slug: str, tags: list[str]
+    ) -> None:
+        self._remove_locked(kind, key)
+        terms = self._doc_terms(title, slug)
+        self._docs[(kind, key)] = {
+            "title": title,
+            "slug": slug,
+            "tags": list(tags),
+            "terms": terms,
+        }
+        for term in terms:
+            insort(self._terms, (term, kind, key))
+        for tag in tags:
+            self._add_tag(tag)
+
+    def upsert(
+        self,
+        kind: str,
+        id,
+        title: str,
+        slug: str,
+        tags: list[str],
+        published: bool = True,
+    ) -> None:
+        """Add or replace an entry. Unpublished entries are removed instead."""
+        with self._lock:
+            if published:
+                self._upsert_locked(kind, str(id), title, slug, tags or [])
+            else:
+                self._remove_locked(kind, str(id))
+
+    def remove(self, kind: str, id) -> None:
+        with self._lock:
+            self._remove_locked(kind, str(id))
+
+    def index_project(self, project: Project) -> None:
+        self.upsert(
+            "project",
+            project.id,
+            project.title,
+            project.slug,
+            project.tags,
+            bool(project.published),
+        )
+
+    def index_lab_note(self, lab_note: LabNote) -> None:
+        self.upsert(
+            "lab_note",
+            lab_note.id,
+            lab_note.title,
+            lab_note.slug,
+            lab_note.tags,
+            bool(lab_note.published),
+        )
+
+    def load(self, db: Session) -> None:
+        """Rebuild the index from all published projects and lab notes."""
+        projects = db.query(
+            Project.id, Project.title, Project.slug, Project.tags
+        ).filter(Project.published)
+        lab_notes = db.query(
+            LabNote.id, LabNote.title, LabNote.slug, LabNote.tags
+        ).filter(LabNote.published)
+
+        index = SuggestionIndex()
+        for kind, rows in (("project", projects), ("lab_note", lab_notes)):
+            for row in rows:
+                index._upsert_locked(kind, str(row.id), row.title, row.slug, row.tags)
+
+        with self._lock:
+            self._terms = index._terms
+            self._docs = index._docs
+            self._tags = index._tags
+            self._tag_refs = index._tag_refs
+
+    def suggest(self, prefix: str, limit: int = 8) -> list[dict]:
+        """Return up to `limit` entries with a term starting with `prefix`."""
+        prefix = _normalize(prefix)
+        if not prefix:
+            return []
+
+        results = []
+        seen = set()
+        with self._lock:
+            i = bisect_left(self._terms, (prefix,))
+            while i < len(self._terms) and len(results) < limit:
+                term, kind, key = self._terms[i]
+                if not term.startswith(prefix):
+                    break
+                i += 1
+                if (kind, key) in seen:
+                    continue
+                seen.add((kind, key))
+                if kind == "tag":
+                    results.append({"type": "tag", "title": self._tags[key]})
+                else:
+                    doc = self._docs[(kind, key)]
+                    results.append(
+                        {"type": kind, "title": doc["title"], "slug": doc["slug"]}
+                    )
+        return results
+
+
+suggestion_index = SuggestionIndex()
@@ -0,0 +1,96 @@
+"""Compare two benchmark reports and flag latency or throughput regressions.
+
+Usage:
+    python -m benchmarks.compare benchmarks/results/base.json \
+        benchmarks/results/head.json --threshold 0.1
+
+Exits with status 1 when any route regressed by more than the threshold, so it
+can gate CI.
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import click
+
+LATENCY_METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+def compare_reports(
+    base: dict, head: dict, threshold: float, metrics=LATENCY_METRICS
+) -> list[dict]:
+    """Relative change per route and metric.
+
+    Latency regresses when it grows by more than `threshold`, throughput when
+    it drops by more than `threshold`. Routes present in only one report are
+    skipped.
+    """
+    rows = []
+    for route in sorted(set(base["routes"]) & set(head["routes"])):
+        before, after = base["routes"][route], head["routes"][route]
+        for metric in (*metrics, "throughput_rps"):
+            old, new = before[metric], after[metric]
+            change = (new - old) / old if old else 0.0
+            worse = -change if metric == "throughput_rps" else change
+            rows.append(
+                {
+                    "route": route,
+                    "metric": metric,
+                    "base": old,
+                    "head": new,
+                    "change": round(change, 4),
+                    "regression": worse > threshold,
+                }
+            )
+        if after["errors"] > before["errors"]:
+            rows.append(
+                {
+                    "route": route,
+                    "metric": "errors",
+                    "base": before["errors"],
+                    "head": after["errors"],
+                    "change": None,
+                    "regression": True,
+                }
+            )
+    return rows
+
+
+def format_rows(rows: list[dict]) -> str:
+    lines = [f"{'route':<45} {'metric':<15} {'base':>10} {'head':>10} {'change':>8}"]
+    for row in rows:
+        change = "" if row["change"] is None else f"{row['change']:+.1%}"
+        marker = "  REGRESSION" if row["regression"] else ""
+        lines.append(
+            f"{row['route']:<45} {row['metric']:<15} {row['base']:>10} "
+            f"{row['head']:>10} {change:>8}{marker}"
+        )
+    return "\n".join(lines)
+
+
+@click.command()
+@click.argument("base", type=click.Path(exists=True))
+@click.argument("head", type=click.Path(exists=True))
+@click.option(
+    "--threshold", default=0.1, show_default=True, help="Allowed relative change."
+)
+@click.option("--regressions-only", is_flag=True, help="Only print regressed metrics.")
+def main(base, head, threshold, regressions_only):
+    """Compares the HEAD report against the BASE report."""
+    base_report = json.loads(Path(base).read_text())
+    head_report = json.loads(Path(head).read_text())
+    rows = compare_reports(base_report, head_report, threshold)
+    if regressions_only:
+        rows = [row for row in rows if row["regression"]]
+    click.echo(
+        f"base {base_report['meta']['commit']} vs head {head_report['meta']['commit']}"
+    )
+    click.echo(format_rows(rows))
+    if any(row["regression"] for row in rows):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
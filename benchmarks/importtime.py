@@ -0,0 +1,146 @@
+"""Profile cold start: import-time breakdown and time to first response.
+
+Usage:
+    python -m benchmarks.importtime
+    python -m benchmarks.importtime --top 30 --output benchmarks/results/cold.json
+
+Runs `python -X importtime -c "import main"` in a fresh interpreter and
+summarizes the slowest modules (cumulative and self time) and the cost per
+top-level package. It then starts uvicorn and measures how long the first
+response to `--path` takes, which is what a scaled-to-zero instance pays.
+"""
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import click
+import httpx
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+
+
+def parse_importtime(stderr: str) -> list[dict]:
+    """Parse `-X importtime` lines into {module, depth, self_us, cumulative_us}."""
+    entries = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_part, cumulative_us, name = line.split("|")
+        name = name.rstrip()
+        module = name.lstrip()
+        entries.append(
+            {
+                "module": module,
+                "depth": (len(name) - len(module) - 1) // 2,
+                "self_us": int(self_part.split(":")[1]),
+                "cumulative_us": int(cumulative_us),
+            }
+        )
+    return entries
+
+
+def summarize_imports(entries: list[dict], top: int) -> dict:
+    packages: dict[str, int] = defaultdict(int)
+    for entry in entries:
+        packages[entry["module"].split(".")[0]] += entry["self_us"]
+    total = next(
+        (e["cumulative_us"] for e in entries if e["module"] == "main"),
+        sum(e["self_us"] for e in entries),
+    )
+    return {
+        "total_ms": round(total / 1000, 1),
+        "modules": len(entries),
+        "by_cumulative": [
+            {"module": e["module"], "ms": round(e["cumulative_us"] / 1000, 1)}
+            for e in sorted(entries, key=lambda e: -e["cumulative_us"])[:top]
+        ],
+        "by_self": [
+            {"module": e["module"], "ms": round(e["self_us"] / 1000, 1)}
+            for e in sorted(entries, key=lambda e: -e["self_us"])[:top]
+        ],
+        "by_package": [
+            {"package": package, "ms": round(us / 1000, 1)}
+            for package, us in sorted(packages.items(), key=lambda kv: -kv[1])[:top]
+        ],
+    }
+
+
+def profile_imports(module: str = "main") -> list[dict]:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return parse_importtime(result.stderr)
+
+
+def time_to_first_response(path: str, timeout: float = 60) -> float:
+    """Seconds from spawning uvicorn to the first successful response."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    url = f"http://127.0.0.1:{port}{path}"
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        cwd=APP_DIR,
+        env={**os.environ, "MEMOIZATION_FLAG": "False"},
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                if httpx.get(url, timeout=1).status_code < 500:
+                    return time.perf_counter() - started
+            except httpx.TransportError:
+                time.sleep(0.02)
+        raise click.ClickException(f"No response from {url} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+@click.command()
+@click.option("--top", default=20, show_default=True)
+@click.option("--path", default="/docs", show_default=True, help="First request.")
+@click.option("--runs", default=3, show_default=True, help="Cold starts to time.")
+@click.option("--output", default=None, type=click.Path(), help="Write JSON here.")
+def main(top, path, runs, output):
+    """Prints an import-time summary of `import main` and cold-start latency."""
+    summary = summarize_imports(profile_imports(), top)
+    first_response = sorted(time_to_first_response(path) for _ in range(runs))
+    summary["time_to_first_response_ms"] = {
+        "path": path,
+        "min": round(first_response[0] * 1000, 1),
+        "median": round(first_response[len(first_response) // 2] * 1000, 1),
+    }
+
+    click.echo(f"import main: {summary['total_ms']} ms, {summary['modules']} modules")
+    click.echo(
+        f"time to first response ({path}): "
+        f"{summary['time_to_first_response_ms']['median']} ms (median of {runs})"
+    )
+    click.echo("\nslowest packages (self time):")
+    for row in summary["by_package"]:
+        click.echo(f"  {row['ms']:>8} ms  {row['package']}")
+    click.echo("\nslowest imports (cumulative):")
+    for row in summary["by_cumulative"]:
+        click.echo(f"  {row['ms']:>8} ms  {row['module']}")
+
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        Path(output).write_text(json.dumps(summary, indent=2))
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
@@ -0,0 +1,167 @@
+"""Compare the thread and process inference backends under concurrency.
+
+Usage:
+    PYTHONPATH=app python -m benchmarks.inference
+    PYTHONPATH=app python -m benchmarks.inference --trees 300 --concurrency 1,8,32
+
+Trains a synthetic random forest (kept as a plain sklearn model unless
+`--compiled`) into a temporary MODEL_PATH, then sends predictions the way the
+predict route does: through Starlette's thread pool, or through
+services.inference_pool. Besides prediction latency and throughput it reports
+event-loop lag, measured by a probe that sleeps 1 ms in a loop; GIL contention
+from in-process inference shows up there as slower request handling.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import time
+from pathlib import Path
+
+import click
+from fastapi.concurrency import run_in_threadpool
+
+from benchmarks.run import percentile, summarize
+
+N_FEATURES = 5
+
+
+def train_model(directory: str, trees: int, compiled: bool) -> None:
+    """Fit a random forest into `directory`, compiled to .npz if asked."""
+    import joblib
+    import numpy as np
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(5000, N_FEATURES))
+    labels = (features[:, 0] + features[:, 1] * features[:, 2] > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=trees, max_depth=12, random_state=0)
+    model.fit(features, labels)
+    joblib.dump(model, Path(directory) / "model.pkl")
+    if compiled:
+        from services.compiled_model import compile_model
+
+        compile_model(model).save(
+            str(Path(directory) / "model.npz"),
+            source=str(Path(directory) / "model.pkl"),
+        )
+
+
+async def _loop_lag(stop: asyncio.Event, samples: list[float]) -> None:
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(0.001)
+        samples.append(time.perf_counter() - started - 0.001)
+
+
+async def run_backend(predict, rows, requests: int, concurrency: int) -> dict:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies, errors = [], 0
+
+    async def one(i: int):
+        nonlocal errors
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                await predict(rows[i % len(rows)])
+            except Exception:
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - started)
+
+    stop, lag = asyncio.Event(), []
+    probe = asyncio.create_task(_loop_lag(stop, lag))
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await probe
+
+    summary = summarize(latencies, errors, elapsed)
+    lag_ms = sorted(v * 1000 for v in lag)
+    summary["loop_lag_p50_ms"] = round(percentile(lag_ms, 50), 3)
+    summary["loop_lag_p95_ms"] = round(percentile(lag_ms, 95), 3)
+    return summary
+
+
+async def run_all(requests: int, levels: list[int], workers: int) -> dict:
+    import numpy as np
+    from services.inference_pool import inference_pool
+    from services.predict import MachineLearningModelHandlerScore, load_joblib
+
+    def thread_predict(data):
+        return MachineLearningModelHandlerScore.predict(data, load_wrapper=load_joblib)
+
+    async def thread_backend(data):
+        return await run_in_threadpool(thread_predict, data)
+
+    rng = np.random.default_rng(1)
+    rows = [rng.normal(size=(1, N_FEATURES)) for _ in range(256)]
+    await thread_backend(rows[0])
+
+    inference_pool.start(workers)
+    try:
+        # Wait until every worker has loaded the model
+        await asyncio.gather(*(inference_pool.predict(rows[0]) for _ in range(workers)))
+        results = {}
+        for level in levels:
+            results[str(level)] = {
+                "thread": await run_backend(thread_backend, rows, requests, level),
+                "process": await run_backend(
+                    inference_pool.predict, rows, requests, level
+                ),
+            }
+        return results
+    finally:
+        inference_pool.shutdown()
+
+
+@click.command()
+@click.option("--requests", default=500, show_default=True, help="Per level.")
+@click.option("--concurrency", default="1,4,16", show_default=True)
+@click.option("--workers", default=os.cpu_count() or 2, show_default=True)
+@click.option("--trees", default=200, show_default=True)
+@click.option("--compiled", is_flag=True, help="Serve the compiled NumPy kernel.")
+@click.option("--output", default=None, type=click.Path(), help="Write JSON here.")
+def main(requests, concurrency, workers, trees, compiled, output):
+    """Prints latency, throughput and loop lag per backend and concurrency."""
+    levels = [int(level) for level in concurrency.split(",")]
+    with tempfile.TemporaryDirectory() as directory:
+        train_model(directory, trees, compiled)
+        # Spawned workers read the model location from the environment
+        os.environ.update(
+            MODEL_PATH=directory,
+            MODEL_NAME="model.pkl",
+            MODEL_COMPILE_FLAG=str(compiled),
+        )
+        import services.predict as predict
+
+        predict.MODEL_PATH, predict.MODEL_NAME = directory, "model.pkl"
+        predict.MODEL_COMPILE_FLAG = compiled
+        predict.MachineLearningModelHandlerScore.model = None
+        results = asyncio.run(run_all(requests, levels, workers))
+
+    click.echo(
+        f"{'concurrency':>11} {'backend':>8} {'rps':>9} {'p50_ms':>8} "
+        f"{'p95_ms':>8} {'lag_p95_ms':>10}"
+    )
+    for level, backends in results.items():
+        for backend, row in backends.items():
+            click.echo(
+                f"{level:>11} {backend:>8} {row['throughput_rps']:>9} "
+                f"{row['p50_ms']:>8} {row['p95_ms']:>8} {row['loop_lag_p95_ms']:>10}"
+            )
+
+    if output:
+        Path(output).parent.mkdir(parents=True, exist_ok=True)
+        report = {
+            "meta": {"workers": workers, "trees": trees, "compiled": compiled},
+            "levels": results,
+        }
+        Path(output).write_text(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
@@ -0,0 +1,101 @@
+"""Requests per second per core of POST /v1/predict, in process.
+
+Usage:
+    PYTHONPATH=app python -m benchmarks.predict_route
+    PYTHONPATH=app python -m benchmarks.predict_route --requests 20000 --model
+
+Calls the ASGI app directly from one event loop, one request at a time, so
+the number is what one worker process sustains on one core without network
+or client overhead: middleware, body parsing and validation, inference,
+response encoding and the drift update. Inference returns a constant unless
+`--model` serves MODEL_PATH; request log writes are skipped, since they are
+bound by the database rather than the core.
+"""
+
+import asyncio
+import json
+import time
+from pathlib import Path
+
+import click
+
+from benchmarks.run import PREDICT_PAYLOAD, summarize
+
+
+def _receive(body: bytes):
+    async def receive():
+        return {"type": "http.request", "body": body, "more_body": False}
+
+    return receive
+
+
+async def call(app, path: str, body: bytes) -> int:
+    """Status of one POST `path` with a JSON `body`."""
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "POST",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": b"",
+        "headers": [
+            (b"host", b"bench"),
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+        ],
+        "client": ("127.0.0.1", 0),
+        "server": ("bench", 80),
+    }
+    status = 0
+
+    async def send(message):
+        nonlocal status
+        if message["type"] == "http.response.start":
+            status = message["status"]
+
+    await app(scope, _receive(body), send)
+    return status
+
+
+async def run(app, requests: int, warmup: int = 200) -> dict:
+    body = json.dumps(PREDICT_PAYLOAD).encode()
+    for _ in range(warmup):
+        await call(app, "/api/v1/predict", body)
+
+    latencies, errors = [], 0
+    started = time.perf_counter()
+    for _ in range(requests):
+        sent = time.perf_counter()
+        if await call(app, "/api/v1/predict", body) == 200:
+            latencies.append(time.perf_counter() - sent)
+        else:
+            errors += 1
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+@click.command()
+@click.option("--requests", default=5000, show_default=True)
+@click.option("--model", is_flag=True, help="Serve MODEL_PATH instead of a stub.")
+@click.option("--output", default=None, type=click.Path(), help="Write JSON here.")
+def main(requests, model, output):
+    """Prints latency percentiles and requests/sec of one core."""
+    import api.routes.predictor as predictor
+    from main import app
+
+    if not model:
+        predictor.get_prediction = lambda data_point: [1.0]
+    predictor.write_request_logs = lambda rows: None
+
+    summary = asyncio.run(run(app, requests))
+    text = json.dumps(summary, indent=2)
+    click.echo(text)
+    if output:
+        Path(output).write_text(text)
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
@@ -0,0 +1,821 @@
+"""Measure throughput and latency percentiles for every API route.
+
+Usage:
+    PYTHONPATH=app python -m benchmarks.run --output benchmarks/results/head.json
+    PYTHONPATH=app python -m benchmarks.run --server --concurrency 32
+    PYTHONPATH=app python -m benchmarks.run --base-url http://localhost:8080
+
+By default requests go through an in-process ASGI transport, which isolates
+application cost from network and server overhead. `--server` starts a real
+uvicorn process instead and `--base-url` targets one that is already running.
+Seed the database first (see benchmarks.seed) so routes run against realistic
+volumes. Compare two reports with benchmarks.compare.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+from uuid import uuid4
+
+import click
+import httpx
+from core import config
+from core.security import create_access_token
+from db.models.category import Category
+from db.models.contact import ContactMessage
+from db.models.lab_notes import LabNote
+from db.models.log import RequestLog
+from db.models.projects import Project
+from db.session import SessionLocal
+from loguru import logger
+from sqlalchemy import delete, func, select
+
+from benchmarks.seed import SLUG_PREFIX, WORDS
+
+RUN_PREFIX = f"{SLUG_PREFIX}run-"
+SAMPLE_SIZE = 200
+PREDICT_PAYLOAD = {
+    "feature1": 0.5,
+    "feature2": -1.2,
+    "feature3": 3.3,
+    "feature4": 0.0,
+    "feature5": 1.7,
+}
+# Routes that need external services and are left out of the run
+SKIPPED = {
+    "POST /v1/admin/upload/image": "requires R2 object storage",
+    "POST /v1/admin/upload/image/presign": "requires R2 object storage",
+    "POST /v1/admin/upload/image/complete": "requires R2 object storage",
+    "DELETE /v1/admin/upload/image": "requires R2 object storage",
+    "POST /v1/admin/upload/image/batch-delete": "requires R2 object storage",
+}
+
+
+@dataclass
+class Scenario:
+    """One route under test.
+
+    `build(i, ctx)` returns the concrete path and httpx request kwargs for the
+    i-th request; `setup(ctx, n)` prepares anything the n requests consume
+    (e.g. rows to delete) and `teardown(ctx)` removes what the run created.
+    """
+
+    method: str
+    route: str
+    build: Callable[[int, dict], tuple[str, dict]]
+    admin: bool = False
+    expected: tuple[int, ...] = (200, 201, 204)
+    setup: Optional[Callable[[dict, int], None]] = None
+    teardown: Optional[Callable[[dict], None]] = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.method} {self.route}"
+
+    @property
+    def read_only(self) -> bool:
+        return self.method == "GET"
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Nearest-rank percentile of an ascending list (q in [0, 100])."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * q // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    """Latency percentiles in milliseconds plus throughput for one scenario."""
+    values = sorted(latencies)
+    ms = [v * 1000 for v in values]
+    return {
+        "requests": len(values),
+        "errors": errors,
+        "throughput_rps": round(len(values) / elapsed, 2) if elapsed else 0.0,
+        "mean_ms": round(sum(ms) / len(ms), 3) if ms else 0.0,
+        "p50_ms": round(percentile(ms, 50), 3),
+        "p95_ms": round(percentile(ms, 95), 3),
+        "p99_ms": round(percentile(ms, 99), 3),
+        "max_ms": round(ms[-1], 3) if ms else 0.0,
+    }
+
+
+# ============================================================================
+# Fixtures
+# ============================================================================
+
+
+def load_context() -> dict:
+    """Sample ids and slugs of seeded rows for parameterized routes."""
+    with SessionLocal() as db:
+        projects = db.execute(
+            select(Project.id, Project.slug)
+            .where(Project.published)
+            .order_by(Project.order)
+            .limit(SAMPLE_SIZE)
+        ).all()
+        notes = db.execute(
+            select(LabNote.id, LabNote.slug)
+            .where(LabNote.published)
+            .order_by(LabNote.date.desc())
+            .limit(SAMPLE_SIZE)
+        ).all()
+        categories = db.execute(select(Category.id).order_by(Category.order)).all()
+    if not projects or not notes or not categories:
+        raise click.ClickException("No data to benchmark, run benchmarks.seed first")
+    return {
+        "project_ids": [str(p.id) for p in projects],
+        "project_slugs": [p.slug for p in projects],
+        "note_ids": [str(n.id) for n in notes],
+        "note_slugs": [n.slug for n in notes],
+        "category_ids": [str(c.id) for c in categories],
+        "created": {},
+    }
+
+
+def dataset_counts() -> dict:
+    with SessionLocal() as db:
+        return {
+            model.__tablename__: db.scalar(select(func.count()).select_from(model))
+            for model in (Category, Project, LabNote, RequestLog, ContactMessage)
+        }
+
+
+def _pick(ctx: dict, key: str, i: int) -> str:
+    values = ctx[key]
+    return values[i % len(values)]
+
+
+def _create_rows(ctx: dict, key: str, rows: list) -> None:
+    with SessionLocal() as db:
+        db.add_all(rows)
+        db.commit()
+        ctx["created"][key] = [str(row.id) for row in rows]
+
+
+def _cleanup(model, column):
+    def teardown(ctx: dict) -> None:
+        with SessionLocal() as db:
+            db.execute(delete(model).where(column.startswith(RUN_PREFIX)))
+            db.commit()
+
+    return teardown
+
+
+def _project_payload(i: int, ctx: dict) -> dict:
+    return {
+        "slug": f"{RUN_PREFIX}project-{i}-{uuid4().hex[:8]}",
+        "title": f"Benchmark project {i}",
+        "description": " ".join(WORDS),
+        "tags": ["python", "performance"],
+        "categoryId": _pick(ctx, "category_ids", i),
+        "year": "2024",
+        "featured": False,
+        "order": 0,
+        "published": False,
+    }
+
+
+def _note_payload(i: int) -> dict:
+    body = "\n\n".join(
+        f"## Section {k}\n\n" + " ".join(WORDS) + "\n\n```python\nx = 1\n```"
+        for k in range(8)
+    )
+    return {
+        "slug": f"{RUN_PREFIX}note-{i}-{uuid4().hex[:8]}",
+        "title": f"Benchmark note {i}",
+        "excerpt": "Benchmark excerpt",
+        "content": body,
+        "tags": ["performance"],
+        "date": "2024-01-01",
+        "published": False,
+    }
+
+
+def _setup_categories(ctx: dict, n: int) -> None:
+    _create_rows(
+        ctx,
+        "categories",
+        [
+            Category(name=f"{RUN_PREFIX}cat-{uuid4().hex[:12]}", label="Delete me")
+            for _ in range(n)
+        ],
+    )
+
+
+def _setup_projects(ctx: dict, n: int) -> None:
+    _create_rows(
+        ctx,
+        "projects",
+        [
+            Project(
+                slug=f"{RUN_PREFIX}project-{uuid4().hex}",
+                title="Delete me",
+                description="Delete me",
+                tags=[],
+                category_id=ctx["category_ids"][0],
+                year="2024",
+            )
+            for _ in range(n)
+        ],
+    )
+
+
+def _setup_notes(ctx: dict, n: int) -> None:
+    _create_rows(
+        ctx,
+        "notes",
+        [
+            LabNote(
+                slug=f"{RUN_PREFIX}note-{uuid4().hex}",
+                title="Delete me",
+                excerpt="Delete me",
+                content="Delete me",
+                tags=[],
+                read_time="1 min read",
+                date=date(2024, 1, 1),
+            )
+            for _ in range(n)
+        ],
+    )
+
+
+def _setup_contacts(ctx: dict, n: int) -> None:
+    _create_rows(
+        ctx,
+        "contacts",
+        [
+            ContactMessage(
+                name=f"{RUN_PREFIX}contact",
+                email="bench@example.com",
+                subject="Benchmark",
+                message="Benchmark message",
+            )
+            for _ in range(n)
+        ],
+    )
+
+
+def _created(ctx: dict, key: str, i: int) -> str:
+    return ctx["created"][key][i]
+
+
+def _reorder_payload(ctx: dict, ids_key: str) -> dict:
+    """Reassign the current order of the first 50 sampled rows."""
+    ids = ctx[ids_key][:50]
+    return {"orders": [{"id": id, "order": n} for n, id in enumerate(ids)]}
+
+
+def build_scenarios() -> list[Scenario]:
+    """Every route in api/routes except the ones listed in SKIPPED."""
+    login_password = os.environ.get("BENCH_ADMIN_PASSWORD", "")
+
+    return [
+        # Predictor
+        Scenario("GET", "/v1/health", lambda i, ctx: ("/v1/health", {})),
+        Scenario(
+            "POST",
+            "/v1/predict",
+            lambda i, ctx: ("/v1/predict", {"json": PREDICT_PAYLOAD}),
+        ),
+        # Keys of the feature table at FEATURE_STORE_PATH, misses included
+        Scenario(
+            "POST",
+            "/v1/predict/by-key",
+            lambda i, ctx: ("/v1/predict/by-key", {"json": {"key": str(i % 1000)}}),
+        ),
+        Scenario(
+            "POST",
+            "/v1/predict/by-key/batch",
+            lambda i, ctx: (
+                "/v1/predict/by-key/batch",
+                {"json": {"keys": [str((i * 100 + k) % 1000) for k in range(100)]}},
+            ),
+        ),
+        # 100 rows per call
+        Scenario(
+            "POST",
+            "/v1/predict/batch",
+            lambda i, ctx: (
+                "/v1/predict/batch",
+                {"json": {"features": [list(PREDICT_PAYLOAD.values())] * 100}},
+            ),
+        ),
+        # Auth: bcrypt-bound; a wrong password still pays for the hash check
+        Scenario(
+            "POST",
+            "/v1/auth/login",
+            lambda i, ctx: (
+                "/v1/auth/login",
+                {
+                    "json": {
+                        "username": config.ADMIN_USERNAME or "admin",
+                        "password": login_password,
+                    }
+                },
+            ),
+            expected=(200, 401),
+        ),
+        # Categories
+        Scenario("GET", "/v1/categories", lambda i, ctx: ("/v1/categories", {})),
+        Scenario(
+            "GET",
+            "/v1/categories?include_counts",
+            lambda i, ctx: ("/v1/categories", {"params": {"include_counts": True}}),
+        ),
+        Scenario(
+            "GET",
+            "/v1/categories/{id}",
+            lambda i, ctx: (f"/v1/categories/{_pick(ctx, 'category_ids', i)}", {}),
+        ),
+        Scenario(
+            "GET",
+            "/v1/admin/categories",
+            lambda i, ctx: ("/v1/admin/categories", {}),
+            admin=True,
+        ),
+        Scenario(
+            "POST",
+            "/v1/admin/categories",
+            lambda i, ctx: (
+                "/v1/admin/categories",
+                {
+                    "json": {
+                        "name": f"{RUN_PREFIX}cat-{uuid4().hex[:12]}",
+                        "label": "Benchmark",
+                    }
+                },
+            ),
+            admin=True,
+            teardown=_cleanup(Category, Category.name),
+        ),
+        Scenario(
+            "PUT",
+            "/v1/admin/categories/{id}",
+            lambda i, ctx: (
+                f"/v1/admin/categories/{_pick(ctx, 'category_ids', i)}",
+                {"json": {"description": f"Benchmark update {i}"}},
+            ),
+            admin=True,
+        ),
+        Scenario(
+            "DELETE",
+            "/v1/admin/categories/{id}",
+            lambda i, ctx: (
+                f"/v1/admin/categories/{_created(ctx, 'categories', i)}",
+                {},
+            ),
+            admin=True,
+            setup=_setup_categories,
+            teardown=_cleanup(Category, Category.name),
+        ),
+        Scenario(
+            "PATCH",
+            "/v1/admin/categories/reorder",
+            lambda i, ctx: (
+                "/v1/admin/categories/reorder",
+                {"json": _reorder_payload(ctx, "category_ids")},
+            ),
+            admin=True,
+        ),
+        # Projects
+        Scenario("GET", "/v1/projects", lambda i, ctx: ("/v1/projects", {})),
+        Scenario(
+            "GET",
+            "/v1/projects?category_id",
+            lambda i, ctx: (
+                "/v1/projects",
+                {"params": {"category_id": _pick(ctx, "category_ids", i)}},
+            ),
+        ),
+        Scenario(
+            "GET",
+            "/v1/projects/{slug}",
+            lambda i, ctx: (f"/v1/projects/{_pick(ctx, 'project_slugs', i)}", {}),
+        ),
+        Scenario(
+            "GET",
+            "/v1/admin/projects",
+            lambda i, ctx: ("/v1/admin/projects", {}),
+            admin=True,
+        ),
+        Scenario(
+            "GET",
+            "/v1/admin/projects/{id}",
+            lambda i, ctx: (f"/v1/admin/projects/{_pick(ctx, 'project_ids', i)}", {}),
+            admin=True,
+        ),
+        Scenario(
+            "POST",
+            "/v1/admin/projects",
+            lambda i, ctx: ("/v1/admin/projects", {"json": _project_payload(i, ctx)}),
+            admin=True,
+            teardown=_cleanup(Project, Project.slug),
+        ),
+        Scenario(
+            "PUT",
+            "/v1/admin/projects/{id}",
+            lambda i, ctx: (
+                f"/v1/admin/projects/{_pick(ctx, 'project_ids', i)}",
+                {"json": {"metrics": f"Benchmark update {i}"}},
+            ),
+            admin=True,
+        ),
+        Scenario(
+            "DELETE",
+            "/v1/admin/projects/{id}",
+            lambda i, ctx: (f"/v1/admin/projects/{_created(ctx, 'projects', i)}", {}),
+            admin=True,
+            setup=_setup_projects,
+            teardown=_cleanup(Project, Project.slug),
+        ),
+        Scenario(
+            "PATCH",
+            "/v1/admin/projects/reorder",
+            lambda i, ctx: (
+                "/v1/admin/projects/reorder",
+                {"json": _reorder_payload(ctx, "project_ids")},
+            ),
+            admin=True,
+        ),
+        # Lab notes
+        Scenario("GET", "/v1/lab-notes", lambda i, ctx: ("/v1/lab-notes", {})),
+        Scenario(
+            "GET", "/v1/lab-notes/tags", lambda i, ctx: ("/v1/lab-notes/tags", {})
+        ),
+        Scenario(
+            "GET",
+            "/v1/lab-notes/{slug}",
+            lambda i, ctx: (f"/v1/lab-notes/{_pick(ctx, 'note_slugs', i)}", {}),
+        ),
+        Scenario(
+            "GET",
+            "/v1/admin/lab-notes",
+            lambda i, ctx: ("/v1/admin/lab-notes", {}),
+            admin=True,
+        ),
+        Scenario(
+            "GET",
+            "/v1/admin/lab-notes/{id}",
+            lambda i, ctx: (f"/v1/admin/lab-notes/{_pick(ctx, 'note_ids', i)}", {}),
+            admin=True,
+        ),
+        Scenario(
+            "POST",
+            "/v1/admin/lab-notes",
+            lambda i, ctx: ("/v1/admin/lab-notes", {"json": _note_payload(i)}),
+            admin=True,
+            teardown=_cleanup(LabNote, LabNote.slug),
+        ),
+        Scenario(
+            "PUT",
+            "/v1/admin/lab-notes/{id}",
+            lambda i, ctx: (
+                f"/v1/admin/lab-notes/{_pick(ctx, 'note_ids', i)}",
+                {"json": {"excerpt": f"Benchmark update {i}"}},
+            ),
+            admin=True,
+        ),
+        Scenario(
+            "DELETE",
+            "/v1/admin/lab-notes/{id}",
+            lambda i, ctx: (f"/v1/admin/lab-notes/{_created(ctx, 'notes', i)}", {}),
+            admin=True,
+            setup=_setup_notes,
+            teardown=_cleanup(LabNote, LabNote.slug),
+        ),
+        # Search
+        Scenario(
+            "GET",
+            "/v1/search",
+            lambda i, ctx: ("/v1/search", {"params": {"q": WORDS[i % len(WORDS)]}}),
+        ),
+        Scenario(
+            "GET",
+            "/v1/suggest",
+            lambda i, ctx: (
+                "/v1/suggest",
+                {"params": {"q": WORDS[i % len(WORDS)][:3]}},
+            ),
+        ),
+        # Contact
+        Scenario(
+            "POST",
+            "/v1/contact",
+            lambda i, ctx: (
+                "/v1/contact",
+                {
+                    "json": {
+                        "name": f"{RUN_PREFIX}contact",
+                        "email": "bench@example.com",
+                        "subject": "Benchmark run",
+                        "message": "Benchmark contact message",
+                    }
+                },
+            ),
+            teardown=_cleanup(ContactMessage, ContactMessage.name),
+        ),
+        Scenario("GET", "/v1/contact", lambda i, ctx: ("/v1/contact", {}), admin=True),
+        Scenario(
+            "PATCH",
+            "/v1/contact/{id}",
+            lambda i, ctx: (
+                f"/v1/contact/{_created(ctx, 'contacts', i)}",
+                {"json": {"read": True}},
+            ),
+            admin=True,
+            setup=_setup_contacts,
+            teardown=_cleanup(ContactMessage, ContactMessage.name),
+        ),
+        Scenario(
+            "DELETE",
+            "/v1/contact/{id}",
+            lambda i, ctx: (f"/v1/contact/{_created(ctx, 'contacts', i)}", {}),
+            admin=True,
+            setup=_setup_contacts,
+            teardown=_cleanup(ContactMessage, ContactMessage.name),
+        ),
+        # Debug
+        Scenario(
+            "GET",
+            "/v1/admin/debug/sql-profiles",
+            lambda i, ctx: ("/v1/admin/debug/sql-profiles", {}),
+            admin=True,
+            expected=(200, 404),
+        ),
+        # Request logs: about an hour of the seeded 60 days
+        Scenario(
+            "GET",
+            "/v1/admin/request-logs/export",
+            lambda i, ctx: (
+                "/v1/admin/request-logs/export",
+                {
+                    "params": {
+                        "start": (
+                            datetime.now(timezone.utc) - timedelta(hours=1 + i % 24)
+                        ).isoformat(),
+                        "end": (
+                            datetime.now(timezone.utc) - timedelta(hours=i % 24)
+                        ).isoformat(),
+                    }
+                },
+            ),
+            admin=True,
+        ),
+        Scenario(
+            "GET",
+            "/v1/admin/drift",
+            lambda i, ctx: ("/v1/admin/drift", {}),
+            admin=True,
+        ),
+    ]
+
+
+def uncovered_routes(app, scenarios: list[Scenario]) -> list[str]:
+    """API routes with neither a scenario nor a SKIPPED entry."""
+    covered = {s.name.split("?")[0] for s in scenarios} | set(SKIPPED)
+    uncovered = []
+    for route in app.routes:
+        path = getattr(route, "path", "")
+        if not path.startswith(config.API_PREFIX):
+            continue
+        for method in sorted(getattr(route, "methods", ()) or ()):
+            name = f"{method} {path[len(config.API_PREFIX) :]}"
+            if name not in covered:
+                uncovered.append(name)
+    return uncovered
+
+
+# ============================================================================
+# Runner
+# ============================================================================
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: dict,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict:
+    headers = {"Authorization": f"Bearer {ctx['token']}"} if scenario.admin else {}
+    latencies: list[float] = []
+    errors = 0
+
+    async def send(i: int) -> None:
+        nonlocal errors
+        path, kwargs = scenario.build(i, ctx)
+        start = time.perf_counter()
+        response = await client.request(
+            scenario.method, path, headers=headers, **kwargs
+        )
+        latencies.append(time.perf_counter() - start)
+        if response.status_code not in scenario.expected:
+            errors += 1
+
+    if scenario.read_only:
+        for i in range(warmup):
+            await send(i)
+        latencies.clear()
+        errors = 0
+
+    indexes = itertools.count()
+
+    async def worker() -> None:
+        while (i := next(indexes)) < requests:
+            await send(i)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def run_all(
+    client: httpx.AsyncClient,
+    scenarios: list[Scenario],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict:
+    ctx = load_context()
+    ctx["token"] = create_access_token(
+        {"sub": config.ADMIN_USERNAME}, str(config.SECRET_KEY)
+    )
+    results = {}
+    for scenario in scenarios:
+        if scenario.setup:
+            scenario.setup(ctx, requests)
+        try:
+            results[scenario.name] = await run_scenario(
+                client, scenario, ctx, requests, concurrency, warmup
+            )
+        finally:
+            if scenario.teardown:
+                scenario.teardown(ctx)
+        logger.info(
+            f"{scenario.name}: p50={results[scenario.name]['p50_ms']}ms "
+            f"p99={results[scenario.name]['p99_ms']}ms "
+            f"errors={results[scenario.name]['errors']}"
+        )
+    return results
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(workers: int) -> tuple[subprocess.Popen, str]:
+    """Start uvicorn on a free port and wait until it answers."""
+    port = _free_port()
+    app_dir = Path(__file__).resolve().parent.parent / "app"
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "main:app",
+            "--app-dir",
+            str(app_dir),
+            "--port",
+            str(port),
+            "--workers",
+            str(workers),
+            "--log-level",
+            "warning",
+        ],
+    )
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        try:
+            httpx.get(f"{base_url}{config.API_PREFIX}/v1/categories", timeout=1)
+            return process, base_url
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise click.ClickException("uvicorn did not start within 60s")
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+async def benchmark(
+    requests: int,
+    concurrency: int,
+    warmup: int,
+    server: bool = False,
+    base_url: Optional[str] = None,
+    workers: int = 1,
+    only: tuple[str, ...] = (),
+) -> dict:
+    from main import get_application
+
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    app = get_application()
+    scenarios = build_scenarios()
+    uncovered = uncovered_routes(app, scenarios)
+    for name in uncovered:
+        logger.warning(f"No benchmark scenario for {name}")
+    if only:
+        scenarios = [s for s in scenarios if any(o in s.name for o in only)]
+
+    process = None
+    if server:
+        process, base_url = start_server(workers)
+    mode = "external" if base_url and not server else "uvicorn" if server else "asgi"
+    try:
+        if base_url:
+            async with httpx.AsyncClient(
+                base_url=f"{base_url}{config.API_PREFIX}", timeout=60
+            ) as client:
+                results = await run_all(
+                    client, scenarios, requests, concurrency, warmup
+                )
+        else:
+            # Unhandled exceptions become 500s, as they would behind uvicorn
+            transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+            async with (
+                app.router.lifespan_context(app),
+                httpx.AsyncClient(
+                    transport=transport,
+                    base_url=f"http://benchmark{config.API_PREFIX}",
+                    timeout=60,
+                ) as client,
+            ):
+                results = await run_all(
+                    client, scenarios, requests, concurrency, warmup
+                )
+    finally:
+        if process:
+            process.terminate()
+            process.wait()
+
+    return {
+        "meta": {
+            "commit": _git_commit(),
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "mode": mode,
+            "requests": requests,
+            "concurrency": concurrency,
+            "warmup": warmup,
+            "python": platform.python_version(),
+            "dataset": dataset_counts(),
+        },
+        "routes": results,
+        "skipped": SKIPPED,
+        "uncovered": uncovered,
+    }
+
+
+@click.command()
+@click.option("--requests", default=200, show_default=True, help="Per route.")
+@click.option("--concurrency", default=8, show_default=True)
+@click.option("--warmup", default=10, show_default=True, help="GET routes only.")
+@click.option("--server", is_flag=True, help="Run against a uvicorn subprocess.")
+@click.option("--workers", default=1, show_default=True, help="With --server.")
+@click.option("--base-url", default=None, help="Run against a running server.")
+@click.option("--only", multiple=True, help="Substring filter on route names.")
+@click.option(
+    "--output",
+    default="benchmarks/results/latest.json",
+    show_default=True,
+    type=click.Path(),
+)
+def main(requests, concurrency, warmup, server, workers, base_url, only, output):
+    """Benchmarks every API route and writes a JSON report to OUTPUT."""
+    report = asyncio.run(
+        benchmark(requests, concurrency, warmup, server, base_url, workers, only)
+    )
+    path = Path(output)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2, sort_keys=True))
+    logger.info(f"Report written to {path}")
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
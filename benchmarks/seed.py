@@ -0,0 +1,267 @@
+"""Seed a benchmark database with synthetic projects, lab notes and request logs.
+
+Usage:
+    PYTHONPATH=app python -m benchmarks.seed --projects 10000 --lab-notes 50000 \
+        --request-logs 1000000
+
+Run it against a dedicated database. Each run first removes the rows earlier
+runs seeded or the benchmark created (slugs and names starting with
+SLUG_PREFIX, request logs and rollups of SEED_MODEL_VERSION) and leaves every
+other row alone. Generation is
+deterministic for a given `--seed`, so reports from different commits are
+measured on the same data (request log timestamps are relative to the run).
+"""
+
+import random
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import click
+from db.models.category import Category
+from db.models.contact import ContactMessage
+from db.models.lab_notes import LabNote
+from db.models.log import RequestLog, RequestLogHourly
+from db.models.projects import Project
+from db.request_logs import create_partitions
+from db.session import Base, SessionLocal, engine
+from loguru import logger
+from services.render import render_lab_note
+from sqlalchemy import delete, insert
+
+SLUG_PREFIX = "bench-"
+# model_version of seeded request logs, so a reseed removes only those
+SEED_MODEL_VERSION = "bench"
+BATCH_SIZE = 5000
+# Distinct rendered bodies; notes reuse them so seeding stays fast
+CONTENT_VARIANTS = 64
+REQUEST_LOG_DAYS = 60
+
+_VOCABULARY = """
+model data latency cache index query vector search stream batch feature
+pipeline inference training gradient tensor kernel schema partition cluster
+replica shard buffer queue worker thread process memory throughput benchmark
+profile trace metric histogram regression forest boosting linear logistic
+embedding token parser compiler runtime postgres python fastapi docker deploy
+release portfolio notebook
+"""
+_TAGS = """
+python machine-learning databases performance web devops statistics
+visualization rust frontend backend research
+"""
+WORDS = _VOCABULARY.split()
+TAGS = _TAGS.split()
+
+
+def sentence(rng: random.Random, words: int) -> str:
+    text = " ".join(rng.choice(WORDS) for _ in range(words))
+    return text.capitalize() + "."
+
+
+def paragraph(rng: random.Random) -> str:
+    return " ".join(sentence(rng, rng.randint(8, 20)) for _ in range(rng.randint(3, 7)))
+
+
+def markdown_body(rng: random.Random) -> str:
+    """A note of roughly 1-4k words with headings, code, lists and math."""
+    sections = []
+    for _ in range(rng.randint(4, 10)):
+        sections.append(f"## {sentence(rng, 4)[:-1]}")
+        sections.extend(paragraph(rng) for _ in range(rng.randint(2, 6)))
+        if rng.random() < 0.5:
+            sections.append(
+                "```python\n"
+                + "\n".join(
+                    f"{rng.choice(WORDS)}_{i} = compute({rng.randint(0, 99)})"
+                    for i in range(rng.randint(3, 15))
+                )
+                + "\n```"
+            )
+        if rng.random() < 0.3:
+            sections.append("\n".join(f"- {sentence(rng, 6)}" for _ in range(4)))
+        if rng.random() < 0.2:
+            sections.append("$$\\sum_{i=1}^{n} x_i^2$$")
+    return "\n\n".join(sections)
+
+
+def category_rows(count: int) -> list[dict]:
+    return [
+        {
+            "id": uuid4(),
+            "name": f"{SLUG_PREFIX}category-{i}",
+            "label": f"Benchmark category {i}",
+            "description": f"Seeded category {i}",
+            "order": i,
+        }
+        for i in range(count)
+    ]
+
+
+def project_rows(
+    rng: random.Random, start: int, count: int, category_ids: list
+) -> list[dict]:
+    return [
+        {
+            "id": uuid4(),
+            "slug": f"{SLUG_PREFIX}project-{i}",
+            "title": sentence(rng, rng.randint(2, 6))[:-1],
+            "description": paragraph(rng),
+            "tags": rng.sample(TAGS, rng.randint(1, 4)),
+            "category_id": rng.choice(category_ids),
+            "year": str(rng.randint(2015, 2025)),
+            "cover_image": f"https://images.example.com/{i}.webp",
+            "link": f"https://example.com/projects/{i}",
+            "github": f"https://github.com/example/project-{i}",
+            "featured": rng.random() < 0.05,
+            "order": i,
+            "published": rng.random() < 0.9,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+def content_variants(rng: random.Random, count: int) -> list[tuple[str, dict]]:
+    variants = []
+    for _ in range(count):
+        content = markdown_body(rng)
+        variants.append((content, render_lab_note(content)))
+    return variants
+
+
+def lab_note_rows(
+    rng: random.Random, start: int, count: int, variants: list
+) -> list[dict]:
+    first_date = date(2018, 1, 1)
+    rows = []
+    for i in range(start, start + count):
+        content, rendered = variants[i % len(variants)]
+        rows.append(
+            {
+                "id": uuid4(),
+                "slug": f"{SLUG_PREFIX}note-{i}",
+                "title": sentence(rng, rng.randint(3, 8))[:-1],
+                "excerpt": sentence(rng, 25),
+                "content": content,
+                "content_html": rendered["html"],
+                "toc": rendered["toc"],
+                "tags": rng.sample(TAGS, rng.randint(1, 4)),
+                "read_time": rendered["read_time"],
+                "date": first_date + timedelta(days=i % 3000),
+                "published": rng.random() < 0.9,
+            }
+        )
+    return rows
+
+
+def request_log_rows(rng: random.Random, count: int, now: datetime) -> list[dict]:
+    """Predictions spread over the last REQUEST_LOG_DAYS days."""
+    rows = []
+    for _ in range(count):
+        prediction = float(rng.random() < 0.5)
+        rows.append(
+            {
+                "created_at": now
+                - timedelta(seconds=rng.uniform(0, REQUEST_LOG_DAYS * 86400)),
+                "model_version": SEED_MODEL_VERSION,
+                "latency_ms": round(rng.lognormvariate(0, 0.5), 3),
+                **{f"feature{k}": round(rng.uniform(-3, 3), 4) for k in range(1, 6)},
+                "prediction": prediction,
+                "prediction_label": "label ok" if prediction == 1 else "label nok",
+            }
+        )
+    return rows
+
+
+def insert_batches(db, model, rows_factory, total: int) -> None:
+    """Insert `total` rows, generating and sending them BATCH_SIZE at a time."""
+    done = 0
+    while done < total:
+        size = min(BATCH_SIZE, total - done)
+        db.execute(insert(model), rows_factory(done, size))
+        db.commit()
+        done += size
+        logger.info(f"{model.__tablename__}: {done}/{total}")
+
+
+def reset(db) -> None:
+    db.execute(delete(Project).where(Project.slug.startswith(SLUG_PREFIX)))
+    db.execute(delete(LabNote).where(LabNote.slug.startswith(SLUG_PREFIX)))
+    db.execute(delete(Category).where(Category.name.startswith(SLUG_PREFIX)))
+    db.execute(delete(RequestLog).where(RequestLog.model_version == SEED_MODEL_VERSION))
+    db.execute(
+        delete(RequestLogHourly).where(
+            RequestLogHourly.model_version == SEED_MODEL_VERSION
+        )
+    )
+    db.execute(
+        delete(ContactMessage).where(ContactMessage.name.startswith(SLUG_PREFIX))
+    )
+    db.commit()
+
+
+def seed(
+    projects: int,
+    lab_notes: int,
+    request_logs: int,
+    categories: int = 8,
+    seed_value: int = 42,
+) -> dict:
+    rng = random.Random(seed_value)
+    Base.metadata.create_all(bind=engine)
+    with SessionLocal() as db:
+        reset(db)
+
+        cats = category_rows(categories)
+        db.execute(insert(Category), cats)
+        db.commit()
+        category_ids = [c["id"] for c in cats]
+
+        variants = content_variants(rng, min(lab_notes, CONTENT_VARIANTS))
+
+        insert_batches(
+            db,
+            Project,
+            lambda start, n: project_rows(rng, start, n, category_ids),
+            projects,
+        )
+        insert_batches(
+            db,
+            LabNote,
+            lambda start, n: lab_note_rows(rng, start, n, variants),
+            lab_notes,
+        )
+        # Partitions first: rows for a month without one land in the default
+        # partition, which then blocks creating that month's partition
+        now = datetime.now(timezone.utc)
+        oldest = (now - timedelta(days=REQUEST_LOG_DAYS)).date()
+        create_partitions(db, oldest, months=REQUEST_LOG_DAYS // 28 + 2)
+        insert_batches(
+            db,
+            RequestLog,
+            lambda start, n: request_log_rows(rng, n, now),
+            request_logs,
+        )
+
+    return {
+        "categories": categories,
+        "projects": projects,
+        "lab_notes": lab_notes,
+        "request_logs": request_logs,
+        "seed": seed_value,
+    }
+
+
+@click.command()
+@click.option("--projects", default=10_000, show_default=True)
+@click.option("--lab-notes", default=50_000, show_default=True)
+@click.option("--request-logs", default=1_000_000, show_default=True)
+@click.option("--categories", default=8, show_default=True)
+@click.option("--seed", "seed_value", default=42, show_default=True)
+def main(projects, lab_notes, request_logs, categories, seed_value):
+    """Replaces previously seeded benchmark data with a fresh dataset."""
+    counts = seed(projects, lab_notes, request_logs, categories, seed_value)
+    logger.info(f"Seeded {counts}")
+
+
+if __name__ == "__main__":
+    # pylint: disable = no-value-for-parameter
+    main()
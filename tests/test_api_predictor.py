@@ -1,4 +1,5 @@
 import json
+from types import SimpleNamespace
 
 import api.routes.predictor as predictor
 import pytest
@@ -38,6 +39,28 @@ async def test_predict_endpoint_success(monkeypatch):
     assert resp.prediction_label == "label ok"
 
 
+@pytest.mark.anyio
+async def test_predict_uses_model_precision(monkeypatch):
+    import numpy as np
+    from sklearn.linear_model import LogisticRegression
+
+    seen = []
+    monkeypatch.setattr(
+        predictor, "get_prediction", lambda data: seen.append(data) or [0]
+    )
+    compiled = SimpleNamespace(dtype=np.dtype("float32"))
+    monkeypatch.setattr(predictor.MLModel, "model", compiled)
+    await predictor.predict(predictor.MachineLearningDataInput(**sample_payload()))
+    assert seen[0].dtype == "float32"
+    assert seen[0].tolist() == [[1.0, 2.0, 3.0, 4.0, 5.0]]
+
+    # A model that fell back to sklearn gets float64 inputs, whatever
+    # MODEL_PRECISION says
+    monkeypatch.setattr(predictor.MLModel, "model", LogisticRegression())
+    await predictor.predict(predictor.MachineLearningDataInput(**sample_payload()))
+    assert seen[1].dtype == "float64"
+
+
 def test_predict_endpoint_exception(client, monkeypatch):
     def raise_error(data):
         raise ValueError("fail")
@@ -0,0 +1,158 @@
+import io
+import json
+
+import numpy as np
+import pyarrow as pa
+import pytest
+from api.routes import predictor
+from core.errors import PayloadException
+from fastapi.testclient import TestClient
+from main import app
+from services import batch_codec
+
+client = TestClient(app)
+
+FEATURES = [f"feature{k}" for k in range(1, 6)]
+MATRIX = np.arange(20, dtype=np.float64).reshape(4, 5)
+
+
+def npy(array) -> bytes:
+    buffer = io.BytesIO()
+    np.save(buffer, array)
+    return buffer.getvalue()
+
+
+def arrow(table, file=False) -> bytes:
+    sink = pa.BufferOutputStream()
+    new_writer = pa.ipc.new_file if file else pa.ipc.new_stream
+    with new_writer(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def list_table(matrix):
+    values = pa.array(matrix.ravel())
+    return pa.table(
+        {"features": pa.FixedSizeListArray.from_arrays(values, matrix.shape[1])}
+    )
+
+
+def column_table(matrix):
+    return pa.table({name: matrix[:, i] for i, name in enumerate(FEATURES)})
+
+
+def test_decode_npy_is_a_view_of_the_body():
+    matrix = batch_codec.decode(batch_codec.NPY, npy(MATRIX))
+    assert matrix.tolist() == MATRIX.tolist()
+    assert not matrix.flags.owndata
+
+    fortran = batch_codec.decode(batch_codec.NPY, npy(np.asfortranarray(MATRIX)))
+    assert fortran.tolist() == MATRIX.tolist()
+    assert batch_codec.decode(batch_codec.NPY, npy(MATRIX.astype("f4"))).dtype == "f4"
+
+
+def test_decode_arrow():
+    body = arrow(list_table(MATRIX))
+    matrix = batch_codec.decode(batch_codec.ARROW_STREAM, body)
+    assert matrix.tolist() == MATRIX.tolist()
+    assert not matrix.flags.owndata
+
+    for file in (False, True):
+        kind = batch_codec.ARROW_FILE if file else batch_codec.ARROW_STREAM
+        body = arrow(column_table(MATRIX), file=file)
+        assert batch_codec.decode(kind, body).tolist() == MATRIX.tolist()
+
+
+def test_decode_json():
+    body = json.dumps({"features": MATRIX.tolist()}).encode()
+    content_type = "application/json; charset=utf-8"
+    assert batch_codec.decode(content_type, body).tolist() == MATRIX.tolist()
+
+
+@pytest.mark.parametrize(
+    "content_type, body",
+    [
+        (batch_codec.NPY, npy(MATRIX[:, :4])),
+        (batch_codec.NPY, npy(MATRIX.astype(int))),
+        (batch_codec.NPY, npy(MATRIX.ravel())),
+        (batch_codec.NPY, npy(MATRIX)[:-8]),
+        (batch_codec.NPY, b"not an array"),
+        (batch_codec.NPY, npy(np.where(MATRIX == 3, np.nan, MATRIX))),
+        (batch_codec.NPY, npy(np.empty((0, 5)))),
+        (batch_codec.ARROW_STREAM, arrow(column_table(MATRIX).drop(["feature5"]))),
+        (batch_codec.ARROW_STREAM, arrow(list_table(MATRIX[:, :4]))),
+        (batch_codec.ARROW_STREAM, arrow(column_table(MATRIX.astype("i8")))),
+        (batch_codec.ARROW_STREAM, b"not arrow"),
+        (batch_codec.JSON, b'{"features": [[1, 2, 3, 4, 5], [1, 2]]}'),
+        (batch_codec.JSON, b'{"features": [[1, 2, 3, 4, "x"]]}'),
+        (batch_codec.JSON, b'{"features": [[1, 2, 3, 4, null]]}'),
+        (batch_codec.JSON, b"[[1, 2, 3, 4, 5]]"),
+    ],
+)
+def test_decode_rejects_invalid_payloads(content_type, body):
+    with pytest.raises(PayloadException):
+        batch_codec.decode(content_type, body)
+
+
+def test_decode_rejects_null_arrow_values():
+    table = column_table(MATRIX).set_column(
+        0, "feature1", pa.array([1.0, None, 2.0, 3.0])
+    )
+    with pytest.raises(PayloadException, match="null"):
+        batch_codec.decode(batch_codec.ARROW_STREAM, arrow(table))
+
+
+@pytest.fixture
+def served(monkeypatch):
+    logged = []
+    monkeypatch.setattr(
+        predictor, "get_prediction", lambda data: (data[:, 0] < 10).astype(float)
+    )
+    monkeypatch.setattr(predictor, "write_request_logs", logged.extend)
+    monkeypatch.setattr(predictor, "DRIFT_FLAG", False)
+    return logged
+
+
+def post(body, content_type):
+    return client.post(
+        "/api/v1/predict/batch", content=body, headers={"content-type": content_type}
+    )
+
+
+def test_predict_batch_json(served):
+    response = post(json.dumps({"features": MATRIX.tolist()}), batch_codec.JSON)
+    assert response.status_code == 200
+    assert response.json() == {
+        "predictions": [1.0, 1.0, 0.0, 0.0],
+        "prediction_labels": ["label ok", "label ok", "label nok", "label nok"],
+    }
+    assert len(served) == 4
+    assert served[2]["feature1"] == 10.0
+    assert served[2]["prediction_label"] == "label nok"
+
+
+def test_predict_batch_npy(served):
+    response = post(npy(MATRIX.astype(np.float32)), batch_codec.NPY)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == batch_codec.NPY
+    assert np.load(io.BytesIO(response.content)).tolist() == [1.0, 1.0, 0.0, 0.0]
+
+
+def test_predict_batch_arrow(served):
+    response = post(arrow(list_table(MATRIX)), batch_codec.ARROW_STREAM)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == batch_codec.ARROW_STREAM
+    table = pa.ipc.open_stream(response.content).read_all()
+    assert table.column("prediction").to_pylist() == [1.0, 1.0, 0.0, 0.0]
+    assert table.column("prediction_label").to_pylist()[0] == "label ok"
+
+
+def test_predict_batch_errors(served, monkeypatch):
+    assert post(b"a,b", "text/csv").status_code == 415
+    response = post(npy(MATRIX[:, :3]), batch_codec.NPY)
+    assert response.status_code == 422
+    assert "shape" in response.json()["detail"]
+
+    monkeypatch.setattr(predictor, "PREDICT_BATCH_MAX_ROWS", 3)
+    assert post(npy(MATRIX), batch_codec.NPY).status_code == 413
+    assert served == []
@@ -0,0 +1,126 @@
+from main import get_application
+
+from benchmarks.compare import compare_reports
+from benchmarks.importtime import parse_importtime, summarize_imports
+from benchmarks.inference import train_model
+from benchmarks.run import build_scenarios, percentile, summarize, uncovered_routes
+
+
+def test_percentile_nearest_rank():
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == 50.0
+    assert percentile(values, 95) == 95.0
+    assert percentile(values, 99) == 99.0
+    assert percentile([3.0], 99) == 3.0
+    assert percentile([], 50) == 0.0
+
+
+def test_summarize_reports_milliseconds_and_throughput():
+    summary = summarize([0.002, 0.001, 0.004, 0.003], errors=1, elapsed=0.5)
+    assert summary["requests"] == 4
+    assert summary["errors"] == 1
+    assert summary["throughput_rps"] == 8.0
+    assert summary["p50_ms"] == 2.0
+    assert summary["p99_ms"] == 4.0
+    assert summary["max_ms"] == 4.0
+
+
+def test_every_api_route_has_a_scenario_or_skip_reason():
+    assert uncovered_routes(get_application(), build_scenarios()) == []
+
+
+def _report(p95, rps, errors=0):
+    return {
+        "routes": {
+            "GET /v1/projects": {
+                "p50_ms": 1.0,
+                "p95_ms": p95,
+                "p99_ms": 3.0,
+                "throughput_rps": rps,
+                "errors": errors,
+            }
+        }
+    }
+
+
+def test_inference_benchmark_serves_the_compiled_kernel(tmp_path, monkeypatch):
+    import services.predict as predict
+
+    train_model(str(tmp_path), trees=2, compiled=True)
+    monkeypatch.setattr(predict, "MODEL_PATH", str(tmp_path))
+    monkeypatch.setattr(predict, "MODEL_NAME", "model.pkl")
+
+    def fail(path):
+        raise AssertionError("the pickle should not be loaded")
+
+    served = predict.MachineLearningModelHandlerScore.load(fail)
+    assert type(served).__name__ == "CompiledModel"
+
+
+def test_compare_flags_latency_and_throughput_regressions():
+    rows = compare_reports(_report(2.0, 100.0), _report(2.1, 95.0), threshold=0.1)
+    assert not any(row["regression"] for row in rows)
+
+    rows = compare_reports(_report(2.0, 100.0), _report(3.0, 80.0), threshold=0.1)
+    regressed = {row["metric"] for row in rows if row["regression"]}
+    assert regressed == {"p95_ms", "throughput_rps"}
+
+
+def test_compare_flags_new_errors():
+    rows = compare_reports(_report(2.0, 100.0), _report(2.0, 100.0, errors=3), 0.1)
+    assert [row["metric"] for row in rows if row["regression"]] == ["errors"]
+
+
+def test_parse_importtime_summary():
+    stderr = "\n".join(
+        [
+            "import time: self [us] | cumulative | imported package",
+            "import time:       100 |        100 |     json.decoder",
+            "import time:       200 |        300 |   json",
+            "import time:       100 |        400 | main",
+        ]
+    )
+    entries = parse_importtime(stderr)
+    assert [e["depth"] for e in entries] == [2, 1, 0]
+
+    summary = summarize_imports(entries, top=1)
+    assert summary["total_ms"] == 0.4
+    assert summary["by_cumulative"] == [{"module": "main", "ms": 0.4}]
+    assert summary["by_package"] == [{"package": "json", "ms": 0.3}]
+
+
+def test_seed_reset_keeps_rows_it_did_not_seed(pg_session):
+    from datetime import datetime, timezone
+
+    from db.models.contact import ContactMessage
+    from db.models.log import RequestLog
+    from sqlalchemy import insert, select, text
+
+    from benchmarks.seed import SEED_MODEL_VERSION, reset
+
+    def log(model_version):
+        return {
+            "created_at": datetime.now(timezone.utc),
+            "model_version": model_version,
+            "latency_ms": 1.0,
+            **{f"feature{k}": 0.0 for k in range(1, 6)},
+            "prediction": 1.0,
+            "prediction_label": "label ok",
+        }
+
+    def contact(name):
+        return ContactMessage(
+            name=name, email="a@example.com", subject="s", message="m"
+        )
+
+    with pg_session() as db:
+        db.execute(insert(RequestLog), [log(SEED_MODEL_VERSION), log("production")])
+        db.add_all([contact("bench-run-contact"), contact("A visitor")])
+        db.commit()
+        try:
+            reset(db)
+            assert db.scalars(select(RequestLog.model_version)).all() == ["production"]
+            assert db.scalars(select(ContactMessage.name)).all() == ["A visitor"]
+        finally:
+            db.execute(text("TRUNCATE request_logs, contact_messages"))
+            db.commit()
@@ -0,0 +1,94 @@
+import pandas as pd
+import pytest
+
+from ml.features import build_features
+
+
+@pytest.fixture
+def interim(tmp_path):
+    interim = tmp_path / "interim"
+    for source, offset in (("a", 0), ("b", 100)):
+        (interim / f"source={source}").mkdir(parents=True)
+        for part in range(2):
+            frame = pd.DataFrame(
+                {
+                    **{
+                        f"feature{k}": [float(offset + part * 10 + i) for i in range(5)]
+                        for k in range(1, 6)
+                    },
+                    "target": [i % 2 for i in range(5)],
+                    "unused": ["x"] * 5,
+                }
+            )
+            frame.to_parquet(
+                interim / f"source={source}" / f"part-{part:05d}.parquet", index=False
+            )
+    return interim
+
+
+def test_builds_registered_features(interim, tmp_path):
+    out = tmp_path / "processed"
+    totals = build_features.pipeline(str(interim), str(out), workers=2)
+    assert totals == {"parts": 4, "computed": 4, "cached": 0}
+
+    dataset = pd.read_parquet(out)
+    assert len(dataset) == 20
+    assert "unused" not in dataset
+    assert dataset["feature3"].dtype == "float64"
+    part = pd.read_parquet(out / "source=b" / "part-00001.parquet")
+    assert part["feature1"].tolist() == [110.0, 111.0, 112.0, 113.0, 114.0]
+    assert part["target"].tolist() == [0, 1, 0, 1, 0]
+
+
+def test_rerun_recomputes_only_changed_parts(interim, tmp_path):
+    out = tmp_path / "processed"
+    build_features.pipeline(str(interim), str(out), workers=1)
+    assert build_features.pipeline(str(interim), str(out), workers=1) == {
+        "parts": 4,
+        "computed": 0,
+        "cached": 4,
+    }
+
+    changed = interim / "source=a" / "part-00000.parquet"
+    frame = pd.read_parquet(changed)
+    frame["feature1"] = -1.0
+    frame.to_parquet(changed, index=False)
+    (interim / "source=b" / "part-00001.parquet").unlink()
+
+    totals = build_features.pipeline(str(interim), str(out), workers=1)
+    assert totals == {"parts": 3, "computed": 1, "cached": 2}
+    assert set(pd.read_parquet(out / "source=a")["feature1"]) >= {-1.0}
+    assert not (out / "source=b" / "part-00001.parquet").exists()
+    assert len(list((out / build_features.CACHE_DIR).glob("*.parquet"))) == 3
+
+
+def test_rerun_keeps_files_it_did_not_write(interim, tmp_path):
+    out = tmp_path / "processed"
+    out.mkdir()
+    train = pd.DataFrame({"feature1": [1.0]})
+    train.to_parquet(out / "train.parquet", index=False)
+    build_features.pipeline(str(interim), str(out), workers=1)
+    (interim / "source=b" / "part-00001.parquet").unlink()
+
+    build_features.pipeline(str(interim), str(out), workers=1)
+    assert not (out / "source=b" / "part-00001.parquet").exists()
+    assert pd.read_parquet(out / "train.parquet").equals(train)
+
+
+def test_feature_code_change_invalidates_cache(interim, tmp_path, monkeypatch):
+    out = tmp_path / "processed"
+    build_features.pipeline(str(interim), str(out), workers=1)
+    monkeypatch.setattr(build_features, "FEATURES_VERSION", 2)
+    totals = build_features.pipeline(str(interim), str(out), workers=1)
+    assert totals["computed"] == 4
+
+
+def test_code_version_tracks_feature_functions():
+    def doubled(frame):
+        return frame.iloc[:, 0].to_numpy(dtype="float64") * 2
+
+    changed = [
+        *build_features.FEATURES[:4],
+        build_features.Feature("feature5", ("feature5",), doubled),
+    ]
+    assert build_features.code_version(changed) != build_features.code_version()
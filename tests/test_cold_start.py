@@ -0,0 +1,22 @@
+import subprocess
+import sys
+from pathlib import Path
+
+APP_DIR = Path(__file__).resolve().parent.parent / "app"
+# Only needed by the predictor and upload code paths
+LAZY_MODULES = ("numpy", "joblib", "sklearn", "pandas", "aioboto3", "pyarrow")
+
+
+def test_importing_main_does_not_load_heavy_dependencies():
+    code = (
+        "import sys, main; "
+        f"print(' '.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=APP_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert result.stdout.strip() == ""
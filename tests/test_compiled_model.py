@@ -0,0 +1,244 @@
+import os
+
+import numpy as np
+import pytest
+import services.predict as predict
+from core.errors import ModelCompileException
+from services.compiled_model import CompiledModel, compile_model
+from sklearn.datasets import make_classification, make_regression
+from sklearn.ensemble import (
+    ExtraTreesRegressor,
+    GradientBoostingClassifier,
+    GradientBoostingRegressor,
+    RandomForestClassifier,
+    RandomForestRegressor,
+)
+from sklearn.linear_model import LinearRegression, LogisticRegression, Ridge
+from sklearn.neighbors import KNeighborsClassifier
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import MinMaxScaler, RobustScaler, StandardScaler
+from sklearn.svm import LinearSVC
+from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
+
+CLASSIFIERS = [
+    LogisticRegression(max_iter=1000),
+    make_pipeline(StandardScaler(), LogisticRegression(max_iter=1000)),
+    make_pipeline(MinMaxScaler(), LinearSVC()),
+    DecisionTreeClassifier(max_depth=6, random_state=0),
+    RandomForestClassifier(n_estimators=20, max_depth=5, random_state=0),
+    GradientBoostingClassifier(n_estimators=20, max_depth=3, random_state=0),
+]
+
+REGRESSORS = [
+    LinearRegression(),
+    make_pipeline(RobustScaler(), Ridge()),
+    DecisionTreeRegressor(max_depth=6, random_state=0),
+    RandomForestRegressor(n_estimators=20, max_depth=5, random_state=0),
+    ExtraTreesRegressor(n_estimators=10, random_state=0),
+    GradientBoostingRegressor(n_estimators=30, max_depth=3, random_state=0),
+]
+
+
+def _name(estimator):
+    return type(estimator).__name__ + str(id(estimator) % 97)
+
+
+@pytest.mark.parametrize("n_classes", [2, 3])
+@pytest.mark.parametrize("estimator", CLASSIFIERS, ids=_name)
+def test_classifier_parity(estimator, n_classes):
+    x, y = make_classification(
+        n_samples=400,
+        n_features=5,
+        n_informative=4,
+        n_redundant=0,
+        n_classes=n_classes,
+        random_state=0,
+    )
+    estimator.fit(x[:300], y[:300])
+
+    compiled = compile_model(estimator)
+
+    np.testing.assert_array_equal(compiled.predict(x[300:]), estimator.predict(x[300:]))
+
+
+@pytest.mark.parametrize("estimator", REGRESSORS, ids=_name)
+def test_regressor_parity(estimator):
+    x, y = make_regression(n_samples=400, n_features=5, noise=5, random_state=0)
+    estimator.fit(x[:300], y[:300])
+
+    compiled = compile_model(estimator)
+
+    np.testing.assert_allclose(compiled.predict(x[300:]), estimator.predict(x[300:]))
+
+
+@pytest.mark.parametrize("bad", [np.nan, np.inf, -np.inf])
+@pytest.mark.parametrize("estimator", CLASSIFIERS + REGRESSORS, ids=_name)
+def test_non_finite_input_parity(estimator, bad):
+    x, y = make_classification(n_samples=200, n_features=5, random_state=0)
+    estimator.fit(x, y)
+    compiled = compile_model(estimator)
+    rows = x[:3].copy()
+    rows[1, 2] = bad
+
+    try:
+        expected = estimator.predict(rows)
+    except ValueError:
+        with pytest.raises(ValueError):
+            compiled.predict(rows)
+    else:
+        np.testing.assert_allclose(compiled.predict(rows), expected)
+
+
+def test_save_and_load_round_trip(tmp_path):
+    x, y = make_classification(n_samples=200, n_features=5, random_state=0)
+    estimator = make_pipeline(
+        StandardScaler(), GradientBoostingClassifier(n_estimators=10, random_state=0)
+    ).fit(x, y)
+    path = tmp_path / "model.npz"
+
+    compile_model(estimator).save(str(path))
+    loaded = CompiledModel.load(str(path))
+
+    np.testing.assert_array_equal(loaded.predict(x), estimator.predict(x))
+
+
+def test_unsupported_models_raise():
+    x, y = make_classification(n_samples=50, n_features=5, random_state=0)
+    with pytest.raises(ModelCompileException):
+        compile_model(KNeighborsClassifier().fit(x, y))
+    with pytest.raises(ModelCompileException):
+        compile_model({"model": object()})
+
+
+def test_handler_compiles_supported_models(tmp_path, monkeypatch):
+    x, y = make_classification(n_samples=100, n_features=5, random_state=0)
+    estimator = LogisticRegression().fit(x, y)
+    (tmp_path / "model.pkl").write_text("data")
+    monkeypatch.setattr(predict, "MODEL_PATH", str(tmp_path))
+    monkeypatch.setattr(predict, "MODEL_NAME", "model.pkl")
+
+    model = predict.MachineLearningModelHandlerScore.load(lambda path: estimator)
+    assert isinstance(model, CompiledModel)
+
+    knn = KNeighborsClassifier().fit(x, y)
+    model = predict.MachineLearningModelHandlerScore.load(lambda path: knn)
+    assert model is knn
+
+
+def test_handler_prefers_compiled_file(tmp_path, monkeypatch):
+    x, y = make_regression(n_samples=100, n_features=5, random_state=0)
+    estimator = LinearRegression().fit(x, y)
+    (tmp_path / "model.pkl").write_text("data")
+    compiled = compile_model(estimator)
+    compiled.save(str(tmp_path / "model.npz"), source=str(tmp_path / "model.pkl"))
+    monkeypatch.setattr(predict, "MODEL_PATH", str(tmp_path))
+    monkeypatch.setattr(predict, "MODEL_NAME", "model.pkl")
+
+    def fail(path):
+        raise AssertionError("pickle should not be loaded")
+
+    model = predict.MachineLearningModelHandlerScore.load(fail)
+    np.testing.assert_allclose(model.predict(x), estimator.predict(x))
+
+
+def test_handler_ignores_stale_compiled_file(tmp_path, monkeypatch):
+    x, y = make_regression(n_samples=100, n_features=5, random_state=0)
+    old, new = LinearRegression().fit(x, y), LinearRegression().fit(x, -y)
+    pickle = tmp_path / "model.pkl"
+    pickle.write_text("old")
+    compile_model(old).save(str(tmp_path / "model.npz"), source=str(pickle))
+    # A newer model whose file ends up older than the kernel, as after a copy
+    pickle.write_text("new")
+    os.utime(pickle, (0, 0))
+    monkeypatch.setattr(predict, "MODEL_PATH", str(tmp_path))
+    monkeypatch.setattr(predict, "MODEL_NAME", "model.pkl")
+
+    model = predict.MachineLearningModelHandlerScore.load(lambda path: new)
+    np.testing.assert_allclose(model.predict(x), new.predict(x))
+
+    # Kernels without a recorded digest are not trusted either
+    compile_model(old).save(str(tmp_path / "model.npz"))
+    model = predict.MachineLearningModelHandlerScore.load(lambda path: new)
+    np.testing.assert_allclose(model.predict(x), new.predict(x))
+
+
+@pytest.mark.parametrize("estimator", CLASSIFIERS, ids=_name)
+def test_float32_classifier_parity(estimator):
+    x, y = make_classification(
+        n_samples=1300, n_features=5, n_informative=4, n_redundant=0, random_state=0
+    )
+    estimator.fit(x[:300], y[:300])
+
+    reduced = compile_model(estimator).astype(np.float32)
+
+    assert reduced.dtype == np.float32
+    agreement = np.mean(reduced.predict(x[300:]) == estimator.predict(x[300:]))
+    assert agreement >= 0.995
+
+
+@pytest.mark.parametrize("estimator", REGRESSORS, ids=_name)
+def test_float32_regressor_parity(estimator):
+    x, y = make_regression(n_samples=400, n_features=5, noise=5, random_state=0)
+    estimator.fit(x[:300], y[:300])
+
+    compiled = compile_model(estimator)
+    reduced = compiled.astype(np.float32)
+
+    assert reduced.predict(x[300:]).dtype == np.float32
+    np.testing.assert_allclose(
+        reduced.predict(x[300:]), estimator.predict(x[300:]), rtol=1e-4, atol=1e-3
+    )
+    assert reduced.nbytes < compiled.nbytes
+
+
+def test_float32_thresholds_keep_tree_splits():
+    x, y = make_regression(n_samples=300, n_features=5, random_state=0)
+    estimator = DecisionTreeRegressor(random_state=0).fit(x, y)
+    reduced = compile_model(estimator).astype(np.float32)
+    # Every training value sits next to a threshold; float32 inputs must follow
+    # the same branches as sklearn, which splits on float32 too
+    np.testing.assert_allclose(
+        reduced.predict(x), estimator.predict(x.astype(np.float32)), rtol=1e-6
+    )
+
+
+def test_float32_round_trip(tmp_path):
+    x, y = make_classification(n_samples=200, n_features=5, random_state=0)
+    estimator = make_pipeline(StandardScaler(), LogisticRegression()).fit(x, y)
+    path = tmp_path / "model.npz"
+
+    compile_model(estimator).astype(np.float32).save(str(path))
+    loaded = CompiledModel.load(str(path))
+
+    assert loaded.dtype == np.float32
+    assert loaded.arrays["coef"].dtype == np.float32
+    np.testing.assert_array_equal(loaded.predict(x), estimator.predict(x))
+
+
+def test_handler_applies_model_precision(tmp_path, monkeypatch):
+    x, y = make_classification(n_samples=100, n_features=5, random_state=0)
+    estimator = LogisticRegression().fit(x, y)
+    (tmp_path / "model.pkl").write_text("data")
+    monkeypatch.setattr(predict, "MODEL_PATH", str(tmp_path))
+    monkeypatch.setattr(predict, "MODEL_NAME", "model.pkl")
+    monkeypatch.setattr(predict, "MODEL_PRECISION", "float32")
+
+    model = predict.MachineLearningModelHandlerScore.load(lambda path: estimator)
+    assert model.dtype == np.float32
+
+    knn = KNeighborsClassifier().fit(x, y)
+    assert predict.MachineLearningModelHandlerScore.load(lambda path: knn) is knn
+
+
+def test_precision_report():
+    from cli.precision_report import precision_report
+
+    x, y = make_regression(n_samples=300, n_features=5, random_state=0)
+    compiled = compile_model(
+        GradientBoostingRegressor(n_estimators=20, random_state=0).fit(x, y)
+    )
+    report = precision_report(compiled, x, batch_rows=1000)
+    assert report["rows"] == 300
+    assert report["max_rel_error"] < 1e-4
+    assert report["float32_bytes"] < report["float64_bytes"]
+    assert report["float32_batch_seconds"] > 0
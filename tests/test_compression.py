@@ -0,0 +1,102 @@
+import gzip
+
+import brotli
+import core.compression as compression
+import pytest
+from core.compression import CompressionMiddleware, select_encoding
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+PAYLOAD = {"data": ["lab note content"] * 200}
+
+
+@pytest.fixture
+def app():
+    application = FastAPI()
+    application.add_middleware(CompressionMiddleware, minimum_size=500)
+
+    @application.get("/api/v1/big")
+    async def big():
+        return PAYLOAD
+
+    @application.get("/api/v1/small")
+    async def small():
+        return {"data": "ok"}
+
+    @application.get("/api/v1/admin/big")
+    async def admin_big():
+        return PAYLOAD
+
+    @application.get("/api/v1/stream")
+    async def stream():
+        return StreamingResponse(iter([b"a" * 1000, b"b" * 1000]))
+
+    return application
+
+
+def test_select_encoding():
+    assert select_encoding("gzip, deflate, br") == "br"
+    assert select_encoding("gzip") == "gzip"
+    assert select_encoding("br;q=0, gzip;q=0.5") == "gzip"
+    assert select_encoding("*") == "br"
+    assert select_encoding("identity") is None
+    assert select_encoding("") is None
+
+
+def test_brotli_and_gzip_negotiation(app):
+    client = TestClient(app)
+    response = client.get("/api/v1/big", headers={"Accept-Encoding": "br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == PAYLOAD
+
+    response = client.get("/api/v1/big", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == PAYLOAD
+
+
+def test_uncompressed_responses_still_vary_on_accept_encoding(app):
+    client = TestClient(app)
+    for accept in ("identity", "br;q=0, gzip;q=0"):
+        response = client.get("/api/v1/big", headers={"Accept-Encoding": accept})
+        assert "content-encoding" not in response.headers
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert response.json() == PAYLOAD
+
+
+def test_small_and_streaming_responses_pass_through(app):
+    client = TestClient(app)
+    small = client.get("/api/v1/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in small.headers
+
+    stream = client.get("/api/v1/stream", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in stream.headers
+    assert stream.content == b"a" * 1000 + b"b" * 1000
+
+
+def test_public_responses_compress_once_per_content(app, monkeypatch):
+    calls = []
+    original = compression.compress
+
+    def counting_compress(body, encoding):
+        calls.append(encoding)
+        return original(body, encoding)
+
+    monkeypatch.setattr(compression, "compress", counting_compress)
+    client = TestClient(app)
+    for _ in range(3):
+        response = client.get("/api/v1/big", headers={"Accept-Encoding": "br"})
+        assert response.json() == PAYLOAD
+    client.get("/api/v1/big", headers={"Accept-Encoding": "gzip"})
+    assert calls == ["br", "gzip"]
+
+    for _ in range(2):
+        client.get("/api/v1/admin/big", headers={"Accept-Encoding": "gzip"})
+    assert calls == ["br", "gzip", "gzip", "gzip"]
+
+
+def test_compress_round_trip():
+    body = b"x" * 2000
+    assert gzip.decompress(compression.compress(body, "gzip")) == body
+    assert brotli.decompress(compression.compress(body, "br")) == body
@@ -15,3 +15,20 @@ def test_custom_exceptions():
         raise errors.PredictException("test")
     with pytest.raises(errors.ModelLoadException):
         raise errors.ModelLoadException("test")
+
+
+def test_invalid_model_precision_fails_at_startup():
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    result = subprocess.run(
+        [sys.executable, "-c", "import core.config"],
+        cwd=Path(__file__).resolve().parents[1] / "app",
+        env={**os.environ, "MODEL_PRECISION": "fp32"},
+        capture_output=True,
+        text=True,
+    )
+    assert result.returncode != 0
+    assert "MODEL_PRECISION must be float64 or float32" in result.stderr
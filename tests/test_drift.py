@@ -0,0 +1,248 @@
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import numpy as np
+import pytest
+from api.dependencies import get_current_admin
+from db.dependency import get_db
+from db.models.drift import DriftSnapshot
+from services import drift
+from services.drift import DriftMonitor, DriftStats, RunningStats
+from sqlalchemy import select, text
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def reference():
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(5000, 5))
+    predictions = (features[:, 0] > 0).astype(float)
+    labels = np.where(predictions == 1, "label ok", "label nok")
+    return drift.build_reference(features, predictions, labels)
+
+
+@pytest.fixture
+def monitor(reference, monkeypatch):
+    monitor = DriftMonitor(reference)
+    monkeypatch.setattr(drift, "drift_monitor", monitor)
+    return monitor
+
+
+def observe(target, rows, shift=0.0):
+    for row in rows:
+        features = {f"feature{k + 1}": float(v + shift) for k, v in enumerate(row)}
+        prediction = float(row[0] + shift > 0)
+        target.observe(features, prediction, "label ok" if prediction else "label nok")
+
+
+def test_running_stats_match_numpy():
+    values = np.random.default_rng(1).normal(3.0, 2.0, size=1000)
+    stats = RunningStats()
+    for value in values:
+        stats.update(value)
+    assert stats.count == 1000
+    assert stats.mean == pytest.approx(values.mean())
+    assert stats.variance == pytest.approx(values.var(ddof=1))
+    assert (stats.min, stats.max) == (values.min(), values.max())
+
+
+def test_merged_running_stats_equal_one_pass():
+    values = np.random.default_rng(2).exponential(size=900)
+    parts = [RunningStats(), RunningStats(), RunningStats()]
+    for i, value in enumerate(values):
+        parts[i % 3].update(value)
+    merged = RunningStats.from_dict(parts[0].to_dict())
+    merged.merge(parts[1])
+    merged.merge(parts[2])
+    merged.merge(RunningStats())
+    assert merged.count == 900
+    assert merged.mean == pytest.approx(values.mean())
+    assert merged.variance == pytest.approx(values.var(ddof=1))
+
+
+def test_psi():
+    assert drift.psi([0.5, 0.5], [0, 0]) is None
+    assert drift.psi([0.5, 0.5], [50, 50]) == pytest.approx(0.0)
+    assert drift.psi_status(drift.psi([0.5, 0.5], [55, 45])) == "stable"
+    assert drift.psi_status(drift.psi([0.5, 0.5], [90, 10])) == "significant"
+
+
+def test_reference_bins_split_training_data_evenly(reference):
+    feature = reference["features"]["feature1"]
+    assert reference["count"] == 5000
+    assert len(feature["edges"]) == 9
+    assert feature["proportions"] == pytest.approx([0.1] * 10)
+    assert feature["mean"] == pytest.approx(0.0, abs=0.05)
+    assert sum(reference["labels"].values()) == pytest.approx(1.0)
+
+
+def test_report_is_stable_on_training_distribution(reference):
+    stats = DriftStats(reference)
+    observe(stats, np.random.default_rng(3).normal(size=(2000, 5)))
+    report = stats.report(reference)
+    assert report["count"] == 2000
+    assert report["status"] == "stable"
+    assert abs(report["feature1"]["mean_shift"]) < 0.1
+    assert report["labels"]["status"] == "stable"
+
+
+def test_report_flags_shifted_features(reference):
+    stats = DriftStats(reference)
+    observe(stats, np.random.default_rng(4).normal(size=(2000, 5)), shift=1.0)
+    report = stats.report(reference)
+    assert report["status"] == "significant"
+    assert report["feature3"]["status"] == "significant"
+    assert report["feature3"]["mean_shift"] == pytest.approx(1.0, abs=0.1)
+
+
+def test_report_without_reference():
+    stats = DriftStats()
+    observe(stats, np.ones((3, 5)))
+    report = stats.report(None)
+    assert report["status"] is None
+    assert report["feature1"]["mean"] == 1.0
+    assert report["labels"]["ratios"] == {"label ok": 1.0}
+
+
+def test_batch_observation_matches_row_by_row(reference):
+    rows = np.random.default_rng(8).normal(size=(500, 5))
+    one_by_one, batched = DriftStats(reference), DriftStats(reference)
+    observe(one_by_one, rows)
+    predictions = (rows[:, 0] > 0).astype(float)
+    labels = np.where(predictions == 1, "label ok", "label nok")
+    batched.observe_batch(rows[:200], predictions[:200], labels[:200])
+    batched.observe_batch(rows[200:], predictions[200:], labels[200:])
+    assert batched.histograms == one_by_one.histograms
+    assert batched.labels == one_by_one.labels
+    for name, stats in batched.stats.items():
+        expected = one_by_one.stats[name]
+        assert stats.count == expected.count
+        assert stats.mean == pytest.approx(expected.mean)
+        assert stats.variance == pytest.approx(expected.variance)
+        assert (stats.min, stats.max) == (expected.min, expected.max)
+
+
+def test_non_finite_rows_are_skipped(reference):
+    stats = DriftStats(reference)
+    rows = np.ones((4, 5))
+    rows[1, 0], rows[2, 3] = np.nan, np.inf
+    observe(stats, rows)
+    stats.observe_batch(rows, [1.0, 1.0, 1.0, np.nan], ["label ok"] * 4)
+    # Rows 0 and 3 of the first pass, row 0 of the batch
+    assert stats.count == 3
+    assert stats.labels == {"label ok": 3}
+    json.dumps(stats.to_dict(), allow_nan=False)
+    json.dumps(stats.report(reference), allow_nan=False)
+
+
+def test_nan_body_does_not_poison_drift(monitor, monkeypatch):
+    from api.routes import predictor
+    from fastapi.testclient import TestClient
+    from main import app
+
+    monkeypatch.setattr(predictor, "drift_monitor", monitor)
+    monkeypatch.setattr(predictor, "DRIFT_FLAG", True)
+    monkeypatch.setattr(predictor, "DRIFT_FLUSH_SECONDS", 3600)
+    monkeypatch.setattr(predictor, "get_prediction", lambda data_point: [1.0])
+    monkeypatch.setattr(predictor, "write_request_logs", lambda rows: None)
+    body = (
+        '{"feature1": NaN, "feature2": 1, "feature3": 1, "feature4": 1, "feature5": 1}'
+    )
+    response = TestClient(app).post(
+        "/api/v1/predict", content=body, headers={"content-type": "application/json"}
+    )
+    assert response.status_code == 200
+    assert monitor.current.count == 0
+    json.dumps(monitor.current.to_dict(), allow_nan=False)
+
+
+def test_snapshots_merge_like_one_stream(reference):
+    rows = np.random.default_rng(5).normal(size=(300, 5))
+    whole, first, second = (DriftStats(reference) for _ in range(3))
+    observe(whole, rows)
+    observe(first, rows[:100])
+    observe(second, rows[100:])
+    merged = DriftStats.from_dict(first.to_dict())
+    merged.merge(DriftStats.from_dict(second.to_dict()))
+    assert merged.histograms == whole.histograms
+    assert merged.labels == whole.labels
+    for name in ("feature2", "prediction"):
+        expected, actual = whole.report(reference)[name], merged.report(reference)[name]
+        assert actual["mean"] == pytest.approx(expected["mean"])
+        assert actual["std"] == pytest.approx(expected["std"])
+        assert actual["psi"] == pytest.approx(expected["psi"])
+
+
+def test_monitor_take_starts_afresh(monitor):
+    observe(monitor, np.zeros((2, 5)))
+    assert not monitor.due(3600)
+    assert monitor.due(0)
+    _, taken = monitor.take()
+    assert taken.count == 2
+    assert monitor.current.count == 0
+    monitor.restore(taken)
+    assert monitor.current.count == 2
+
+
+def test_flush_and_window(pg_session, monitor):
+    rows = np.random.default_rng(6).normal(size=(50, 5))
+    observe(monitor, rows[:30])
+    assert drift.flush(pg_session, "v1")
+    assert not drift.flush(pg_session, "v1")
+    observe(monitor, rows[30:])
+    try:
+        since = datetime.now(timezone.utc) - timedelta(hours=1)
+        with pg_session() as db:
+            snapshot = db.scalars(select(DriftSnapshot)).one()
+            assert snapshot.stats["stats"]["prediction"]["count"] == 30
+            # Flushed snapshot plus the 20 not yet flushed
+            assert drift.window(db, since).count == 50
+            assert drift.window(db, since, "v2").count == 20
+    finally:
+        with pg_session() as db:
+            db.execute(text("TRUNCATE drift_snapshots"))
+            db.commit()
+
+
+def test_failed_flush_keeps_statistics(monitor):
+    def broken_session():
+        raise RuntimeError("database down")
+
+    observe(monitor, np.zeros((3, 5)))
+    with pytest.raises(RuntimeError):
+        drift.flush(broken_session, "v1")
+    assert monitor.current.count == 3
+
+
+@pytest.mark.anyio
+async def test_drift_endpoint(pg_session, monitor, monkeypatch):
+    from api.routes import drift as drift_route
+    from main import get_application
+
+    monkeypatch.setattr(drift_route, "drift_monitor", monitor)
+    observe(monitor, np.random.default_rng(7).normal(size=(100, 5)))
+
+    def override_get_db():
+        with pg_session() as db:
+            yield db
+
+    app = get_application()
+    app.dependency_overrides[get_current_admin] = lambda: "admin"
+    app.dependency_overrides[get_db] = override_get_db
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get("/api/v1/admin/drift", params={"hours": 6})
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["has_reference"] is True
+        assert data["count"] == 100
+        assert data["feature1"]["status"] in ("stable", "moderate")
+        assert set(data["labels"]["counts"]) <= {"label ok", "label nok"}
+
+        response = await client.get("/api/v1/admin/drift", params={"hours": 0})
+        assert response.status_code == 422
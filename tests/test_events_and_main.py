@@ -26,6 +26,7 @@ def test_create_start_app_handler(monkeypatch):
         called["called"] = True
 
     monkeypatch.setattr(events, "preload_model", fake_preload)
+    monkeypatch.setattr(events, "build_suggestion_index", lambda: None)
     monkeypatch.setattr(events, "MEMOIZATION_FLAG", True)
 
     app = FastAPI()
@@ -34,6 +35,20 @@ def test_create_start_app_handler(monkeypatch):
     assert called.get("called") is True
 
 
+def test_create_start_app_handler_builds_suggestion_index(monkeypatch):
+    called = {}
+
+    def fake_build():
+        called["called"] = True
+
+    monkeypatch.setattr(events, "build_suggestion_index", fake_build)
+    monkeypatch.setattr(events, "MEMOIZATION_FLAG", False)
+
+    handler = events.create_start_app_handler(FastAPI())
+    handler()
+    assert called.get("called") is True
+
+
 def test_get_application():
     app = get_application()
     assert isinstance(app, FastAPI)
@@ -0,0 +1,74 @@
+import gzip
+
+import brotli
+import cli.export_snapshot as export_snapshot
+from cli.export_snapshot import SnapshotWriter, diff_entities
+
+
+def test_diff_entities():
+    previous = {"a": "2026-01-01", "b": "2026-01-01", "c": "2026-01-01"}
+    current = {"a": "2026-01-01", "b": "2026-02-01", "d": "2026-02-01"}
+    changed, removed = diff_entities(previous, current)
+    assert changed == {"b", "d"}
+    assert removed == {"c"}
+
+
+def test_snapshot_writer_skips_unchanged_and_precompresses(tmp_path):
+    writer = SnapshotWriter(tmp_path, precompress=True)
+    body = b'{"data": []}' * 100
+    writer.write("v1/projects/index.json", body)
+    writer.write("v1/projects/index.json", body)
+    assert (writer.written, writer.unchanged) == (1, 1)
+
+    path = tmp_path / "v1" / "projects" / "index.json"
+    assert path.read_bytes() == body
+    gz = path.with_name("index.json.gz").read_bytes()
+    br = path.with_name("index.json.br").read_bytes()
+    assert gzip.decompress(gz) == body
+    assert brotli.decompress(br) == body
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_snapshot_writer_completes_and_drops_compressed_variants(tmp_path):
+    body = b'{"data": []}'
+    path = tmp_path / "v1" / "categories.json"
+    SnapshotWriter(tmp_path).write("v1/categories.json", body)
+    writer = SnapshotWriter(tmp_path, precompress=True)
+    writer.write("v1/categories.json", body)
+    assert writer.written == 1
+    assert gzip.decompress(path.with_name("categories.json.gz").read_bytes()) == body
+
+    path.with_name("categories.json.br").unlink()
+    writer.write("v1/categories.json", body)
+    assert brotli.decompress(path.with_name("categories.json.br").read_bytes()) == body
+
+    SnapshotWriter(tmp_path).write("v1/categories.json", b"{}")
+    assert sorted(p.name for p in path.parent.iterdir()) == ["categories.json"]
+
+
+def test_reexport_with_precompress_over_existing_snapshot(
+    pg_session, tmp_path, monkeypatch
+):
+    from db.models.category import Category
+
+    with pg_session() as db:
+        db.add(Category(name="ml", label="ML", order=0))
+        db.commit()
+    monkeypatch.setattr(export_snapshot, "SessionLocal", pg_session)
+    export_snapshot.pipeline(str(tmp_path))
+    assert not list(tmp_path.rglob("*.gz"))
+
+    export_snapshot.pipeline(str(tmp_path), precompress=True)
+    exported = [p for p in tmp_path.rglob("*.json") if p.name != "_manifest.json"]
+    assert exported
+    for path in exported:
+        gz = path.with_name(path.name + ".gz").read_bytes()
+        assert gzip.decompress(gz) == path.read_bytes()
+        assert path.with_name(path.name + ".br").exists()
+
+
+def test_snapshot_writer_remove(tmp_path):
+    writer = SnapshotWriter(tmp_path, precompress=True)
+    writer.write("v1/lab-notes/note.json", b"{}")
+    writer.remove("v1/lab-notes/note.json")
+    assert not list((tmp_path / "v1" / "lab-notes").iterdir())
@@ -0,0 +1,142 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from api.routes import predictor
+from core.errors import FeatureStoreException
+from fastapi.testclient import TestClient
+from main import app
+from services import feature_store as feature_store_module
+from services.feature_store import FeatureStore, FeatureTable
+
+from ml.features import build_features
+
+client = TestClient(app)
+
+
+def write_processed(directory, keys, offset=0.0):
+    directory.mkdir(parents=True, exist_ok=True)
+    frame = pd.DataFrame(
+        {
+            "entity_id": keys,
+            **{
+                f"feature{k}": [offset + i * 10 + k for i in range(len(keys))]
+                for k in range(1, 6)
+            },
+        }
+    )
+    frame.to_parquet(directory / "part-00000.parquet", index=False)
+
+
+@pytest.fixture
+def table_path(tmp_path):
+    processed = tmp_path / "processed"
+    write_processed(processed / "source=a", ["b", "a", "10", "2"])
+    # Later parts win for duplicate keys
+    write_processed(processed / "source=b", ["a"], offset=1000.0)
+    path = tmp_path / "features.npy"
+    assert build_features.write_feature_table(str(processed), str(path)) == 4
+    return path
+
+
+def test_table_is_sorted_and_deduplicated(table_path):
+    table = np.load(table_path)
+    assert table["key"].tolist() == [b"10", b"2", b"a", b"b"]
+    assert table["features"].shape == (4, 5)
+    assert table["features"][2].tolist() == [1001.0, 1002.0, 1003.0, 1004.0, 1005.0]
+
+
+def test_lookup(table_path):
+    table = FeatureTable(str(table_path))
+    features, found = table.lookup(["b", "missing", 10, "aa", "a" * 50])
+    assert found.tolist() == [True, False, True, False, False]
+    assert features.tolist() == [
+        [1.0, 2.0, 3.0, 4.0, 5.0],
+        [21.0, 22.0, 23.0, 24.0, 25.0],
+    ]
+    assert isinstance(table.features, np.memmap) or isinstance(
+        table.features.base, np.memmap
+    )
+
+
+def test_store_refreshes_when_the_file_is_replaced(table_path, tmp_path):
+    store = FeatureStore()
+    store.configure(str(table_path), refresh_seconds=0)
+    assert store.lookup(["new"])[1].tolist() == [False]
+
+    processed = tmp_path / "processed2"
+    write_processed(processed, ["new"])
+    build_features.write_feature_table(str(processed), str(table_path))
+    features, found = store.lookup(["new", "a"])
+    assert found.tolist() == [True, False]
+    assert features.tolist() == [[1.0, 2.0, 3.0, 4.0, 5.0]]
+
+
+def test_store_keeps_previous_table_on_a_bad_file(table_path):
+    store = FeatureStore()
+    store.configure(str(table_path), refresh_seconds=0)
+    np.save(str(table_path) + ".bad.npy", np.zeros(3))
+    os.replace(str(table_path) + ".bad.npy", table_path)
+    assert store.lookup(["a"])[1].tolist() == [True]
+
+
+def test_store_without_table(tmp_path):
+    store = FeatureStore()
+    store.configure(str(tmp_path / "missing.npy"))
+    with pytest.raises(FeatureStoreException):
+        store.lookup(["a"])
+
+
+@pytest.fixture
+def served(table_path, monkeypatch):
+    store = FeatureStore()
+    store.configure(str(table_path))
+    monkeypatch.setattr(feature_store_module, "feature_store", store)
+    monkeypatch.setattr(predictor, "feature_store", store)
+    monkeypatch.setattr(
+        predictor, "get_prediction", lambda data: (data[:, 0] < 10).astype(float)
+    )
+    monkeypatch.setattr(predictor, "SessionLocal", None)
+    monkeypatch.setattr(predictor, "DRIFT_FLAG", False)
+    return store
+
+
+def test_predict_by_key(served):
+    response = client.post("/api/v1/predict/by-key", json={"key": "b"})
+    assert response.status_code == 200
+    assert response.json() == {"prediction": 1.0, "prediction_label": "label ok"}
+
+    response = client.post("/api/v1/predict/by-key", json={"key": 10})
+    assert response.json()["prediction_label"] == "label nok"
+
+    response = client.post("/api/v1/predict/by-key", json={"key": "nope"})
+    assert response.status_code == 404
+
+
+def test_predict_by_key_batch(served):
+    response = client.post(
+        "/api/v1/predict/by-key/batch", json={"keys": ["b", "nope", 2, "a"]}
+    )
+    assert response.status_code == 200
+    assert response.json() == {
+        "predictions": [
+            {"key": "b", "prediction": 1.0, "prediction_label": "label ok"},
+            {"key": "2", "prediction": 0.0, "prediction_label": "label nok"},
+            {"key": "a", "prediction": 0.0, "prediction_label": "label nok"},
+        ],
+        "missing": ["nope"],
+    }
+
+    response = client.post("/api/v1/predict/by-key/batch", json={"keys": ["nope"]})
+    assert response.json() == {"predictions": [], "missing": ["nope"]}
+    response = client.post("/api/v1/predict/by-key/batch", json={"keys": []})
+    assert response.status_code == 422
+
+
+def test_predict_by_key_without_table(monkeypatch, tmp_path):
+    store = FeatureStore()
+    store.configure(str(tmp_path / "missing.npy"))
+    monkeypatch.setattr(predictor, "feature_store", store)
+    response = client.post("/api/v1/predict/by-key", json={"key": "a"})
+    assert response.status_code == 503
@@ -0,0 +1,72 @@
+from multiprocessing.shared_memory import SharedMemory
+
+import joblib
+import numpy as np
+import pytest
+from core import events
+from fastapi import FastAPI
+from services.inference_pool import InferencePool
+from sklearn.linear_model import LogisticRegression
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="module")
+def model(tmp_path_factory):
+    directory = tmp_path_factory.mktemp("model")
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(200, 5))
+    estimator = LogisticRegression().fit(features, features[:, 0] > 0)
+    joblib.dump(estimator, directory / "model.pkl")
+    return directory, estimator
+
+
+@pytest.fixture
+def pool(model, monkeypatch):
+    # Spawned workers load the model configured in their environment
+    monkeypatch.setenv("MODEL_PATH", str(model[0]))
+    monkeypatch.setenv("MODEL_NAME", "model.pkl")
+    pool = InferencePool()
+    pool.start(workers=1, slot_bytes=256)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.mark.anyio
+async def test_predictions_match_in_process_model(pool, model):
+    estimator = model[1]
+    rng = np.random.default_rng(1)
+    small = rng.normal(size=(3, 5))  # fits a shared memory slot
+    large = rng.normal(size=(50, 5))  # pickled
+
+    for data in (small, large, small[:1]):
+        result = await pool.predict(data)
+        np.testing.assert_array_equal(result, estimator.predict(data))
+
+    assert pool.free.qsize() == len(pool.slots)
+
+
+@pytest.mark.anyio
+async def test_shutdown_releases_shared_memory(pool):
+    names = [slot.name for slot in pool.slots]
+    pool.shutdown()
+
+    assert not pool.running
+    for name in names:
+        with pytest.raises(FileNotFoundError):
+            SharedMemory(name=name)
+
+
+def test_start_handler_uses_process_backend(monkeypatch):
+    called = []
+    monkeypatch.setattr(events, "INFERENCE_BACKEND", "process")
+    monkeypatch.setattr(events, "start_inference_pool", lambda: called.append("pool"))
+    monkeypatch.setattr(events, "preload_model", lambda: called.append("preload"))
+    monkeypatch.setattr(events, "build_suggestion_index", lambda: None)
+
+    events.create_start_app_handler(FastAPI())()
+
+    assert called == ["pool"]
@@ -0,0 +1,121 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta, timezone
+
+import httpx
+import pyarrow.parquet as pq
+import pytest
+from api.dependencies import get_current_admin
+from api.routes import request_logs
+from db.models.log import RequestLog
+from services import log_export
+from sqlalchemy import insert, text
+
+START = datetime(2024, 3, 1, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def logs(pg_session):
+    """1000 logs one minute apart from START, half of them from model v2."""
+    with pg_session() as db:
+        db.execute(
+            insert(RequestLog),
+            [
+                {
+                    "created_at": START + timedelta(minutes=i),
+                    "model_version": "v2" if i % 2 else "v1",
+                    "latency_ms": 1.5,
+                    **{f"feature{k}": float(i * k) for k in range(1, 6)},
+                    "prediction": float(i % 2),
+                    "prediction_label": "label ok" if i % 2 else "label nok",
+                }
+                for i in range(1000)
+            ],
+        )
+        db.commit()
+    yield pg_session
+    with pg_session() as db:
+        db.execute(text("TRUNCATE request_logs"))
+        db.commit()
+
+
+def test_chunks_are_bounded_by_chunk_size(logs):
+    chunks = list(
+        log_export.iter_chunks(
+            logs, START, START + timedelta(minutes=250), chunk_size=100
+        )
+    )
+    assert [len(c) for c in chunks] == [100, 100, 50]
+    assert chunks[0][0][1] == START
+
+
+def test_ndjson(logs):
+    body = b"".join(
+        log_export.export(
+            logs, "ndjson", START, START + timedelta(hours=1), model_version="v2"
+        )
+    )
+    rows = [json.loads(line) for line in body.decode().splitlines()]
+    assert len(rows) == 30
+    assert rows[0]["model_version"] == "v2"
+    assert rows[0]["feature3"] == 3.0
+    assert datetime.fromisoformat(rows[0]["created_at"]) == START + timedelta(minutes=1)
+
+
+def test_csv(logs):
+    body = b"".join(
+        log_export.export(
+            logs, "csv", START, START + timedelta(minutes=10), chunk_size=3
+        )
+    )
+    rows = list(csv.DictReader(io.StringIO(body.decode())))
+    assert len(rows) == 10
+    assert float(rows[9]["feature5"]) == 45.0
+
+    empty = b"".join(log_export.export(logs, "csv", START - timedelta(days=1), START))
+    assert empty.decode().splitlines() == [",".join(log_export.COLUMNS)]
+
+
+def test_parquet_has_one_row_group_per_chunk(logs):
+    body = b"".join(
+        log_export.export(
+            logs, "parquet", START, START + timedelta(days=1), chunk_size=400
+        )
+    )
+    parquet = pq.ParquetFile(io.BytesIO(body))
+    assert parquet.metadata.num_rows == 1000
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.column_names == list(log_export.COLUMNS)
+    assert table.column("created_at")[0].as_py() == START
+
+
+@pytest.mark.anyio
+async def test_export_endpoint_streams_attachment(logs, monkeypatch):
+    from main import get_application
+
+    app = get_application()
+    app.dependency_overrides[get_current_admin] = lambda: "admin"
+    monkeypatch.setattr(request_logs, "SessionLocal", logs)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        response = await client.get(
+            "/api/v1/admin/request-logs/export",
+            params={"start": "2024-03-01T00:00:00", "end": "2024-03-01T00:05:00"},
+        )
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/x-ndjson"
+        assert "attachment" in response.headers["content-disposition"]
+        assert len(response.text.splitlines()) == 5
+
+        response = await client.get(
+            "/api/v1/admin/request-logs/export",
+            params={"start": "2024-03-02T00:00:00", "end": "2024-03-01T00:00:00"},
+        )
+        assert response.status_code == 400
@@ -0,0 +1,115 @@
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from ml.data import make_dataset
+
+
+@pytest.fixture
+def raw(tmp_path):
+    raw = tmp_path / "raw"
+    (raw / "2024").mkdir(parents=True)
+    rows = [
+        {**{f"feature{k}": float(i + k) for k in range(1, 6)}, "target": i % 2}
+        for i in range(25)
+    ]
+    pd.DataFrame(rows).to_csv(raw / "a.csv", index=False)
+    bad = [
+        {**rows[0], "feature1": None},
+        {**rows[0], "feature2": "n/a"},
+        {**rows[0], "feature3": float("inf")},
+    ]
+    with open(raw / "2024" / "b.jsonl", "w") as f:
+        for row in rows[:10] + bad:
+            f.write(json.dumps(row) + "\n")
+    return raw
+
+
+def test_clean_drops_invalid_rows():
+    chunk = pd.DataFrame(
+        {
+            **{f"feature{k}": ["1", "2", "x"] for k in range(1, 6)},
+            "target": [0, None, 1],
+            "extra": ["a", "b", "c"],
+        }
+    )
+    cleaned = make_dataset.clean(chunk)
+    assert list(cleaned.columns) == make_dataset.FEATURES + ["target"]
+    assert cleaned.to_dict("records") == [
+        {**{f"feature{k}": 1.0 for k in range(1, 6)}, "target": 0.0}
+    ]
+
+
+def test_clean_requires_features():
+    with pytest.raises(ValueError, match="feature5"):
+        make_dataset.clean(pd.DataFrame({f"feature{k}": [1.0] for k in range(1, 5)}))
+
+
+def test_pipeline_writes_partitioned_parquet(raw, tmp_path):
+    out = tmp_path / "interim"
+    totals = make_dataset.pipeline(str(raw), str(out), chunksize=10, workers=2)
+    assert totals == {"files": 2, "rows_in": 38, "rows_out": 35, "failed": 0}
+
+    parts = sorted(p.relative_to(out).as_posix() for p in out.rglob("*.parquet"))
+    assert parts == [
+        "source=2024%2Fb.jsonl/part-00000.parquet",
+        "source=a.csv/part-00000.parquet",
+        "source=a.csv/part-00001.parquet",
+        "source=a.csv/part-00002.parquet",
+    ]
+    dataset = pd.read_parquet(out)
+    assert len(dataset) == 35
+    assert set(dataset["source"]) == {"a.csv", "2024/b.jsonl"}
+    assert dataset["feature1"].dtype == "float64"
+
+
+def test_partition_names_are_unique(tmp_path):
+    paths = [Path("x.csv"), Path("x.jsonl"), Path("a/b.csv"), Path("a__b.csv")]
+    names = {make_dataset.partition_name(tmp_path / p, tmp_path) for p in paths}
+    assert len(names) == len(paths)
+
+
+def test_resume_skips_unchanged_files(raw, tmp_path):
+    out = tmp_path / "interim"
+    make_dataset.pipeline(str(raw), str(out), workers=1)
+    checkpoint = json.loads((out / make_dataset.CHECKPOINT).read_text())
+    assert checkpoint["source=a.csv"]["rows_out"] == 25
+
+    totals = make_dataset.pipeline(str(raw), str(out), workers=1, resume=True)
+    assert totals["files"] == 0
+
+    # Changed files and files left mid-way are processed again
+    pd.DataFrame([{f"feature{k}": 1.0 for k in range(1, 6)}]).to_csv(
+        raw / "a.csv", index=False
+    )
+    (out / "source=c.csv.tmp").mkdir()
+    pd.DataFrame([{f"feature{k}": 2.0 for k in range(1, 6)}]).to_csv(
+        raw / "c.csv", index=False
+    )
+    totals = make_dataset.pipeline(str(raw), str(out), workers=1, resume=True)
+    assert totals["files"] == 2
+    assert not (out / "source=c.csv.tmp").exists()
+    assert len(pd.read_parquet(out / "source=a.csv")) == 1
+
+
+def test_failed_file_is_not_checkpointed(raw, tmp_path):
+    (raw / "broken.csv").write_text("feature1,feature2\n1,2\n")
+    out = tmp_path / "interim"
+    totals = make_dataset.pipeline(str(raw), str(out), workers=1)
+    assert totals["failed"] == 1
+    checkpoint = json.loads((out / make_dataset.CHECKPOINT).read_text())
+    assert "source=broken.csv" not in checkpoint
+
+
+def test_clean_keeps_entity_ids_as_strings():
+    chunk = pd.DataFrame(
+        {
+            "entity_id": [7.0, None, 9.0],
+            **{f"feature{k}": [1.0, 2.0, 3.0] for k in range(1, 6)},
+        }
+    )
+    cleaned = make_dataset.clean(chunk)
+    assert cleaned["entity_id"].tolist() == ["7", "9"]
+    assert list(cleaned.columns) == ["entity_id", *make_dataset.FEATURES]
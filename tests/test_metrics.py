@@ -0,0 +1,86 @@
+import core.metrics as metrics
+import services.predict as predict
+from fastapi.testclient import TestClient
+from main import get_application
+from prometheus_client import REGISTRY
+from sqlalchemy import create_engine, text
+
+
+def sample(name, labels=None):
+    return REGISTRY.get_sample_value(name, labels or {}) or 0.0
+
+
+def test_metrics_endpoint_records_route_templates():
+    client = TestClient(get_application())
+    labels = {"method": "GET", "route": "/api/v1/suggest", "status": "200"}
+    before = sample("http_requests_total", labels)
+
+    client.get("/api/v1/suggest", params={"q": "fast"})
+    client.get("/api/v1/suggest", params={"q": "slow"})
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert sample("http_requests_total", labels) == before + 2
+    assert "threadpool_queue_depth" in response.text
+    assert 'route="/api/v1/suggest"' in response.text
+
+
+def test_unmatched_routes_share_one_label():
+    client = TestClient(get_application())
+    labels = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("http_requests_total", labels)
+    client.get("/nope/1")
+    client.get("/nope/2")
+    assert sample("http_requests_total", labels) == before + 2
+
+
+def test_db_queries_counted_per_request():
+    engine = create_engine("sqlite://")
+    metrics.instrument_engine(engine)
+    metrics.instrument_engine(engine)
+
+    stats = [0, 0.0]
+    token = metrics._request_db_stats.set(stats)
+    try:
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+            conn.execute(text("SELECT 2"))
+    finally:
+        metrics._request_db_stats.reset(token)
+
+    assert stats[0] == 2
+    assert stats[1] > 0
+
+
+def test_engine_is_not_instrumented_without_metrics():
+    import os
+    import subprocess
+    import sys
+    from pathlib import Path
+
+    script = (
+        "from sqlalchemy import event; from core.metrics import "
+        "_before_cursor_execute as hook; from db.session import engine; "
+        "print(event.contains(engine, 'before_cursor_execute', hook))"
+    )
+    for flag, expected in (("false", "False"), ("true", "True")):
+        result = subprocess.run(
+            [sys.executable, "-c", script],
+            cwd=Path(__file__).resolve().parents[1] / "app",
+            env={**os.environ, "METRICS_FLAG": flag},
+            capture_output=True,
+            text=True,
+        )
+        assert result.stdout.strip() == expected, result.stderr
+
+
+def test_model_inference_is_timed(monkeypatch):
+    class DummyModel:
+        def predict(self, data):
+            return [1]
+
+    monkeypatch.setattr(predict.MachineLearningModelHandlerScore, "model", DummyModel())
+    before = sample("model_inference_duration_seconds_count")
+    predict.MachineLearningModelHandlerScore.predict([[1]])
+    assert sample("model_inference_duration_seconds_count") == before + 1
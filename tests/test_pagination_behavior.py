@@ -1,5 +1,10 @@
 import pytest
-from core.paginator import pagenation
+from core.paginator import (
+    decode_cursor,
+    encode_cursor,
+    keyset_pagination,
+    pagenation,
+)
 
 """
 In order to test behavior of pagenation function
@@ -38,3 +43,26 @@ def test_pagenation_400_start_1_true_with_page_0():
     """Exception case"""
     with pytest.raises(Exception, match=r".* starts > 0. *"):
         pagenation(0, 20, 400, list(range(400)))
+
+
+def test_cursor_roundtrip():
+    position = {"rank": 0.10000000149011612, "type": "project", "id": "abc"}
+    cursor = encode_cursor(position)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == position
+
+
+def test_decode_cursor_invalid():
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor!")
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([1, 2]))
+
+
+def test_keyset_pagination():
+    assert keyset_pagination(10, "abc") == {
+        "limit": 10,
+        "nextCursor": "abc",
+        "hasMore": True,
+    }
+    assert keyset_pagination(10, None)["hasMore"] is False
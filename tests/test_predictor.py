@@ -1,9 +1,12 @@
 import json
 from pathlib import Path
 
+import pytest
 from api.routes import predictor
+from fastapi import FastAPI
 from fastapi.testclient import TestClient
 from main import app
+from schemas.prediction import MachineLearningDataInput, MachineLearningResponse
 
 client = TestClient(app)
 
@@ -42,3 +45,82 @@ def test_health_endpoint(monkeypatch):
     response = client.get("/api/v1/health")
     assert response.status_code == 200
     assert response.json() == {"status": True}
+
+
+def reference_client():
+    """A pydantic-typed /predict, as the route was declared before the fast
+    path, to compare responses with.
+    """
+    reference = FastAPI()
+
+    @reference.post("/api/v1/predict", response_model=MachineLearningResponse)
+    async def typed_predict(data_input: MachineLearningDataInput):
+        return await predictor.predict(data_input)
+
+    return TestClient(reference)
+
+
+@pytest.mark.parametrize(
+    "body, content_type",
+    [
+        (
+            b'{"feature1": 1, "feature2": 2.5, "feature3": -3e-7, "feature4": 0,'
+            b' "feature5": 1e300, "extra": "ignored"}',
+            "application/json",
+        ),
+        (
+            b'{"feature1": "1.5", "feature2": 2, "feature3": 3, "feature4": 4,'
+            b' "feature5": 5}',
+            "application/json",
+        ),
+        (
+            b'{"feature1": 1, "feature2": 2, "feature3": 3, "feature4": 4,'
+            b' "feature5": 5}',
+            "",
+        ),
+        (
+            b'{"feature1": "x", "feature2": 2, "feature3": 3, "feature4": 4}',
+            "application/json",
+        ),
+        (
+            b'{"feature1": true, "feature2": null, "feature3": [], "feature4": 4,'
+            b' "feature5": 1e400}',
+            "application/json",
+        ),
+        (
+            b'{"feature1": 1, "feature2": 2, "feature3": 3, "feature4": 4,'
+            b' "feature5": 5}',
+            "text/plain",
+        ),
+        (b'{"feature1": 1,', "application/json"),
+        (b"[1, 2, 3, 4, 5]", "application/json"),
+        (b"null", "application/json"),
+        (b"", "application/json"),
+        (b"\xff", "application/json"),
+    ],
+)
+def test_predict_matches_pydantic_route(monkeypatch, body, content_type):
+    monkeypatch.setattr(predictor, "get_prediction", lambda data_point: [1.0])
+    monkeypatch.setattr(predictor, "write_request_logs", lambda rows: None)
+    headers = {"content-type": content_type} if content_type else {}
+    expected = reference_client().post("/api/v1/predict", content=body, headers=headers)
+    response = client.post("/api/v1/predict", content=body, headers=headers)
+    assert response.status_code == expected.status_code
+    assert response.content == expected.content
+
+
+def test_predict_logs_parsed_features(monkeypatch):
+    logged = []
+    monkeypatch.setattr(predictor, "get_prediction", lambda data_point: [0.0])
+    monkeypatch.setattr(predictor, "write_request_logs", logged.extend)
+    response = client.post("/api/v1/predict", json=sample_input())
+    assert response.json()["prediction_label"] == "label nok"
+    (row,) = logged
+    assert {name: row[name] for name in sample_input()} == sample_input()
+    assert row["prediction"] == 0.0
+
+
+def test_predict_schema_is_documented():
+    body = app.openapi()["paths"]["/api/v1/predict"]["post"]["requestBody"]
+    schema = body["content"]["application/json"]["schema"]
+    assert schema["required"] == [f"feature{k}" for k in range(1, 6)]
@@ -0,0 +1,114 @@
+"""SQL statement budgets per endpoint, independent of page size and row counts."""
+
+from datetime import date
+
+import pytest
+from db.models.category import Category
+from db.models.lab_notes import LabNote
+from db.models.projects import Project
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+def seed(session_local, categories: int, projects: int, lab_notes: int) -> dict:
+    with session_local() as db:
+        cats = [
+            Category(name=f"category-{i}", label=f"Category {i}", order=i)
+            for i in range(categories)
+        ]
+        db.add_all(cats)
+        db.flush()
+        db.add_all(
+            Project(
+                slug=f"project-{i}",
+                title=f"Project {i}",
+                description="Description",
+                tags=["python"],
+                category_id=cats[i % categories].id,
+                year="2024",
+                order=i,
+                published=i % 5 != 0,
+            )
+            for i in range(projects)
+        )
+        db.add_all(
+            LabNote(
+                slug=f"note-{i}",
+                title=f"Note {i}",
+                excerpt="Excerpt",
+                content="# Heading\n\nBody",
+                content_html="<h1>Heading</h1><p>Body</p>",
+                toc=[],
+                tags=["python", f"tag-{i % 3}"],
+                read_time="1 min read",
+                date=date(2024, 1, 1 + i % 28),
+                published=True,
+            )
+            for i in range(lab_notes)
+        )
+        db.commit()
+        return {"category_id": str(cats[0].id)}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 10, 50])
+async def test_projects_list_budget(pg_session, query_budget, limit):
+    ids = seed(pg_session, categories=4, projects=100, lab_notes=0)
+
+    response = await query_budget("GET", "/api/v1/projects", 2, params={"limit": limit})
+    assert len(response.json()["data"]) == limit
+
+    await query_budget(
+        "GET",
+        "/api/v1/projects",
+        2,
+        params={"limit": limit, "category_id": ids["category_id"]},
+    )
+
+
+@pytest.mark.anyio
+async def test_project_detail_budget(pg_session, query_budget):
+    seed(pg_session, categories=2, projects=3, lab_notes=0)
+    await query_budget("GET", "/api/v1/projects/project-1", 1)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("categories", [1, 5, 20])
+async def test_categories_with_counts_budget(pg_session, query_budget, categories):
+    seed(pg_session, categories=categories, projects=40, lab_notes=0)
+
+    response = await query_budget(
+        "GET", "/api/v1/categories", 2, params={"include_counts": "true"}
+    )
+
+    data = response.json()["data"]
+    assert len(data) == categories + 1
+    assert data[0]["count"] == 32  # every fifth project is unpublished
+    assert sum(c["count"] for c in data[1:]) == data[0]["count"]
+
+
+@pytest.mark.anyio
+async def test_categories_budget(pg_session, query_budget):
+    seed(pg_session, categories=10, projects=0, lab_notes=0)
+    await query_budget("GET", "/api/v1/categories", 1)
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("limit", [1, 10, 50])
+async def test_lab_notes_list_budget(pg_session, query_budget, limit):
+    seed(pg_session, categories=1, projects=0, lab_notes=60)
+
+    response = await query_budget(
+        "GET", "/api/v1/lab-notes", 2, params={"limit": limit}
+    )
+    assert len(response.json()["data"]) == limit
+
+
+@pytest.mark.anyio
+async def test_lab_note_detail_and_tags_budget(pg_session, query_budget):
+    seed(pg_session, categories=1, projects=0, lab_notes=10)
+    await query_budget("GET", "/api/v1/lab-notes/note-1", 1)
+    await query_budget("GET", "/api/v1/lab-notes/tags", 1)
@@ -0,0 +1,42 @@
+from services.render import estimate_read_time, render_lab_note
+
+
+def test_render_markdown_headings_and_toc():
+    rendered = render_lab_note("# Title\n\n## Setup *fast*\n\ntext\n\n### Details\n")
+    assert '<h2 id="setup-fast">Setup <em>fast</em></h2>' in rendered["html"]
+    assert rendered["toc"] == [
+        {"level": 2, "id": "setup-fast", "title": "Setup fast"},
+        {"level": 3, "id": "details", "title": "Details"},
+    ]
+
+
+def test_render_sanitizes_html():
+    rendered = render_lab_note(
+        "<script>alert(1)</script>\n\n<a href='javascript:x' onclick='y'>link</a>"
+    )
+    assert "<script" not in rendered["html"]
+    assert "onclick" not in rendered["html"]
+    assert "javascript:" not in rendered["html"]
+
+
+def test_render_highlights_code_and_keeps_dollars_in_code():
+    rendered = render_lab_note("```python\nprint('$x$')\n```\n\nuse `$y$` here")
+    assert '<div class="highlight">' in rendered["html"]
+    assert '<span class="nb">print</span>' in rendered["html"]
+    assert "math" not in rendered["html"]
+    assert "<code>$y$</code>" in rendered["html"]
+
+
+def test_render_math():
+    rendered = render_lab_note(
+        "inline $a_b < c$ costs $5 and $10\n\n$$\n\\sum_i x_i\n$$"
+    )
+    html = rendered["html"]
+    assert '<span class="math inline">\\(a_b &lt; c\\)</span>' in html
+    assert "$5 and $10" in html
+    assert '<div class="math display">\\[\\sum_i x_i\\]</div>' in html
+
+
+def test_estimate_read_time():
+    assert estimate_read_time("") == "1 min read"
+    assert estimate_read_time("word " * 1000) == "5 min read"
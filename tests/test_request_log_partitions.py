@@ -0,0 +1,191 @@
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+from db import request_logs
+from db.models.log import RequestLog, RequestLogHourly
+from sqlalchemy import insert, select, text
+
+
+@pytest.fixture
+def db(pg_session):
+    with pg_session() as session:
+        yield session
+        session.rollback()
+        for partition in request_logs.list_partitions(session):
+            session.execute(text(f"DROP TABLE {partition['name']}"))
+        session.execute(text("TRUNCATE request_logs, request_log_hourly"))
+        session.commit()
+
+
+def log_row(created_at: datetime, latency_ms: float, label: str = "label ok") -> dict:
+    return {
+        "created_at": created_at,
+        "model_version": "v1",
+        "latency_ms": latency_ms,
+        "feature1": 1.0,
+        "feature2": 2.0,
+        "feature3": 3.0,
+        "feature4": 4.0,
+        "feature5": 5.0,
+        "prediction": 1.0 if label == "label ok" else 0.0,
+        "prediction_label": label,
+    }
+
+
+def test_create_partitions_is_idempotent(db):
+    created = request_logs.create_partitions(db, date(2020, 11, 15), months=3)
+    assert created == [
+        "request_logs_p202011",
+        "request_logs_p202012",
+        "request_logs_p202101",
+    ]
+    assert request_logs.create_partitions(db, date(2020, 12, 1), months=3) == [
+        "request_logs_p202102"
+    ]
+    partitions = request_logs.list_partitions(db)
+    assert partitions[0] == {
+        "name": "request_logs_p202011",
+        "start": date(2020, 11, 1),
+        "end": date(2020, 12, 1),
+    }
+
+    db.execute(
+        insert(RequestLog),
+        [
+            log_row(datetime(2020, 12, 31, 23, 59, tzinfo=timezone.utc), 1.0),
+            log_row(datetime(2019, 1, 1, tzinfo=timezone.utc), 1.0),
+        ],
+    )
+    placed = db.execute(
+        text(
+            "SELECT tableoid::regclass::text FROM request_logs "
+            "WHERE created_at < '2021-01-01'"
+        )
+    )
+    assert sorted(placed.scalars()) == ["request_logs_default", "request_logs_p202012"]
+
+
+def test_create_partitions_recovers_rows_in_the_default_partition(db):
+    request_logs.create_partitions(db, date(2021, 1, 1), months=1)
+    db.execute(
+        insert(RequestLog),
+        [
+            log_row(datetime(2021, 2, 1, tzinfo=timezone.utc), 1.0),
+            log_row(datetime(2021, 2, 28, 23, 59, tzinfo=timezone.utc), 2.0),
+            log_row(datetime(2021, 3, 1, tzinfo=timezone.utc), 3.0),
+        ],
+    )
+    db.commit()
+
+    assert request_logs.create_partitions(db, date(2021, 1, 1), months=2) == [
+        "request_logs_p202102"
+    ]
+    placed = db.execute(
+        text(
+            "SELECT tableoid::regclass::text, latency_ms FROM request_logs "
+            "ORDER BY latency_ms"
+        )
+    ).all()
+    assert placed == [
+        ("request_logs_p202102", 1.0),
+        ("request_logs_p202102", 2.0),
+        ("request_logs_default", 3.0),
+    ]
+    # The default partition is attached again and still catches strays
+    db.execute(
+        insert(RequestLog), [log_row(datetime(2030, 1, 1, tzinfo=timezone.utc), 4.0)]
+    )
+    assert db.scalar(text("SELECT count(*) FROM request_logs_default")) == 2
+
+
+def test_startup_creates_partitions(db, pg_session, monkeypatch):
+    from core import events
+    from db import session
+
+    monkeypatch.setattr(session, "SessionLocal", pg_session)
+    monkeypatch.setattr(session, "engine", db.get_bind())
+    events.create_request_log_partitions()
+    names = [p["name"] for p in request_logs.list_partitions(db)]
+    assert request_logs.partition_name(date.today()) in names
+    assert len(names) == 3
+
+
+def test_drop_partitions_keeps_the_retention_window(db):
+    request_logs.create_partitions(db, date(2020, 1, 1), months=3)
+    db.execute(
+        insert(RequestLog),
+        [
+            log_row(datetime(2020, month, 10, tzinfo=timezone.utc), 1.0)
+            for month in (1, 2, 3)
+        ],
+    )
+    db.commit()
+
+    dropped = request_logs.drop_partitions(db, older_than=date(2020, 3, 1))
+
+    assert dropped == ["request_logs_p202001", "request_logs_p202002"]
+    months = db.scalars(select(RequestLog.created_at)).all()
+    assert [m.month for m in months] == [3]
+
+
+def test_purge_default_deletes_expired_strays(db):
+    db.execute(
+        insert(RequestLog),
+        [
+            log_row(datetime(2020, 1, 10, tzinfo=timezone.utc), 1.0),
+            log_row(datetime(2020, 3, 10, tzinfo=timezone.utc), 2.0),
+        ],
+    )
+    db.commit()
+
+    assert request_logs.purge_default(db, older_than=date(2020, 3, 1)) == 1
+    assert db.scalars(select(RequestLog.latency_ms)).all() == [2.0]
+
+
+def test_retention_purges_the_default_partition(db, pg_session, monkeypatch):
+    from cli import request_logs as cli
+
+    recent = datetime.now(timezone.utc) - timedelta(days=1)
+    db.execute(
+        insert(RequestLog),
+        [
+            log_row(datetime(2020, 1, 10, tzinfo=timezone.utc), 1.0),
+            log_row(recent, 2.0),
+        ],
+    )
+    db.commit()
+
+    monkeypatch.setattr(cli, "SessionLocal", pg_session)
+    cli.apply_retention(days=90)
+    assert db.scalars(select(RequestLog.latency_ms)).all() == [2.0]
+
+
+def test_rollup_aggregates_complete_hours(db):
+    hour = datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    rows = [log_row(hour + timedelta(minutes=i), float(i + 1)) for i in range(20)]
+    rows.append(log_row(hour + timedelta(minutes=30), 100.0, label="label nok"))
+    rows.append(log_row(hour + timedelta(hours=1), 5.0))
+    db.execute(insert(RequestLog), rows)
+    db.commit()
+
+    assert request_logs.rollup(db, hour, hour + timedelta(hours=1)) == 2
+    # Re-running overwrites instead of double counting
+    assert request_logs.rollup(db, hour, hour + timedelta(hours=1)) == 2
+
+    hourly = {
+        r.prediction_label: r
+        for r in db.scalars(select(RequestLogHourly).order_by(RequestLogHourly.hour))
+    }
+    assert hourly["label ok"].requests == 20
+    assert hourly["label ok"].mean_latency_ms == pytest.approx(10.5)
+    assert hourly["label ok"].p95_latency_ms == pytest.approx(19.05)
+    assert hourly["label ok"].max_latency_ms == 20.0
+    assert hourly["label nok"].requests == 1
+    assert hourly["label nok"].mean_prediction == 0.0
+
+
+def test_last_complete_hour():
+    now = datetime(2024, 5, 1, 10, 42, 7, tzinfo=timezone.utc)
+    assert request_logs.last_complete_hour(now) == datetime(
+        2024, 5, 1, 10, tzinfo=timezone.utc
+    )
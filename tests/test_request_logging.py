@@ -1,4 +1,3 @@
-import json
 import os
 
 import pytest
@@ -42,6 +41,10 @@ async def test_predict_logs_request_response(monkeypatch):
     logs = db.query(RequestLog).all()
     assert len(logs) == 1
     log = logs[0]
-    assert json.loads(log.request) == data.model_dump()
-    assert json.loads(log.response) == response.model_dump()
+    assert log.created_at is not None
+    assert log.model_version == predictor.MODEL_VERSION
+    assert log.latency_ms >= 0
+    assert [getattr(log, name) for name in payload] == list(payload.values())
+    assert log.prediction == 1.0
+    assert log.prediction_label == response.prediction_label
     db.close()
@@ -0,0 +1,30 @@
+from api.routes.search import build_search_query
+from fastapi.testclient import TestClient
+from main import app
+from sqlalchemy.dialects import postgresql
+
+client = TestClient(app)
+
+
+def compile_sql(statement):
+    return str(statement.compile(dialect=postgresql.dialect()))
+
+
+def test_search_query_filters_by_type():
+    sql = compile_sql(build_search_query("python", "lab_note", 10, None))
+    assert "lab_notes.search_vector @@ websearch_to_tsquery" in sql
+    assert "projects" not in sql
+    assert "UNION ALL" not in sql
+
+
+def test_search_query_keyset_condition():
+    after = {"rank": 0.5, "type": "project", "id": "1"}
+    sql = compile_sql(build_search_query("python", None, 10, after))
+    assert "UNION ALL" in sql
+    assert "(-anon_2.rank, anon_2.type, anon_2.id) >" in sql
+    assert "ts_headline" in sql
+
+
+def test_search_rejects_invalid_cursor():
+    response = client.get("/api/v1/search", params={"q": "python", "cursor": "x!"})
+    assert response.status_code == 400
@@ -0,0 +1,97 @@
+import db.profiler as profiler
+from sqlalchemy import create_engine, event, text
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+from starlette.testclient import TestClient
+
+
+def test_normalize_sql_collapses_literals_and_params():
+    assert profiler.normalize_sql(
+        "SELECT *  FROM projects\n WHERE id = %(id_1)s AND title = 'x''y' LIMIT 10"
+    ) == ("SELECT * FROM projects WHERE id = ? AND title = ? LIMIT ?")
+    assert profiler.normalize_sql(
+        "SELECT * FROM t WHERE id IN (%(id_1_1)s, %(id_1_2)s, %(id_1_3)s)"
+    ) == profiler.normalize_sql("SELECT * FROM t WHERE id IN (%(id_1_1)s)")
+    assert "anon_1" in profiler.normalize_sql("SELECT anon_1.id FROM anon_1")
+
+
+def test_repeated_statement_shapes_are_flagged():
+    engine = create_engine("sqlite://")
+    profiler.attach_profiler(engine)
+    profiler.attach_profiler(engine)
+
+    with profiler.profile_queries("loop") as profile, engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        for i in range(4):
+            conn.execute(text("SELECT :i AS value"), {"i": i})
+
+    assert profile.query_count == 5
+    flagged = profile.n_plus_one(threshold=3)
+    assert len(flagged) == 1
+    assert flagged[0]["sql"] == "SELECT ? AS value"
+    assert flagged[0]["count"] == 4
+    assert profile.n_plus_one(threshold=5) == []
+
+
+def test_statements_outside_a_profile_are_ignored():
+    engine = create_engine("sqlite://")
+    profiler.attach_profiler(engine)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        with profiler.profile_queries() as profile:
+            conn.execute(text("SELECT 2"))
+        conn.execute(text("SELECT 3"))
+
+    assert [s["sql"] for s in profile.statements] == ["SELECT ?"]
+
+
+def test_disabled_profiler_attaches_no_listeners():
+    engine = create_engine("sqlite://")
+    assert not event.contains(
+        engine, "before_cursor_execute", profiler._before_cursor_execute
+    )
+
+
+def test_middleware_adds_header_and_records_profile(monkeypatch):
+    engine = create_engine("sqlite://")
+    profiler.attach_profiler(engine)
+    monkeypatch.setattr(profiler, "recent_profiles", profiler.deque(maxlen=2))
+
+    async def endpoint(request):
+        with engine.connect() as conn:
+            for i in range(3):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return JSONResponse({"ok": True})
+
+    app = Starlette(routes=[Route("/items", endpoint)])
+    client = TestClient(profiler.SQLProfilerMiddleware(app, n_plus_one_threshold=3))
+
+    response = client.get("/items")
+
+    assert response.headers["X-SQL-Profile"].startswith("queries=3;")
+    assert response.headers["X-SQL-Profile"].endswith("n_plus_one=1")
+    (summary,) = profiler.recent_profiles
+    assert summary["label"] == "GET /items"
+    assert summary["n_plus_one"][0]["count"] == 3
+
+
+def test_sql_profiles_endpoint(monkeypatch):
+    import api.routes.debug as debug
+    from api.dependencies import get_current_admin
+    from main import get_application
+
+    app = get_application()
+    app.dependency_overrides[get_current_admin] = lambda: "admin"
+    client = TestClient(app)
+    url = "/api/v1/admin/debug/sql-profiles"
+
+    assert client.get(url).status_code == 404
+
+    monkeypatch.setattr(debug, "SQL_PROFILER_FLAG", True)
+    clean = {"label": "GET /a", "n_plus_one": []}
+    noisy = {"label": "GET /b", "n_plus_one": [{"sql": "SELECT ?", "count": 5}]}
+    monkeypatch.setattr(debug, "recent_profiles", profiler.deque([clean, noisy]))
+
+    assert client.get(url).json()["data"] == [noisy, clean]
+    assert client.get(url, params={"n_plus_one_only": True}).json()["data"] == [noisy]
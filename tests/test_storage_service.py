@@ -0,0 +1,234 @@
+import hashlib
+import io
+import re
+from datetime import date
+
+import aioboto3
+import pytest
+import services.storage as storage
+from botocore.exceptions import ClientError
+from fastapi import HTTPException
+
+
+class FakeS3:
+    def __init__(self):
+        self.objects = {}
+        self.deleted = []
+        self.uploaded = []
+        self.heads = []
+        self.batches = []
+        self.failing_keys = set()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def generate_presigned_url(self, operation, **kwargs):
+        params = kwargs["Params"]
+        return f"https://r2.example/{params['Bucket']}/{params['Key']}?op={operation}"
+
+    async def head_object(self, **kwargs):
+        key = kwargs["Key"]
+        self.heads.append(key)
+        if key not in self.objects:
+            raise ClientError({"Error": {"Code": "404"}}, "HeadObject")
+        return {"ContentType": self.objects[key]}
+
+    async def upload_fileobj(self, fileobj, bucket, key, ExtraArgs):  # noqa: N803
+        assert fileobj.read() != b""
+        self.uploaded.append(key)
+        self.objects[key] = ExtraArgs["ContentType"]
+
+    async def delete_objects(self, **kwargs):
+        keys = [obj["Key"] for obj in kwargs["Delete"]["Objects"]]
+        self.batches.append(keys)
+        return {
+            "Errors": [
+                {"Key": key, "Code": "AccessDenied", "Message": "denied"}
+                for key in keys
+                if key in self.failing_keys
+            ]
+        }
+
+    async def delete_object(self, **kwargs):
+        self.deleted.append(kwargs["Key"])
+        self.objects.pop(kwargs["Key"], None)
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+    s3 = FakeS3()
+
+    class FakeSession:
+        def client(self, *args, **kwargs):
+            return s3
+
+    monkeypatch.setattr(aioboto3, "Session", FakeSession)
+    return s3
+
+
+@pytest.fixture
+def service(monkeypatch):
+    svc = storage.R2StorageService()
+    svc.public_url = "https://assets.example"
+    return svc
+
+
+@pytest.mark.anyio
+async def test_create_presigned_upload_uses_key_scheme(fake_s3, service):
+    presigned = await service.create_presigned_upload(
+        "shot.png", "image/png", "projects"
+    )
+    assert re.fullmatch(r"projects/\d{8}/[0-9a-f]{8}\.png", presigned["key"])
+    assert presigned["url"] == f"https://assets.example/{presigned['key']}"
+    assert presigned["upload_url"].endswith(f"{presigned['key']}?op=put_object")
+    assert presigned["headers"] == {"Content-Type": "image/png"}
+
+
+@pytest.mark.anyio
+async def test_create_presigned_upload_rejects_type(fake_s3, service):
+    with pytest.raises(HTTPException) as exc:
+        await service.create_presigned_upload("doc.pdf", "application/pdf")
+    assert exc.value.status_code == 400
+
+
+@pytest.mark.anyio
+async def test_confirm_upload_success(fake_s3, service):
+    fake_s3.objects["images/20260101/abcd1234.png"] = "image/png"
+    url = await service.confirm_upload("images/20260101/abcd1234.png")
+    assert url == "https://assets.example/images/20260101/abcd1234.png"
+
+
+@pytest.mark.anyio
+async def test_confirm_upload_missing(fake_s3, service):
+    with pytest.raises(HTTPException) as exc:
+        await service.confirm_upload("images/20260101/missing.png")
+    assert exc.value.status_code == 404
+
+
+@pytest.mark.anyio
+async def test_confirm_upload_removes_unsupported_type(fake_s3, service):
+    fake_s3.objects["images/20260101/abcd1234.png"] = "text/html"
+    with pytest.raises(HTTPException) as exc:
+        await service.confirm_upload("images/20260101/abcd1234.png")
+    assert exc.value.status_code == 400
+    assert fake_s3.deleted == ["images/20260101/abcd1234.png"]
+
+
+class FakeUpload:
+    def __init__(self, content: bytes, content_type="image/png", filename="a.png"):
+        self.file = io.BytesIO(content)
+        self.content_type = content_type
+        self.filename = filename
+
+    async def read(self, size=-1):
+        return self.file.read(size)
+
+    async def seek(self, offset):
+        self.file.seek(offset)
+
+
+@pytest.mark.anyio
+async def test_upload_image_is_content_addressed(fake_s3, service):
+    digest = hashlib.sha256(b"pixels").hexdigest()
+    url = await service.upload_image(FakeUpload(b"pixels"), "projects")
+    assert url == f"https://assets.example/projects/{digest}.png"
+    assert fake_s3.uploaded == [f"projects/{digest}.png"]
+
+
+@pytest.mark.anyio
+async def test_upload_image_skips_existing_object(fake_s3, service):
+    digest = hashlib.sha256(b"pixels").hexdigest()
+    fake_s3.objects[f"images/{digest}.png"] = "image/png"
+    url = await service.upload_image(FakeUpload(b"pixels"))
+    assert url == f"https://assets.example/images/{digest}.png"
+    assert fake_s3.uploaded == []
+
+
+@pytest.mark.anyio
+async def test_upload_image_restores_object_deleted_elsewhere(fake_s3, service):
+    url = await service.upload_image(FakeUpload(b"pixels"))
+    # Deleted through another worker, which this service never hears about
+    other = storage.R2StorageService()
+    other.public_url = service.public_url
+    await other.delete_image(url)
+    assert await service.upload_image(FakeUpload(b"pixels")) == url
+    assert len(fake_s3.uploaded) == 2
+    assert service._key_from_url(url) in fake_s3.objects
+
+
+def test_is_content_url(service):
+    digest = hashlib.sha256(b"pixels").hexdigest()
+    assert service.is_content_url(f"https://assets.example/projects/{digest}.png")
+    assert not service.is_content_url("https://assets.example/images/1/ab12cd34.png")
+
+
+@pytest.mark.anyio
+async def test_delete_images_batches_and_reports_per_key(fake_s3, service):
+    urls = [f"https://assets.example/images/{i}.png" for i in range(2500)]
+    fake_s3.failing_keys = {"images/7.png"}
+    results = await service.delete_images(urls + [urls[0]])
+
+    assert [len(batch) for batch in fake_s3.batches] == [1000, 1000, 500]
+    assert len(results) == 2501
+    failed = [r for r in results if not r["deleted"]]
+    assert [r["key"] for r in failed] == ["images/7.png"]
+    assert failed[0]["error"] == "AccessDenied: denied"
+    assert results[-1] == results[0]
+
+
+@pytest.mark.anyio
+async def test_delete_images_keeps_referenced_urls(fake_s3, service):
+    urls = [f"https://assets.example/images/{i}.png" for i in range(3)]
+    results = await service.delete_images(urls, keep=frozenset(urls[1:2]))
+    assert fake_s3.batches == [["images/0.png", "images/2.png"]]
+    assert [r["deleted"] for r in results] == [True, False, True]
+    assert results[1]["error"] == storage.IN_USE
+
+
+def test_referenced_urls(pg_session):
+    from db.images import referenced_urls
+    from db.models.category import Category
+    from db.models.lab_notes import LabNote
+    from db.models.projects import Project
+
+    cover, inline, unused = (
+        f"https://assets.example/images/{name}.png"
+        for name in ("cover", "inline", "unused")
+    )
+    with pg_session() as db:
+        category = Category(name="ml", label="ML", order=0)
+        db.add(category)
+        db.flush()
+        db.add(
+            Project(
+                slug="p",
+                title="P",
+                description="Description",
+                tags=[],
+                category_id=category.id,
+                year="2024",
+                cover_image=cover,
+            )
+        )
+        db.add(
+            LabNote(
+                slug="n",
+                title="N",
+                excerpt="Excerpt",
+                content=f"![shot]({inline})",
+                tags=[],
+                read_time="1 min read",
+                date=date(2024, 1, 1),
+            )
+        )
+        db.commit()
+        assert referenced_urls(db, [cover, inline, unused]) == {cover, inline}
+        assert referenced_urls(db, []) == set()
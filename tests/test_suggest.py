@@ -0,0 +1,69 @@
+import services.suggest as suggest
+from fastapi.testclient import TestClient
+from main import app
+from services.suggest import SuggestionIndex
+
+client = TestClient(app)
+
+
+def make_index():
+    index = SuggestionIndex()
+    index.upsert("project", 1, "Portfolio Backend", "portfolio-backend", ["FastAPI"])
+    index.upsert("lab_note", 2, "Fast Inference", "fast-inference", ["ML", "FastAPI"])
+    return index
+
+
+def test_suggest_matches_title_words_slugs_and_tags():
+    index = make_index()
+    results = index.suggest("fast")
+    assert {"type": "tag", "title": "FastAPI"} in results
+    assert {
+        "type": "lab_note",
+        "title": "Fast Inference",
+        "slug": "fast-inference",
+    } in results
+    assert [r["title"] for r in index.suggest("back")] == ["Portfolio Backend"]
+    assert index.suggest("portfolio-b")[0]["slug"] == "portfolio-backend"
+
+
+def test_suggest_dedupes_and_limits():
+    index = make_index()
+    assert len(index.suggest("p")) == 1
+    assert len(index.suggest("f", limit=1)) == 1
+    assert index.suggest("   ") == []
+
+
+def test_upsert_replaces_terms_and_unpublish_removes():
+    index = make_index()
+    index.upsert("project", 1, "Renamed", "renamed", ["Go"])
+    assert index.suggest("portfolio") == []
+    assert index.suggest("ren")[0]["slug"] == "renamed"
+
+    index.upsert("project", 1, "Renamed", "renamed", ["Go"], published=False)
+    assert index.suggest("ren") == []
+    assert index.suggest("go") == []
+
+
+def test_tags_are_reference_counted():
+    index = make_index()
+    index.remove("project", 1)
+    assert {"type": "tag", "title": "FastAPI"} in index.suggest("fastapi")
+    index.remove("lab_note", 2)
+    assert index.suggest("fastapi") == []
+    assert len(index) == 0
+
+
+def test_suggest_endpoint(monkeypatch):
+    monkeypatch.setattr(suggest, "suggestion_index", make_index())
+    monkeypatch.setattr("api.routes.search.suggestion_index", suggest.suggestion_index)
+    response = client.get("/api/v1/suggest", params={"q": "Back"})
+    assert response.status_code == 200
+    assert response.json() == {
+        "data": [
+            {
+                "type": "project",
+                "title": "Portfolio Backend",
+                "slug": "portfolio-backend",
+            }
+        ]
+    }
@@ -0,0 +1,162 @@
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+from cli import train_model
+from click.testing import CliRunner
+from services import predict
+
+from ml.data import make_dataset
+from ml.features import build_features
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    """Two Parquet parts and a CSV, with the target set by feature1 + feature2."""
+    data = tmp_path / "processed"
+    data.mkdir()
+    rng = np.random.default_rng(0)
+    for name in ["a.parquet", "b.parquet", "c.csv"]:
+        features = rng.normal(size=(2000, 5))
+        frame = pd.DataFrame(features, columns=[f"feature{k}" for k in range(1, 6)])
+        frame["target"] = (features[:, 0] + features[:, 1] > 0).astype(int)
+        if name.endswith(".csv"):
+            frame.to_csv(data / name, index=False)
+        else:
+            frame.to_parquet(data / name, index=False)
+    (data / ".cache").mkdir()
+    pd.DataFrame({"other": [1]}).to_parquet(data / ".cache" / "skip.parquet")
+    return data
+
+
+def run(*args):
+    result = CliRunner().invoke(train_model.main, [str(a) for a in args])
+    assert result.exit_code == 0, result.output
+    return result
+
+
+def test_split_holds_out_every_nth_row_across_batches():
+    batches = [np.arange(12, dtype=float).reshape(6, 2)[:4], np.ones((3, 2)) * 9]
+    held = list(train_model.split(iter(batches), 3, holdout=True))
+    assert [y.tolist() for _, y in held] == [[1.0, 7.0], [9.0]]
+    kept = list(train_model.split(iter(batches), 0, holdout=False))
+    assert sum(len(y) for _, y in kept) == 7
+
+
+def test_reservoir_is_bounded():
+    reservoir = train_model.Reservoir(100, seed=0)
+    for start in range(0, 10_000, 1000):
+        reservoir.add(np.arange(start, start + 1000, dtype=float).reshape(-1, 1))
+    assert reservoir.rows.shape == (100, 1)
+    assert len(np.unique(reservoir.rows)) == 100
+    assert reservoir.rows.mean() == pytest.approx(5000, rel=0.2)
+
+
+def test_train_writes_and_promotes_a_version(dataset, tmp_path, monkeypatch):
+    model_dir = tmp_path / "model"
+    model_path = model_dir / "model.pkl"
+    reference = model_dir / "reference_stats.json"
+    run(dataset, "--model", model_path, "--reference", reference, "--batch-size", 700)
+
+    (version,) = (model_dir / "versions").glob("2*")
+    assert (model_dir / "versions" / "LATEST").read_text().strip() == version.name
+    metadata = json.loads((version / "metadata.json").read_text())
+    assert metadata["estimator"] == "SGDClassifier"
+    assert metadata["training_rows"] == 5400
+    assert metadata["metrics"]["holdout_rows"] == 600
+    assert metadata["metrics"]["accuracy"] > 0.95
+    assert metadata["compiled"] is True
+    assert [f["name"] for f in metadata["features"]] == [
+        f"feature{k}" for k in range(1, 6)
+    ]
+    assert len(metadata["sources"]) == 3
+    assert json.loads(reference.read_text())["count"] == 5400
+
+    monkeypatch.setattr(predict, "MODEL_PATH", str(model_dir))
+    monkeypatch.setattr(predict, "MODEL_NAME", "model.pkl")
+    served = predict.MachineLearningModelHandlerScore.load(predict.load_joblib)
+    assert type(served).__name__ == "CompiledModel"
+    assert served.predict(
+        np.array([[3.0, 3.0, 0, 0, 0], [-3.0, -3.0, 0, 0, 0]])
+    ).tolist() == [1, 0]
+
+
+def test_trains_on_build_features_output(tmp_path):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    rng = np.random.default_rng(0)
+    for name in ["a.csv", "b.csv"]:
+        features = rng.normal(size=(1000, 5))
+        frame = pd.DataFrame(features, columns=[f"feature{k}" for k in range(1, 6)])
+        frame["target"] = (features[:, 0] + features[:, 1] > 0).astype(int)
+        frame.to_csv(raw / name, index=False)
+    interim, processed = tmp_path / "interim", tmp_path / "processed"
+    make_dataset.pipeline(str(raw), str(interim), workers=1)
+    build_features.pipeline(str(interim), str(processed), workers=1)
+    # A partition left mid-way by an interrupted run
+    (processed / "source=c.csv.tmp").mkdir()
+    pd.DataFrame({"other": [1]}).to_parquet(
+        processed / "source=c.csv.tmp" / "part-00000.parquet"
+    )
+    assert (processed / "source=a.csv").is_dir()
+
+    model_dir = tmp_path / "model"
+    reference = model_dir / "reference_stats.json"
+    run(processed, "--model", model_dir / "model.pkl", "--reference", reference)
+    (version,) = (model_dir / "versions").glob("2*")
+    metadata = json.loads((version / "metadata.json").read_text())
+    assert len(metadata["sources"]) == 2
+    assert metadata["training_rows"] == 1800
+
+
+def test_warm_start_continues_from_served_model(dataset, tmp_path):
+    model_path = tmp_path / "model" / "model.pkl"
+    reference = tmp_path / "model" / "reference_stats.json"
+    run(dataset, "--model", model_path, "--reference", reference)
+    first = (tmp_path / "model" / "versions" / "LATEST").read_text().strip()
+
+    logs = tmp_path / "logs.ndjson"
+    rows = np.random.default_rng(1).normal(size=(500, 5))
+    with open(logs, "w") as f:
+        for row in rows:
+            record = {f"feature{k + 1}": v for k, v in enumerate(row.tolist())}
+            f.write(json.dumps({**record, "prediction": float(row[0] + row[1] > 0)}))
+            f.write("\n")
+    run(
+        logs,
+        "--target",
+        "prediction",
+        "--warm-start",
+        "--model",
+        model_path,
+        "--reference",
+        reference,
+        "--no-promote",
+    )
+
+    versions = sorted((tmp_path / "model" / "versions").glob("2*"))
+    assert len(versions) == 2
+    metadata = json.loads((versions[-1] / "metadata.json").read_text())
+    assert metadata["parent"] == first
+    assert metadata["warm_start"] is True
+    assert metadata["training_rows"] == 450
+    # Not promoted
+    assert (tmp_path / "model" / "versions" / "LATEST").read_text().strip() == first
+
+
+def test_regressor_metrics(dataset, tmp_path):
+    model_dir = tmp_path / "model"
+    run(
+        dataset,
+        "--estimator",
+        "sgd-regressor",
+        "--model",
+        model_dir / "model.pkl",
+        "--reference",
+        model_dir / "reference_stats.json",
+    )
+    (version,) = (model_dir / "versions").glob("2*")
+    metrics = json.loads((version / "metadata.json").read_text())["metrics"]
+    assert set(metrics) == {"holdout_rows", "mae", "rmse", "r2"}
+    assert metrics["r2"] > 0.5